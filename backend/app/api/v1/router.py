@@ -18,6 +18,9 @@ from app.modules.admin.router import router as admin
 from app.modules.superadmin.router import router as superadmin
 from app.modules.uploads.router import router as uploads
 from app.modules.nearby.router import router as nearby
+from app.modules.search.router import router as search
+from app.modules.catalogos.router import router as catalogos
+from app.modules.exportes.router import router as exportes
 from app.modules.complejos.router_empty import router as complejos_empty
 from app.modules.canchas.router_empty import router as canchas_empty
 api_router = APIRouter()
@@ -38,6 +41,9 @@ api_router.include_router(favoritos)
 api_router.include_router(denuncias)
 api_router.include_router(uploads)
 api_router.include_router(nearby)
+api_router.include_router(search)
+api_router.include_router(catalogos)
+api_router.include_router(exportes)
 api_router.include_router(complejos_empty)  # GET /api/v1/complejos -> []
 api_router.include_router(canchas_empty)    # GET /api/v1/canchas   -> []
 
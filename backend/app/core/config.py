@@ -36,6 +36,54 @@ class Settings(BaseSettings):
     S3_SECRET_ACCESS_KEY: str | None = None
     S3_PUBLIC_BASE_URL: str | None = None
 
+    # === Reservas ===
+    HOLD_TTL_MINUTES: int = 10          # duración de una retención de horario
+    HOLD_SWEEP_INTERVAL_S: int = 15     # cada cuánto corre el barrido de retenciones vencidas
+    HOLD_SWEEP_BATCH: int = 500         # máximo de retenciones expiradas por UPDATE
+
+    # === Particiones mensuales de reservas (13_reservas_particionadas.sql) ===
+    RESERVAS_PARTICIONES_ADELANTE: int = 12         # meses futuros que se mantienen creados
+    RESERVAS_PARTICIONES_RETENER: int = 24          # meses de historia en línea (0 = no desacoplar)
+    RESERVAS_PARTICIONES_INTERVALO_S: int = 6 * 3600
+
+    # === Auditoría (escritura diferida por lotes) ===
+    AUDITORIA_COLA_MAX: int = 10_000         # eventos en memoria antes de aplicar backpressure
+    AUDITORIA_ESPERA_MAX_S: float = 0.05     # cuánto espera registrar() con la cola llena antes de descartar
+    AUDITORIA_LOTE: int = 500                # filas por INSERT
+    AUDITORIA_INTERVALO_S: float = 1.0       # espera máxima del escritor por nuevos eventos
+    AUDITORIA_PROXIES_CONFIABLES: str = ""   # IPs separadas por coma; solo a ellas se les cree X-Forwarded-For
+
+    # === Tareas en segundo plano (desactivar en CLIs/benchmarks) ===
+    BACKGROUND_JOBS: bool = True
+
+    # === Pricing ===
+    PRICING_CACHE_TTL_S: int = 300  # respaldo ante cambios de reglas hechos fuera de la API
+
+    # === Liquidaciones ===
+    LIQUIDACION_COMISION_PCT: float = 10.0   # % de comisión de la plataforma sobre el bruto
+    LIQUIDACION_LOTE_DUENOS: int = 50        # dueños por transacción al generar liquidaciones
+
+    # === Webhooks de pagos ===
+    PAGOS_WEBHOOK_SECRETS: str = ""          # "proveedor:secreto,proveedor2:secreto2" (HMAC-SHA256)
+    PAGOS_WEBHOOK_BATCH: int = 200           # eventos por transacción del procesador
+    PAGOS_WEBHOOK_INTERVAL_S: int = 2        # espera máxima entre pasadas si no llegan eventos
+
+    # === Catálogos (deportes, comunas, servicios) ===
+    CATALOGOS_REVALIDAR_S: int = 30          # cada cuánto se compara la versión en BD con la del cache
+
+    # === Índices en memoria de complejos (grilla geo, tiles del mapa, sugerencias) ===
+    COMPLEJOS_CACHE_REVALIDAR_S: int = 30    # cada cuánto se compara conteo + max(updated_at) con la BD
+
+    # === Exportaciones (CSV/NDJSON) ===
+    EXPORT_YIELD_PER: int = 2000             # filas por fetch del cursor del lado del servidor
+
+    # === Perfilador de consultas (solo desarrollo/staging) ===
+    PERFILADOR_ACTIVO: bool = False
+    PERFILADOR_LENTA_MS: float = 200.0       # sentencias sobre este umbral se registran con parámetros
+    PERFILADOR_EXPLAIN_MUESTRA: float = 0.1  # fracción de SELECT lentos a los que se corre EXPLAIN ANALYZE
+    PERFILADOR_MAX_CONSULTAS: int = 20       # más sentencias por request se marca como posible N+1
+    PERFILADOR_MAX_REPETIDAS: int = 3        # veces que puede repetirse la misma forma de sentencia
+
     # === Pydantic v2 settings ===
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -47,4 +95,13 @@ class Settings(BaseSettings):
     def cors_origins_list(self) -> list[str]:
         return [o.strip() for o in self.CORS_ORIGINS.split(",") if o.strip()]
 
+    @property
+    def auditoria_proxies_confiables(self) -> set[str]:
+        return {p.strip() for p in self.AUDITORIA_PROXIES_CONFIABLES.split(",") if p.strip()}
+
+    @property
+    def pagos_webhook_secrets(self) -> dict[str, str]:
+        pares = (p.split(":", 1) for p in self.PAGOS_WEBHOOK_SECRETS.split(",") if ":" in p)
+        return {k.strip().lower(): v.strip() for k, v in pares}
+
 settings = Settings()
\ No newline at end of file
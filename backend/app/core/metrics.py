@@ -0,0 +1,161 @@
+# app/core/metrics.py
+"""Métricas en proceso con exposición en formato texto de Prometheus (`GET /metrics`)."""
+from __future__ import annotations
+import bisect
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+def _esc(v: str) -> str:
+    return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _fmt_labels(names: Tuple[str, ...], values: LabelValues) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_esc(v)}"' for n, v in zip(names, values)) + "}"
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_fmt_labels(self.labelnames, k)} {v:g}" for k, v in items]
+
+class Gauge(Counter):
+    """Valor que sube y baja. Con `funcion`, se calcula al exponer: devuelve un número o {labels: valor}."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (),
+                 funcion: Optional[Callable[[], object]] = None):
+        super().__init__(name, help, labelnames)
+        self.funcion = funcion
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def collect(self) -> List[str]:
+        if self.funcion is None:
+            return super().collect()
+        try:
+            v = self.funcion()
+        except Exception:
+            return []  # una fuente caída no debe romper /metrics
+        items = sorted(v.items()) if isinstance(v, dict) else [((), v)]
+        return [f"{self.name}{_fmt_labels(self.labelnames, k)} {float(x):g}" for k, x in items]
+
+# segundos; cubren desde consultas por índice hasta endpoints lentos
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Sequence[float] = BUCKETS_LATENCIA):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # por labels: [conteos por bucket (+Inf al final), suma]
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            item = self._values.get(key)
+            if item is None:
+                item = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            item[0][i] += 1
+            item[1][0] += value
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, (list(c), s[0])) for k, (c, s) in self._values.items())
+        names = self.labelnames + ("le",)
+        lines: List[str] = []
+        for k, (conteos, suma) in items:
+            acumulado = 0
+            for le, n in zip(self.buckets + (float("inf"),), conteos):
+                acumulado += n
+                le_txt = "+Inf" if le == float("inf") else f"{le:g}"
+                lines.append(f"{self.name}_bucket{_fmt_labels(names, k + (le_txt,))} {acumulado}")
+            lines.append(f"{self.name}_sum{_fmt_labels(self.labelnames, k)} {suma:g}")
+            lines.append(f"{self.name}_count{_fmt_labels(self.labelnames, k)} {acumulado}")
+        return lines
+
+_REGISTRY: Dict[str, "Counter | Histogram"] = {}
+_REG_LOCK = threading.Lock()
+
+def _register(metric):
+    with _REG_LOCK:
+        existing = _REGISTRY.get(metric.name)
+        if existing is not None:
+            return existing
+        _REGISTRY[metric.name] = metric
+        return metric
+
+def counter(name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+    return _register(Counter(name, help, labelnames))
+
+def gauge(name: str, help: str, labelnames: Tuple[str, ...] = (),
+          funcion: Optional[Callable[[], object]] = None) -> Gauge:
+    return _register(Gauge(name, help, labelnames, funcion))
+
+def histogram(name: str, help: str, labelnames: Tuple[str, ...] = (),
+              buckets: Sequence[float] = BUCKETS_LATENCIA) -> Histogram:
+    return _register(Histogram(name, help, labelnames, buckets))
+
+# ===== Caches en memoria =====
+CACHE_CONSULTAS = counter(
+    "cache_consultas_total", "Lecturas de caches en memoria por resultado", ("cache", "resultado"))
+
+def cache(nombre: str, acierto: bool, n: int = 1) -> None:
+    """Cuenta `n` lecturas de un cache en memoria como hit o miss."""
+    if n:
+        CACHE_CONSULTAS.inc(n, cache=nombre, resultado="hit" if acierto else "miss")
+
+def _hit_ratio() -> Dict[LabelValues, float]:
+    with CACHE_CONSULTAS._lock:
+        valores = dict(CACHE_CONSULTAS._values)
+    out: Dict[LabelValues, float] = {}
+    for nombre in {k[0] for k in valores}:
+        hits = valores.get((nombre, "hit"), 0.0)
+        total = hits + valores.get((nombre, "miss"), 0.0)
+        out[(nombre,)] = hits / total if total else 0.0
+    return out
+
+gauge("cache_hit_ratio", "Proporción de hits desde el arranque", ("cache",), _hit_ratio)
+
+def render() -> str:
+    with _REG_LOCK:
+        metrics = list(_REGISTRY.values())
+    lines: List[str] = []
+    for m in metrics:
+        lines.append(f"# HELP {m.name} {m.help}")
+        lines.append(f"# TYPE {m.name} {m.kind}")
+        lines.extend(m.collect())
+    return "\n".join(lines) + "\n"
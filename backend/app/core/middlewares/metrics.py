@@ -0,0 +1,73 @@
+# app/core/middlewares/metrics.py
+"""Latencia y códigos por ruta, y consultas/tiempo de BD por request (`GET /metrics`).
+
+La ruta se etiqueta con la plantilla (`/reservas/{reserva_id}`), no con el path real, para no
+crear una serie por id; lo que no calza con ninguna ruta va como `sin_ruta`.
+"""
+from __future__ import annotations
+import time as _time
+from typing import Optional
+
+from anyio import CapacityLimiter
+from anyio.to_thread import current_default_thread_limiter
+
+from app.core import metrics
+from app.db import instrumentacion
+
+HTTP_SOLICITUDES = metrics.counter(
+    "http_solicitudes_total", "Requests por ruta y código de respuesta", ("metodo", "ruta", "estado"))
+HTTP_SEGUNDOS = metrics.histogram(
+    "http_solicitud_segundos", "Latencia de requests por ruta", ("metodo", "ruta"))
+HTTP_CONSULTAS = metrics.histogram(
+    "http_solicitud_consultas_db", "Sentencias SQL por request", ("metodo", "ruta"),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100))
+HTTP_DB_SEGUNDOS = metrics.histogram(
+    "http_solicitud_db_segundos", "Tiempo en BD por request", ("metodo", "ruta"))
+HTTP_EN_CURSO = metrics.gauge("http_solicitudes_en_curso", "Requests en proceso")
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        estado = 500
+        t0 = _time.perf_counter()
+
+        async def send_medido(message):
+            nonlocal estado
+            if message["type"] == "http.response.start":
+                estado = message["status"]
+            await send(message)
+
+        HTTP_EN_CURSO.inc()
+        try:
+            with instrumentacion.medir() as db:
+                await self.app(scope, receive, send_medido)
+        finally:
+            HTTP_EN_CURSO.inc(-1)
+            route = scope.get("route")
+            ruta = getattr(route, "path", None) or "sin_ruta"
+            metodo = scope["method"]
+            HTTP_SEGUNDOS.observe(_time.perf_counter() - t0, metodo=metodo, ruta=ruta)
+            HTTP_SOLICITUDES.inc(metodo=metodo, ruta=ruta, estado=str(estado))
+            HTTP_CONSULTAS.observe(db.n, metodo=metodo, ruta=ruta)
+            HTTP_DB_SEGUNDOS.observe(db.segundos, metodo=metodo, ruta=ruta)
+
+# ===== Threadpool de endpoints sync (anyio) =====
+_limiter: Optional[CapacityLimiter] = None
+
+def registrar_threadpool() -> None:
+    """Debe llamarse desde el event loop (lifespan): el limiter por defecto es por loop."""
+    global _limiter
+    _limiter = current_default_thread_limiter()
+
+def _threadpool():
+    if _limiter is None:
+        return {}
+    st = _limiter.statistics()
+    return {("ocupados",): st.borrowed_tokens, ("total",): st.total_tokens, ("en_espera",): st.tasks_waiting}
+
+metrics.gauge("threadpool_hilos", "Hilos del threadpool de endpoints sync (en_espera = tareas encoladas)",
+              ("estado",), _threadpool)
@@ -0,0 +1,19 @@
+# app/core/middlewares/perfilador.py
+"""Perfil de consultas por request (solo con PERFILADOR_ACTIVO); ver app/db/perfilador.py."""
+from __future__ import annotations
+
+from app.db import perfilador
+
+class PerfiladorMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        with perfilador.perfilar() as p:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                ruta = getattr(scope.get("route"), "path", None) or scope["path"]
+                perfilador.revisar(p, f"{scope['method']} {ruta}")
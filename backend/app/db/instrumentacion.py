@@ -0,0 +1,103 @@
+# app/db/instrumentacion.py
+"""Métricas del engine: consultas y tiempo de BD por request, espera de checkout y estado del pool.
+
+Los hooks de cursor acumulan en el `Consultas` del contexto actual (lo abre el middleware de
+métricas por request, o `medir()` en scripts). Los endpoints sync corren en el threadpool con una
+copia del contexto, así que ven el mismo objeto.
+"""
+from __future__ import annotations
+import contextvars
+import time as _time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from app.core import metrics
+
+DB_CONSULTA_SEGUNDOS = metrics.histogram(
+    "db_consulta_segundos", "Duración de cada sentencia SQL",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5))
+DB_POOL_ESPERA = metrics.histogram(
+    "db_pool_espera_segundos", "Espera para obtener una conexión del pool (incluye abrir una nueva)",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0))
+DB_ERRORES = metrics.counter("db_errores_total", "Sentencias SQL que terminaron en error")
+
+class Consultas:
+    __slots__ = ("n", "segundos", "espera_pool")
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.segundos = 0.0
+        self.espera_pool = 0.0
+
+_actual: contextvars.ContextVar[Optional[Consultas]] = contextvars.ContextVar("db_consultas", default=None)
+
+def actual() -> Optional[Consultas]:
+    return _actual.get()
+
+@contextmanager
+def medir() -> Iterator[Consultas]:
+    """Acumula consultas y tiempo de BD de lo que corra dentro del bloque."""
+    c = Consultas()
+    token = _actual.set(c)
+    try:
+        yield c
+    finally:
+        _actual.reset(token)
+
+class QueuePoolMedido(QueuePool):
+    """QueuePool que mide cuánto espera cada checkout (SQLAlchemy no tiene evento previo al checkout)."""
+
+    def _do_get(self):
+        t0 = _time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            espera = _time.perf_counter() - t0
+            DB_POOL_ESPERA.observe(espera)
+            c = _actual.get()
+            if c is not None:
+                c.espera_pool += espera
+
+def _antes(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("_t_consulta", []).append(_time.perf_counter())
+
+def _despues(conn, cursor, statement, parameters, context, executemany):
+    pila = conn.info.get("_t_consulta")
+    if not pila:
+        return
+    dt = _time.perf_counter() - pila.pop()
+    DB_CONSULTA_SEGUNDOS.observe(dt)
+    c = _actual.get()
+    if c is not None:
+        c.n += 1
+        c.segundos += dt
+
+def _error(ctx):
+    pila = ctx.connection.info.get("_t_consulta") if ctx.connection is not None else None
+    if pila:
+        pila.pop()
+    DB_ERRORES.inc()
+
+def _estado_pool(engine: Engine):
+    def leer():
+        pool = engine.pool
+        if not isinstance(pool, QueuePool):
+            return {}
+        return {
+            ("en_uso",): pool.checkedout(),
+            ("libres",): pool.checkedin(),
+            ("overflow",): max(pool.overflow(), 0),
+        }
+    return leer
+
+def instrumentar(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _antes)
+    event.listen(engine, "after_cursor_execute", _despues)
+    event.listen(engine, "handle_error", _error)
+    metrics.gauge("db_pool_conexiones", "Conexiones del pool por estado", ("estado",), _estado_pool(engine))
+    metrics.gauge("db_pool_tamano", "Tamaño configurado del pool (sin overflow)",
+                  funcion=lambda: engine.pool.size() if isinstance(engine.pool, QueuePool) else 0)
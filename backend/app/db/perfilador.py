@@ -0,0 +1,190 @@
+# app/db/perfilador.py
+"""Perfilador de consultas para desarrollo/staging (PERFILADOR_ACTIVO) y para tests.
+
+- Sentencias sobre PERFILADOR_LENTA_MS se registran con sus parámetros; a una fracción de los
+  SELECT lentos se les corre EXPLAIN (ANALYZE, BUFFERS) dentro de un SAVEPOINT que siempre se
+  revierte.
+- Cada request (PerfiladorMiddleware) o bloque `perfilar()` junta las sentencias por forma
+  (literales y parámetros reemplazados por `?`) para marcar posibles N+1: demasiadas sentencias
+  o la misma forma repetida.
+- `presupuesto(...)` usa lo mismo como aserción:
+
+      with perfilador.presupuesto(max_consultas=3, max_repetidas=1):
+          complejos_service.update_complejo(db, current, id_complejo, data)
+
+  Mide lo que corre en el contexto actual (servicios, repositorios, benchmarks); no atraviesa
+  hilos que no copien el contexto.
+"""
+from __future__ import annotations
+import contextvars
+import logging
+import random
+import re
+import time as _time
+from collections import Counter as _Conteo
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core import metrics
+from app.core.config import settings
+
+log = logging.getLogger(__name__)
+
+PERFILADOR_ALERTAS = metrics.counter(
+    "perfilador_alertas_total", "Consultas lentas y posibles N+1 detectados", ("tipo",))
+
+_MAX_LENTAS = 20          # sentencias lentas guardadas por perfil
+_MAX_PARAMS_TXT = 500
+_SENSIBLES = re.compile(r"pass|hash|token|secret", re.I)
+
+# ===== Forma de una sentencia =====
+_RE_ESPACIOS = re.compile(r"\s+")
+_RE_TEXTO = re.compile(r"'(?:[^']|'')*'")
+_RE_NUMERO = re.compile(r"(?<![\w.])\d+(?:\.\d+)?\b")
+_RE_PARAM = re.compile(r"%\(\w+\)s|%s|(?<!:):\w+|\$\d+")
+_RE_LISTA = re.compile(r"\?(?:\s*,\s*\?)+")
+_RE_FILAS = re.compile(r"\(\?[^()]*\)(?:\s*,\s*\(\?[^()]*\))+")
+
+def forma(sql: str) -> str:
+    """SQL sin literales ni parámetros: dos sentencias con la misma forma difieren solo en valores."""
+    s = _RE_ESPACIOS.sub(" ", sql).strip()
+    s = _RE_TEXTO.sub("?", s)
+    s = _RE_PARAM.sub("?", s)
+    s = _RE_NUMERO.sub("?", s)
+    s = _RE_FILAS.sub("(...)", s)
+    return _RE_LISTA.sub("?...", s)
+
+def _es_select(sql: str) -> bool:
+    s = sql.lstrip().upper()
+    if " FOR UPDATE" in s or " FOR SHARE" in s:
+        return False
+    if s.startswith("SELECT"):
+        return True
+    return s.startswith("WITH") and not re.search(r"\b(INSERT|UPDATE|DELETE)\b", s)
+
+def _params_txt(params: Any) -> str:
+    if isinstance(params, dict):
+        params = {k: ("***" if _SENSIBLES.search(str(k)) else v) for k, v in params.items()}
+    txt = repr(params)
+    return txt if len(txt) <= _MAX_PARAMS_TXT else txt[:_MAX_PARAMS_TXT] + "…"
+
+# ===== Perfil =====
+class Perfil:
+    def __init__(self) -> None:
+        self.n = 0
+        self.segundos = 0.0
+        self.formas: _Conteo[str] = _Conteo()
+        self.lentas: List[Dict[str, Any]] = []
+
+    def repetidas(self, maximo: int) -> List[Tuple[str, int]]:
+        return [(f, n) for f, n in self.formas.most_common() if n > maximo]
+
+    def reporte(self) -> Dict[str, Any]:
+        return {
+            "consultas": self.n,
+            "db_ms": round(self.segundos * 1000, 2),
+            "formas": dict(self.formas.most_common()),
+            "lentas": self.lentas,
+        }
+
+_perfil: contextvars.ContextVar[Optional[Perfil]] = contextvars.ContextVar("perfilador", default=None)
+
+@contextmanager
+def perfilar() -> Iterator[Perfil]:
+    p = Perfil()
+    token = _perfil.set(p)
+    try:
+        yield p
+    finally:
+        _perfil.reset(token)
+
+def revisar(p: Perfil, donde: str, *, max_consultas: Optional[int] = None,
+            max_repetidas: Optional[int] = None) -> List[str]:
+    """Alertas del perfil (y las registra en el log); lista vacía si está dentro de los límites."""
+    max_consultas = settings.PERFILADOR_MAX_CONSULTAS if max_consultas is None else max_consultas
+    max_repetidas = settings.PERFILADOR_MAX_REPETIDAS if max_repetidas is None else max_repetidas
+    alertas: List[str] = []
+    if p.n > max_consultas:
+        PERFILADOR_ALERTAS.inc(tipo="demasiadas")
+        alertas.append(f"{donde}: {p.n} consultas (máximo {max_consultas})")
+    for f, n in p.repetidas(max_repetidas):
+        PERFILADOR_ALERTAS.inc(tipo="repetida")
+        alertas.append(f"{donde}: {n}x {f}")
+    for a in alertas:
+        log.warning("Posible N+1 — %s", a)
+    return alertas
+
+class PresupuestoExcedido(AssertionError):
+    def __init__(self, alertas: List[str], perfil: Perfil):
+        super().__init__("Presupuesto de consultas excedido:\n  " + "\n  ".join(alertas))
+        self.alertas = alertas
+        self.perfil = perfil
+
+@contextmanager
+def presupuesto(max_consultas: Optional[int] = None, max_repetidas: Optional[int] = None,
+                donde: str = "bloque") -> Iterator[Perfil]:
+    """Falla con PresupuestoExcedido si el bloque supera los límites (por defecto, los de settings)."""
+    with perfilar() as p:
+        yield p
+    alertas = revisar(p, donde, max_consultas=max_consultas, max_repetidas=max_repetidas)
+    if alertas:
+        raise PresupuestoExcedido(alertas, p)
+
+# ===== Hooks del engine =====
+def _activo() -> bool:
+    return settings.PERFILADOR_ACTIVO or _perfil.get() is not None
+
+def _explain(cursor, statement: str, parameters: Any) -> Optional[str]:
+    # cursor DBAPI directo: no pasa por los hooks y no toca el cursor de la consulta original.
+    # ANALYZE ejecuta la sentencia (un SELECT puede llamar funciones que escriben): siempre se
+    # vuelve al SAVEPOINT, aunque el EXPLAIN haya salido bien.
+    try:
+        with cursor.connection.cursor() as cur:
+            cur.execute("SAVEPOINT perfilador_explain")
+            try:
+                cur.execute("EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters)
+                return "\n".join(r[0] for r in cur.fetchall())
+            finally:
+                cur.execute("ROLLBACK TO SAVEPOINT perfilador_explain")
+                cur.execute("RELEASE SAVEPOINT perfilador_explain")
+    except Exception as e:  # autocommit, sentencia no explicable, etc.
+        log.debug("EXPLAIN omitido: %s", e)
+        return None
+
+def _antes(conn, cursor, statement, parameters, context, executemany):
+    if _activo():
+        conn.info.setdefault("_t_perfilador", []).append(_time.perf_counter())
+
+def _despues(conn, cursor, statement, parameters, context, executemany):
+    pila = conn.info.get("_t_perfilador")
+    if not pila:
+        return
+    dt = _time.perf_counter() - pila.pop()
+    p = _perfil.get()
+    if p is not None:
+        p.n += 1
+        p.segundos += dt
+        p.formas[forma(statement)] += 1
+    if dt * 1000 < settings.PERFILADOR_LENTA_MS:
+        return
+    PERFILADOR_ALERTAS.inc(tipo="lenta")
+    plan = None
+    if not executemany and _es_select(statement) and random.random() < settings.PERFILADOR_EXPLAIN_MUESTRA:
+        plan = _explain(cursor, statement, parameters)
+    log.warning("Consulta lenta (%.0f ms): %s | params=%s%s", dt * 1000, _RE_ESPACIOS.sub(" ", statement).strip(),
+                _params_txt(parameters), f"\n{plan}" if plan else "")
+    if p is not None and len(p.lentas) < _MAX_LENTAS:
+        p.lentas.append({"ms": round(dt * 1000, 2), "sql": statement, "params": _params_txt(parameters), "plan": plan})
+
+def _error(ctx):
+    pila = ctx.connection.info.get("_t_perfilador") if ctx.connection is not None else None
+    if pila:
+        pila.pop()
+
+def instrumentar(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _antes)
+    event.listen(engine, "after_cursor_execute", _despues)
+    event.listen(engine, "handle_error", _error)
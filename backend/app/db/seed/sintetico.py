@@ -0,0 +1,346 @@
+# app/db/seed/sintetico.py
+"""Datos sintéticos a escala para pruebas de capacidad, cargados con COPY.
+
+Uso (desde backend/, con el esquema ya aplicado; NO contra producción):
+  python -m app.db.seed.sintetico --escala 10
+  python -m app.db.seed.sintetico --escala 100 --dias-pasados 365 --dias-futuros 60
+
+Por unidad de escala: 20 dueños, 40 complejos (~140 canchas), 2.000 jugadores, 2.500 reseñas y
+~60 mil reservas en el rango de días pedido. La popularidad es sesgada (Zipf) por complejo y por
+jugador, con horas punta en la tarde y fines de semana más llenos. Las reservas van en bloques de
+una hora, una por cancha y franja, así que no se solapan.
+
+Los usuarios quedan como <rol><id>@seed.local con la contraseña de --password.
+Con permisos de superusuario los triggers de reservas se omiten durante el COPY (las agregaciones
+se recalculan al final); sin ellos la carga funciona igual, solo más lenta.
+"""
+from __future__ import annotations
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, List, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.security import hash_password
+
+DOMINIO = "seed.local"
+_TZ = ZoneInfo("America/Santiago")
+
+# nombre, lat, lon, peso (dónde caen los complejos)
+COMUNAS: List[Tuple[str, float, float, float]] = [
+    ("Temuco", -38.7359, -72.5904, 0.50),
+    ("Padre Las Casas", -38.7658, -72.5969, 0.14),
+    ("Lautaro", -38.5306, -72.4347, 0.06),
+    ("Villarrica", -39.2857, -72.2279, 0.08),
+    ("Pucón", -39.2823, -71.9545, 0.07),
+    ("Nueva Imperial", -38.7449, -72.9507, 0.05),
+    ("Freire", -38.9530, -72.6227, 0.05),
+    ("Vilcún", -38.6692, -72.2247, 0.05),
+]
+
+# peso de cada deporte entre las canchas y precio por hora (valle, punta)
+DEPORTES = {
+    "futbolito": (0.34, 18000, 28000),
+    "baby futbol": (0.16, 15000, 24000),
+    "futbol": (0.08, 30000, 45000),
+    "paddle": (0.20, 12000, 18000),
+    "tenis": (0.10, 10000, 16000),
+    "basquetbol": (0.07, 12000, 18000),
+    "voleibol": (0.05, 10000, 15000),
+}
+
+HORA_APERTURA, HORA_CIERRE, HORA_PUNTA = 8, 23, 18
+# ocupación relativa por franja (08..22) y por día (lunes..domingo)
+PESO_HORA = np.array([0.15, 0.15, 0.2, 0.2, 0.2, 0.25, 0.3, 0.3, 0.35, 0.45, 0.6, 0.85, 0.95, 0.9, 0.6])
+PESO_DIA = np.array([0.8, 0.8, 0.85, 0.9, 1.0, 1.1, 0.9])
+_DIAS = ["lunes", "martes", "miercoles", "jueves", "viernes", "sabado", "domingo"]
+
+NOMBRES = ["Camila", "Javiera", "Catalina", "Valentina", "Francisca", "Constanza", "Fernanda", "Daniela",
+           "Sebastián", "Matías", "Benjamín", "Vicente", "Martín", "Diego", "Nicolás", "Tomás", "Felipe", "Joaquín"]
+APELLIDOS = ["González", "Muñoz", "Rojas", "Díaz", "Pérez", "Soto", "Contreras", "Silva", "Martínez",
+             "Sepúlveda", "Morales", "Rodríguez", "López", "Fuentes", "Hernández", "Torres", "Araya", "Huenchullán"]
+PREFIJOS = ["Complejo", "Club", "Centro Deportivo", "Estadio", "Arena", "Polideportivo"]
+SUFIJOS = ["Los Aromos", "El Roble", "Ñielol", "Pichi Cautín", "Labranza", "Amanecer", "Pueblo Nuevo",
+           "Las Quilas", "Santa Rosa", "Fundo El Carmen", "Los Pinos", "Costanera", "Alemania", "Portal"]
+
+# ===== COPY =====
+class _Lector:
+    """Archivo de solo lectura sobre un iterador de bloques de texto (lo consume copy_expert)."""
+
+    def __init__(self, bloques: Iterable[str]):
+        self._it: Iterator[str] = iter(bloques)
+        self._buf = ""
+        self.filas = 0
+
+    def read(self, n: int = -1) -> str:
+        while n < 0 or len(self._buf) < n:
+            try:
+                bloque = next(self._it)
+            except StopIteration:
+                break
+            self.filas += bloque.count("\n")
+            self._buf += bloque
+        if n < 0:
+            out, self._buf = self._buf, ""
+        else:
+            out, self._buf = self._buf[:n], self._buf[n:]
+        return out
+
+def _copy(db: Session, tabla: str, columnas: Sequence[str], bloques: Iterable[str]) -> int:
+    """COPY ... FROM STDIN (formato text). Cada bloque son líneas con campos separados por tab."""
+    lector = _Lector(bloques)
+    cur = db.connection().connection.cursor()
+    try:
+        cur.copy_expert(f"COPY {tabla} ({', '.join(columnas)}) FROM STDIN", lector, size=1 << 16)
+    finally:
+        cur.close()
+    return lector.filas
+
+def _linea(*campos) -> str:
+    return "\t".join("\\N" if c is None else str(c) for c in campos) + "\n"
+
+def _reservar_ids(db: Session, tabla: str, columna: str, n: int) -> int:
+    """Primer id de un bloque de `n` ids tomados de la secuencia de la tabla."""
+    seq = db.execute(text("SELECT pg_get_serial_sequence(:t, :c)"), {"t": tabla, "c": columna}).scalar_one()
+    inicio = db.execute(text("SELECT nextval(:s)"), {"s": seq}).scalar_one()
+    db.execute(text("SELECT setval(:s, :v)"), {"s": seq, "v": inicio + n - 1})
+    return int(inicio)
+
+def _zipf(rng: np.random.Generator, n: int, s: float) -> np.ndarray:
+    """Pesos con cola larga (mayor = más popular) en orden aleatorio; el máximo vale 1."""
+    pesos = 1.0 / np.arange(1, n + 1) ** s
+    rng.shuffle(pesos)
+    return pesos / pesos.max()
+
+def _existe(db: Session, funcion: str) -> bool:
+    return db.execute(text("SELECT to_regproc(:f) IS NOT NULL"), {"f": funcion}).scalar()
+
+def _paso(msg: str, t0: float) -> None:
+    print(f"  {msg} ({time.perf_counter() - t0:.1f} s)", flush=True)
+
+# ===== Generación =====
+def generar(db: Session, *, escala: int, dias_pasados: int, dias_futuros: int, password: str, semilla: int) -> None:
+    rng = np.random.default_rng(semilla)
+    n_duenos, n_complejos, n_jugadores = 20 * escala, 40 * escala, 2000 * escala
+    hashed = hash_password(password)
+    t0 = time.perf_counter()
+
+    # --- catálogos ---
+    for nombre, *_ in COMUNAS:
+        db.execute(text("INSERT INTO comunas (nombre) VALUES (:n) ON CONFLICT (nombre) DO NOTHING"), {"n": nombre})
+    comuna_id = dict(db.execute(text("SELECT nombre, id_comuna FROM comunas")).all())
+    deporte_id = {n.lower(): i for n, i in db.execute(text("SELECT nombre, id_deporte FROM deportes")).all()}
+    deportes = [d for d in DEPORTES if d in deporte_id]
+    if not deportes:
+        raise SystemExit("La tabla deportes no tiene ninguno de los deportes esperados (¿falta 01_schema.sql?)")
+    peso_dep = np.array([DEPORTES[d][0] for d in deportes])
+    peso_dep /= peso_dep.sum()
+
+    # --- usuarios ---
+    id_u0 = _reservar_ids(db, "usuarios", "id_usuario", n_duenos + n_jugadores)
+    duenos = np.arange(id_u0, id_u0 + n_duenos)
+    jugadores = np.arange(id_u0 + n_duenos, id_u0 + n_duenos + n_jugadores)
+
+    def usuarios() -> Iterator[str]:
+        nom = rng.integers(0, len(NOMBRES), n_duenos + n_jugadores)
+        ape = rng.integers(0, len(APELLIDOS), n_duenos + n_jugadores)
+        for k in range(0, n_duenos + n_jugadores, 10_000):
+            yield "".join(
+                _linea(id_u0 + i, NOMBRES[nom[i]], APELLIDOS[ape[i]],
+                       f"{'dueno' if i < n_duenos else 'jugador'}{id_u0 + i}@{DOMINIO}",
+                       hashed, "dueno" if i < n_duenos else "usuario", "t")
+                for i in range(k, min(k + 10_000, n_duenos + n_jugadores))
+            )
+    n = _copy(db, "usuarios", ("id_usuario", "nombre", "apellido", "email", "hashed_password", "rol", "verificado"), usuarios())
+    _paso(f"{n} usuarios", t0)
+
+    # --- complejos ---
+    id_c0 = _reservar_ids(db, "complejos", "id_complejo", n_complejos)
+    complejos = np.arange(id_c0, id_c0 + n_complejos)
+    p_comuna = np.array([c[3] for c in COMUNAS])
+    comuna_de = rng.choice(len(COMUNAS), n_complejos, p=p_comuna / p_comuna.sum())
+    lat = np.array([COMUNAS[c][1] for c in comuna_de]) + rng.normal(0, 0.02, n_complejos)
+    lon = np.array([COMUNAS[c][2] for c in comuna_de]) + rng.normal(0, 0.02, n_complejos)
+    dueno_de = duenos[rng.integers(0, n_duenos, n_complejos)]
+    pop_complejo = 0.25 + 0.75 * _zipf(rng, n_complejos, 0.8)
+    tarifa_finde = rng.random(n_complejos) < 0.5   # cobra punta todo el sábado y domingo
+
+    n = _copy(db, "complejos", ("id_complejo", "id_dueno", "nombre", "direccion", "id_comuna", "latitud", "longitud", "loc"), (
+        _linea(
+            id_c0 + i, dueno_de[i],
+            f"{PREFIJOS[i % len(PREFIJOS)]} {SUFIJOS[(i // len(PREFIJOS)) % len(SUFIJOS)]} {id_c0 + i}",
+            f"Calle {SUFIJOS[i % len(SUFIJOS)]} {100 + i % 1900}",
+            comuna_id.get(COMUNAS[comuna_de[i]][0]),
+            f"{lat[i]:.6f}", f"{lon[i]:.6f}", f"SRID=4326;POINT({lon[i]:.6f} {lat[i]:.6f})",
+        )
+        for i in range(n_complejos)
+    ))
+    _paso(f"{n} complejos", t0)
+
+    n = _copy(db, "horarios_atencion", ("id_complejo", "dia", "hora_apertura", "hora_cierre"), (
+        "".join(_linea(c, d, f"{HORA_APERTURA:02d}:00", f"{HORA_CIERRE:02d}:00") for d in _DIAS)
+        for c in complejos
+    ))
+    _paso(f"{n} horarios", t0)
+
+    # --- canchas y tarifas ---
+    por_complejo = np.minimum(1 + rng.poisson(2.5, n_complejos), 8)
+    n_canchas = int(por_complejo.sum())
+    id_ch0 = _reservar_ids(db, "canchas", "id_cancha", n_canchas)
+    complejo_idx = np.repeat(np.arange(n_complejos), por_complejo)
+    dep_de = rng.choice(len(deportes), n_canchas, p=peso_dep)
+    cubierta = rng.random(n_canchas) < 0.3
+    # precio por (día de semana, franja) de cada cancha: el mismo que dicen sus reglas_precio
+    horas = np.arange(HORA_APERTURA, HORA_CIERRE)
+    precios = np.empty((n_canchas, 7, len(horas)))
+    numero = np.zeros(n_complejos, dtype=int)
+
+    def canchas() -> Iterator[str]:
+        for j in range(n_canchas):
+            ci = complejo_idx[j]
+            numero[ci] += 1
+            dep = deportes[dep_de[j]]
+            yield _linea(id_ch0 + j, complejos[ci], f"Cancha {numero[ci]} {dep}", deporte_id[dep],
+                         "t" if cubierta[j] else "f")
+
+    def reglas() -> Iterator[str]:
+        for j in range(n_canchas):
+            _, valle, punta = DEPORTES[deportes[dep_de[j]]]
+            ajuste = 1 + 0.15 * (pop_complejo[complejo_idx[j]] - 0.5)   # los más llenos cobran algo más
+            valle, punta = round(valle * ajuste, -2), round(punta * ajuste, -2)
+            precios[j] = np.where(horas < HORA_PUNTA, valle, punta)
+            lineas = [
+                _linea(id_ch0 + j, None, f"{HORA_APERTURA:02d}:00", f"{HORA_PUNTA:02d}:00", valle),
+                _linea(id_ch0 + j, None, f"{HORA_PUNTA:02d}:00", f"{HORA_CIERRE:02d}:00", punta),
+            ]
+            if tarifa_finde[complejo_idx[j]]:
+                precios[j, 5:] = punta
+                lineas += [_linea(id_ch0 + j, d, f"{HORA_APERTURA:02d}:00", f"{HORA_CIERRE:02d}:00", punta)
+                           for d in ("sabado", "domingo")]
+            yield "".join(lineas)
+
+    n = _copy(db, "canchas", ("id_cancha", "id_complejo", "nombre", "id_deporte", "cubierta"), canchas())
+    _paso(f"{n} canchas", t0)
+    n = _copy(db, "reglas_precio", ("id_cancha", "dia", "hora_inicio", "hora_fin", "precio_por_hora"), reglas())
+    _paso(f"{n} reglas de precio", t0)
+    db.commit()
+
+    # --- reservas ---
+    # todas las fechas en hora local sin zona, como las escribe el COPY
+    local = datetime.now(_TZ).replace(tzinfo=None, second=0, microsecond=0)
+    hoy = local.date()
+    desde = hoy - timedelta(days=dias_pasados)
+    n_dias = dias_pasados + dias_futuros
+    dia_semana = (np.arange(n_dias) + desde.weekday()) % 7
+    ahora = np.datetime64(local, "m")
+    base = np.datetime64(desde, "m")
+    cdf_jug = np.cumsum(_zipf(rng, n_jugadores, 0.6))
+    cdf_jug /= cdf_jug[-1]
+
+    if _existe(db, "reservas_crear_particion"):
+        mes = desde.replace(day=1)
+        while mes <= hoy + timedelta(days=dias_futuros):
+            db.execute(text("SELECT reservas_crear_particion(:m)"), {"m": mes})
+            mes = (mes + timedelta(days=32)).replace(day=1)
+    # los inicios van en hora local (sin zona) y así los interpreta el COPY
+    db.execute(text("SET LOCAL timezone = 'America/Santiago'"))
+    sin_triggers = True
+    try:
+        with db.begin_nested():
+            db.execute(text("SET LOCAL session_replication_role = replica"))
+    except Exception:
+        sin_triggers = False
+        print("  sin permisos para omitir triggers: la carga de reservas los ejecuta fila a fila")
+
+    def reservas() -> Iterator[str]:
+        for j in range(n_canchas):
+            prob = np.minimum(0.95, pop_complejo[complejo_idx[j]] * PESO_DIA[dia_semana][:, None] * PESO_HORA[None, :])
+            ds, hs = np.nonzero(rng.random(prob.shape) < prob)
+            if not len(ds):
+                continue
+            inicio = base + ds.astype("timedelta64[D]") + (hs + HORA_APERTURA).astype("timedelta64[h]")
+            creada = np.minimum(inicio - rng.integers(1, 14 * 24, len(ds)).astype("timedelta64[h]"), ahora)
+            pasada = inicio < ahora
+            r = rng.random(len(ds))
+            estado = np.where(r < np.where(pasada, 0.85, 0.9), "confirmada",
+                              np.where(pasada & (r >= 0.97), "expirada", "cancelada"))
+            usuario = jugadores[np.searchsorted(cdf_jug, rng.random(len(ds)))]
+            precio = precios[j, dia_semana[ds], hs]
+            ini_txt = np.datetime_as_string(inicio, unit="m")
+            fin_txt = np.datetime_as_string(inicio + np.timedelta64(1, "h"), unit="m")
+            cre_txt = np.datetime_as_string(creada, unit="m")
+            cancha = id_ch0 + j
+            yield "".join(
+                f"{cancha}\t{u}\t{a}\t{b}\t{e}\t{p:.0f}\t{c}\t{c}\n"
+                for u, a, b, e, p, c in zip(usuario, ini_txt, fin_txt, estado, precio, cre_txt)
+            )
+
+    n = _copy(db, "reservas", ("id_cancha", "id_usuario", "inicio", "fin", "estado", "precio_total", "created_at", "updated_at"),
+              reservas())
+    db.commit()
+    _paso(f"{n} reservas", t0)
+
+    # --- reseñas (una activa por usuario y complejo) ---
+    n_resenas = 2500 * escala
+    cdf_comp = np.cumsum(pop_complejo)
+    cdf_comp /= cdf_comp[-1]
+    calidad = rng.uniform(3.0, 4.8, n_complejos)
+    pares = set(zip(np.searchsorted(cdf_comp, rng.random(n_resenas)).tolist(),
+                    rng.integers(0, n_jugadores, n_resenas).tolist()))
+    pares_l = sorted(pares)
+    notas = np.clip(np.rint(rng.normal(calidad[[c for c, _ in pares_l]], 0.8)), 1, 5).astype(int)
+    hace = rng.integers(0, max(dias_pasados, 1) * 24, len(pares_l)).astype("timedelta64[h]")
+    fechas = np.datetime_as_string(ahora - hace, unit="m")
+    # el commit de las reservas terminó el SET LOCAL anterior
+    db.execute(text("SET LOCAL timezone = 'America/Santiago'"))
+    n = _copy(db, "resenas", ("id_usuario", "id_complejo", "puntuacion", "created_at"), (
+        _linea(jugadores[u], complejos[c], nota, f)
+        for (c, u), nota, f in zip(pares_l, notas, fechas)
+    ))
+    db.commit()
+    _paso(f"{n} reseñas", t0)
+
+    # --- derivados ---
+    if _existe(db, "complejos_deportes_recalcular"):
+        db.execute(text("SELECT complejos_deportes_recalcular()"))
+    # con triggers activos reservas_diarias ya quedó al día
+    if sin_triggers and _existe(db, "reservas_diarias_recalcular"):
+        db.execute(text("SELECT reservas_diarias_recalcular(:a, :b)"),
+                   {"a": desde, "b": hoy + timedelta(days=dias_futuros)})
+    db.commit()
+    _paso("agregados recalculados", t0)
+
+    # estadísticas al día: el planner no debe seguir viendo las tablas casi vacías
+    for t in ("usuarios", "complejos", "canchas", "reglas_precio", "horarios_atencion", "reservas", "resenas"):
+        db.execute(text(f"ANALYZE {t}"))
+    db.commit()
+    _paso("ANALYZE", t0)
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Carga datos sintéticos a escala (COPY)")
+    ap.add_argument("--escala", type=int, default=1, help="1 ≈ tamaño actual (40 complejos)")
+    ap.add_argument("--dias-pasados", type=int, default=180)
+    ap.add_argument("--dias-futuros", type=int, default=30)
+    ap.add_argument("--password", default="seed1234", help="contraseña de todos los usuarios generados")
+    ap.add_argument("--semilla", type=int, default=2024)
+    args = ap.parse_args()
+
+    from app.core.config import settings
+    from app.db.session import SessionLocal
+
+    if settings.ENV == "production":
+        raise SystemExit("No se generan datos sintéticos con ENV=production")
+    print(f"Generando escala {args.escala} ({args.dias_pasados} días pasados, {args.dias_futuros} futuros)…")
+    db = SessionLocal()
+    try:
+        generar(db, escala=args.escala, dias_pasados=args.dias_pasados, dias_futuros=args.dias_futuros,
+                password=args.password, semilla=args.semilla)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
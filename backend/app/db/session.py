@@ -2,12 +2,16 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db import perfilador
+from app.db.instrumentacion import QueuePoolMedido, instrumentar
 
 # Falla si no hay URL (para detectar el problema antes)
 if not settings.DATABASE_URL:
     raise RuntimeError("DATABASE_URL no está definido: revisa tu .env")
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True, poolclass=QueuePoolMedido)
+instrumentar(engine)
+perfilador.instrumentar(engine)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
 def get_db():
@@ -3,10 +3,45 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.router import api_router
 
 app = FastAPI(title="SportHubTemuco API")
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from app.core import metrics
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.core.middlewares.metrics import MetricsMiddleware, registrar_threadpool
+from app.core.middlewares.perfilador import PerfiladorMiddleware
+from app.modules.reservas import sweeper
+from app.modules.reservas import particiones as reservas_particiones
+from app.modules.pagos import procesador as pagos_procesador
+from app.modules.search import index as search_index
+from app.shared import auditoria
+
+setup_logging()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    registrar_threadpool()
+    # Índice de sugerencias: se carga una vez y luego se mantiene por eventos
+    search_index.construir_en_segundo_plano()
+    # Escritor de auditoría: siempre activo (los eventos no deben quedarse en memoria)
+    auditoria.start()
+    # Tareas en segundo plano (hilos daemon; se detienen al apagar)
+    if settings.BACKGROUND_JOBS:
+        sweeper.start()
+        pagos_procesador.start()
+        reservas_particiones.start()
+    yield
+    sweeper.stop()
+    pagos_procesador.stop()
+    reservas_particiones.stop()
+    auditoria.stop()
+
 
 app = FastAPI(
     title="SportHubTemuco API",
+    lifespan=lifespan,
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
@@ -28,10 +63,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],   # GET, POST, OPTIONS, etc.
     allow_headers=["*"],   # content-type, authorization, etc.
+    expose_headers=["X-Next-Cursor"],  # cursor de /reservas/mias
 )
 
+# IP y user-agent del request para los registros de auditoría
+app.add_middleware(auditoria.OrigenMiddleware)
+# consultas lentas y posibles N+1 por request (desarrollo/staging)
+if settings.PERFILADOR_ACTIVO:
+    app.add_middleware(PerfiladorMiddleware)
+# el último agregado es el más externo: mide también a los demás middlewares
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(api_router, prefix="/api/v1")
 
+@app.get("/metrics", include_in_schema=False, response_class=PlainTextResponse)
+def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/", tags=["_meta"])
 def root():
     return {"ok": True, "docs": "/docs", "api": "/api/v1"}
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from app.shared.deps import get_db, get_current_user
 from app.modules.auth.model import Usuario
 from app.modules.usuarios.repository import get_by_id, set_user_role  # o update_user_admin
+from app.shared import auditoria
 from .schemas import SetRolIn
 
 router = APIRouter(tags=["admin"])  # ya tienes prefix="/admin" en api/v1/router.py
@@ -43,5 +44,8 @@ def set_role_endpoint(
     if target.id_usuario == current.id_usuario and payload.rol == "superadmin" and not _is_super(current):
         raise HTTPException(status_code=403, detail="No puedes elevarte de privilegio")
 
+    rol_anterior = target.rol
     set_user_role(db, target, payload.rol)  # o update_user_admin(..., rol=payload.rol, ...)
+    auditoria.registrar("cambiar_rol", actor_id=current.id_usuario, objeto_tipo="usuario",
+                        id_objeto=target.id_usuario, snapshot={"rol_anterior": rol_anterior, "rol": payload.rol})
     return {"detail": f"Rol actualizado a {payload.rol}"}
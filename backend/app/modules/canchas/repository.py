@@ -3,6 +3,10 @@ from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.modules.catalogos import service as catalogos
+from app.shared import geo
+from app.shared.busqueda import match_texto, relevancia_texto
+
 # ========== utilidades de esquema / ubicación ==========
 def _has_postgis_loc(db: Session) -> bool:
     # detecta columna 'loc' en complejos
@@ -12,9 +16,40 @@ def _has_postgis_loc(db: Session) -> bool:
     """)
     return db.execute(q).first() is not None
 
-def _resolve_deporte_id(db: Session, nombre: str) -> Optional[int]:
-    r = db.execute(text("SELECT id_deporte FROM deportes WHERE lower(nombre)=:n"), {"n": nombre.lower()}).first()
-    return int(r[0]) if r else None
+_BUSQUEDA_CACHE: Dict[str, bool] = {}
+
+def _has_busqueda(db: Session) -> bool:
+    # columnas de texto normalizado/tsvector (08_busqueda_texto.sql); se detecta una vez
+    if "canchas" not in _BUSQUEDA_CACHE:
+        q = text("""
+            SELECT count(*) FROM information_schema.columns
+            WHERE table_schema='public' AND table_name='canchas'
+              AND column_name IN ('busqueda_txt', 'busqueda_tsv')
+        """)
+        _BUSQUEDA_CACHE["canchas"] = db.execute(q).scalar_one() == 2
+    return _BUSQUEDA_CACHE["canchas"]
+
+_DEPORTES_IDS_CACHE: Dict[str, bool] = {}
+
+def _refrescar_deportes(db: Session, id_complejo: int) -> None:
+    # complejos.deportes_ids (09_deportes_complejo.sql); va en la misma transacción que la escritura
+    if "complejos" not in _DEPORTES_IDS_CACHE:
+        q = text("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema='public' AND table_name='complejos' AND column_name='deportes_ids'
+        """)
+        _DEPORTES_IDS_CACHE["complejos"] = db.execute(q).first() is not None
+    if not _DEPORTES_IDS_CACHE["complejos"]:
+        return
+    db.execute(text("""
+        UPDATE complejos c
+        SET deportes_ids = COALESCE((
+              SELECT array_agg(DISTINCT ch.id_deporte ORDER BY ch.id_deporte)
+              FROM canchas ch
+              WHERE ch.id_complejo = c.id_complejo AND ch.activo = TRUE AND ch.deleted_at IS NULL
+            ), '{}')
+        WHERE c.id_complejo = :x
+    """), {"x": id_complejo})
 
 # ========== consultas principales ==========
 def search_canchas(
@@ -34,8 +69,10 @@ def search_canchas(
     offset: int,
     limit: int,
 ) -> Tuple[List[Dict[str, Any]], int]:
+    texto = bool(q) and _has_busqueda(db)
     params: Dict[str, Any] = {
         "q": f"%{q.lower()}%" if q else None,
+        "q_raw": q,
         "id_complejo": id_complejo,
         "deporte": deporte.lower() if deporte else None,
         "cubierta": cubierta,
@@ -45,12 +82,15 @@ def search_canchas(
         "offset": offset, "limit": limit,
     }
 
+    relevancia = relevancia_texto("ch") if texto else "NULL::float"
+
     # base con agregados (rating y precio mínimo vigente)
-    base = """
+    base = f"""
         SELECT
           ch.id_cancha, ch.id_complejo, ch.nombre,
           d.nombre AS deporte,
           ch.cubierta, ch.activo,
+          {relevancia} AS relevancia,
           COALESCE(AVG(rs.puntuacion) FILTER (WHERE rs.esta_activa), NULL) AS rating_promedio,
           (
             SELECT MIN(rp.precio_por_hora)
@@ -67,7 +107,9 @@ def search_canchas(
     """
 
     wheres = []
-    if q:
+    if texto:
+        wheres.append(match_texto("ch"))
+    elif q:
         wheres.append("lower(ch.nombre) LIKE :q")
     if id_complejo is not None:
         wheres.append("ch.id_complejo = :id_complejo")
@@ -78,6 +120,20 @@ def search_canchas(
     if iluminacion is not None:
         # Requiere columna booleana ch.iluminacion
         wheres.append("ch.iluminacion = :iluminacion")
+    # prefiltro por radio antes de agregar: usa el índice GiST de loc (o la caja lat/lon)
+    has_loc = lat is not None and lon is not None and _has_postgis_loc(db)
+    if lat is not None and lon is not None and not has_loc:
+        # sin PostGIS: distancias por complejo desde la grilla en memoria (NumPy)
+        from app.modules.nearby.grid import grilla_cargada
+        cerca = grilla_cargada(db).cercanos(lat, lon, max_km)
+        params["g_ids"] = [i for i, _ in cerca]
+        params["g_km"] = [d for _, d in cerca]
+    if max_km is not None and lat is not None and lon is not None:
+        if has_loc:
+            params["radio_m"] = max_km * 1000
+            wheres.append(geo.dentro_de_radio("c.loc"))
+        else:
+            wheres.append("ch.id_complejo = ANY(CAST(:g_ids AS bigint[]))")
 
     if wheres:
         base += " AND " + " AND ".join(wheres)
@@ -86,34 +142,30 @@ def search_canchas(
 
     # distancia (en outer select para evitar GROUP BY extra)
     if lat is not None and lon is not None:
-        if _has_postgis_loc(db):
-            dist_expr = """
-                CASE WHEN c.loc IS NOT NULL THEN
-                    ST_Distance(c.loc, ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography)/1000.0
-                ELSE NULL END
+        if has_loc:
+            dist = f"""
+                SELECT b.*,
+                       CASE WHEN c.loc IS NOT NULL THEN
+                           ST_Distance(c.loc, {geo.PUNTO})/1000.0
+                       ELSE NULL END AS distancia_km
+                FROM base b
+                JOIN complejos c ON c.id_complejo = b.id_complejo
             """
         else:
-            dist_expr = """
-                CASE WHEN c.latitud IS NOT NULL AND c.longitud IS NOT NULL THEN
-                  (6371 * acos(
-                    cos(radians(:lat)) * cos(radians(c.latitud)) * cos(radians(c.longitud) - radians(:lon))
-                    + sin(radians(:lat)) * sin(radians(c.latitud))
-                  ))
-                ELSE NULL END
+            dist = """
+                SELECT b.*, g.km AS distancia_km
+                FROM base b
+                LEFT JOIN unnest(CAST(:g_ids AS bigint[]), CAST(:g_km AS float8[])) AS g(id, km)
+                       ON g.id = b.id_complejo
             """
-        final = f"""
-            WITH base AS ({base})
-            SELECT b.*,
-                   {dist_expr} AS distancia_km
-            FROM base b
-            JOIN complejos c ON c.id_complejo = b.id_complejo
-        """
     else:
-        final = f"WITH base AS ({base}) SELECT b.*, NULL::numeric AS distancia_km FROM base b"
+        dist = "SELECT b.*, NULL::numeric AS distancia_km FROM base b"
+    # distancia_km como columna de un CTE para poder filtrar por ella
+    final = f"WITH base AS ({base}), con_dist AS ({dist}) SELECT * FROM con_dist"
 
     # filtrar por precio máximo si se envió
     if max_precio is not None:
-        final += " WHERE b.precio_desde IS NOT NULL AND b.precio_desde <= :max_precio"
+        final += " WHERE precio_desde IS NOT NULL AND precio_desde <= :max_precio"
 
     # filtro por cercanía
     if max_km is not None and lat is not None and lon is not None:
@@ -127,9 +179,12 @@ def search_canchas(
         "nombre": "nombre",
         "recientes": "id_cancha DESC"
     }
-    ob = ordermap.get(sort_by, "nombre")
-    direction = "ASC" if (order or "").lower() == "asc" else "DESC"
-    final += f" ORDER BY {ob} {direction}"
+    if sort_by == "relevancia" and texto:
+        final += " ORDER BY relevancia DESC, nombre ASC"
+    else:
+        ob = ordermap.get(sort_by, "nombre")
+        direction = "ASC" if (order or "").lower() == "asc" else "DESC"
+        final += f" ORDER BY {ob} {direction}"
 
     count_sql = f"SELECT count(*) FROM ({final}) t"
     total = db.execute(text(count_sql), params).scalar_one()
@@ -208,7 +263,7 @@ def insert_cancha(db: Session, data: Dict[str, Any]) -> Dict[str, Any]:
         "cubierta": bool(data.get("cubierta", False)),
     }
     if payload["id_deporte"] is None and data.get("deporte"):
-        dep_id = _resolve_deporte_id(db, str(data["deporte"]))
+        dep_id = catalogos.deporte_id(db, str(data["deporte"]))
         if dep_id is None:
             raise ValueError("Deporte no encontrado")
         payload["id_deporte"] = dep_id
@@ -220,12 +275,12 @@ def insert_cancha(db: Session, data: Dict[str, Any]) -> Dict[str, Any]:
         VALUES (:id_complejo, :nombre, :id_deporte, :cubierta, TRUE)
         RETURNING id_cancha, id_complejo, nombre, id_deporte, cubierta, activo
     """), payload).mappings().first()
+    _refrescar_deportes(db, payload["id_complejo"])
     db.commit()
 
     # traer nombre del deporte
     out = dict(row)
-    dep_name = db.execute(text("SELECT nombre FROM deportes WHERE id_deporte=:id"), {"id": out["id_deporte"]}).scalar_one()
-    out["deporte"] = dep_name
+    out["deporte"] = catalogos.deporte_nombre(db, out["id_deporte"])
     del out["id_deporte"]
     # métricas default
     out["precio_desde"] = None
@@ -245,7 +300,7 @@ def update_cancha(db: Session, id_cancha: int, data: Dict[str, Any]) -> Optional
     if data.get("id_deporte") is not None:
         updates["id_deporte"] = int(data["id_deporte"])
     elif data.get("deporte") is not None:
-        dep_id = _resolve_deporte_id(db, str(data["deporte"]))
+        dep_id = catalogos.deporte_id(db, str(data["deporte"]))
         if dep_id is None:
             raise ValueError("Deporte no encontrado")
         updates["id_deporte"] = dep_id
@@ -261,13 +316,14 @@ def update_cancha(db: Session, id_cancha: int, data: Dict[str, Any]) -> Optional
         WHERE id_cancha = :id
         RETURNING id_cancha, id_complejo, nombre, id_deporte, cubierta, activo
     """), params).mappings().first()
+    if row and ("activo" in updates or "id_deporte" in updates):
+        _refrescar_deportes(db, int(row["id_complejo"]))
     db.commit()
     if not row:
         return None
 
     out = dict(row)
-    dep_name = db.execute(text("SELECT nombre FROM deportes WHERE id_deporte=:id"), {"id": out["id_deporte"]}).scalar_one()
-    out["deporte"] = dep_name
+    out["deporte"] = catalogos.deporte_nombre(db, out["id_deporte"])
     del out["id_deporte"]
 
     # recomputar métricas
@@ -292,7 +348,12 @@ def update_cancha(db: Session, id_cancha: int, data: Dict[str, Any]) -> Optional
     return out
 
 def soft_delete_cancha(db: Session, id_cancha: int) -> None:
-    db.execute(text("UPDATE canchas SET activo = FALSE, updated_at = now() WHERE id_cancha = :id"), {"id": id_cancha})
+    row = db.execute(text("""
+        UPDATE canchas SET activo = FALSE, updated_at = now() WHERE id_cancha = :id
+        RETURNING id_complejo
+    """), {"id": id_cancha}).first()
+    if row:
+        _refrescar_deportes(db, int(row[0]))
     db.commit()
 
 # ===== Fotos =====
@@ -30,7 +30,8 @@ router = APIRouter(prefix="/canchas", tags=["canchas"])
     description=(
         "Devuelve canchas con filtros por **deporte**, **techada** (alias de `cubierta`), "
         "**iluminación**, **precio máximo** y **cercanas** (`lat`/`lon` + `max_km`).\n\n"
-        "Ordena por `distancia`, `precio`, `rating`, `nombre` o `recientes`.\n"
+        "Ordena por `distancia`, `precio`, `rating`, `nombre`, `recientes` o `relevancia` (con `q`; "
+        "ignora acentos y tolera errores de tipeo).\n"
         "Si envías `lat`/`lon` se calcula `distancia_km` usando PostGIS si está disponible."
     ),
 )
@@ -48,7 +48,7 @@ class CanchasQuery(BaseModel):
     lat: Optional[Lat] = None
     lon: Optional[Lon] = None
     max_km: Optional[PositiveKm] = Field(None, description="Radio máximo en km (requiere lat/lon)")
-    sort_by: Optional[Literal["distancia","precio","rating","nombre","recientes"]] = "nombre"
+    sort_by: Optional[Literal["distancia","precio","rating","nombre","recientes","relevancia"]] = "nombre"
     order: Optional[Literal["asc","desc"]] = "asc"
     page: Page = 1
     page_size: PageSize = 20
@@ -9,6 +9,9 @@ from app.modules.canchas.schemas import (
 from app.modules.canchas import repository as repo
 from app.modules.auth.model import Usuario
 from app.modules.complejos import repository as complejos_repo
+from app.shared import auditoria, events
+
+TOPIC_CANCHA_CAMBIADA = "cancha.cambiada"
 
 def _is_admin(user: Usuario) -> bool:
     return user.rol in ("admin", "superadmin")
@@ -44,6 +47,7 @@ def create_cancha(db: Session, current: Usuario, data: CanchaCreateIn) -> Cancha
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    events.publish(TOPIC_CANCHA_CAMBIADA, out)
     return CanchaOut(**out)
 
 def get_cancha(db: Session, id_cancha: int, lat: Optional[float], lon: Optional[float]) -> CanchaOut:
@@ -65,6 +69,7 @@ def update_cancha(db: Session, id_cancha: int, current: Usuario, data: CanchaUpd
         raise HTTPException(status_code=400, detail=str(e))
     if not row:
         raise HTTPException(status_code=404, detail="Cancha no encontrada")
+    events.publish(TOPIC_CANCHA_CAMBIADA, row)
     return CanchaOut(**row)
 
 def delete_cancha(db: Session, id_cancha: int, current: Usuario) -> dict:
@@ -74,6 +79,9 @@ def delete_cancha(db: Session, id_cancha: int, current: Usuario) -> dict:
     if not (_is_admin(current) or current.id_usuario == id_dueno):
         raise HTTPException(status_code=403, detail="No autorizado para eliminar esta cancha")
     repo.soft_delete_cancha(db, id_cancha)
+    auditoria.registrar("desactivar_cancha", actor_id=current.id_usuario, objeto_tipo="cancha",
+                        id_objeto=id_cancha, snapshot={"id_dueno": id_dueno})
+    events.publish(TOPIC_CANCHA_CAMBIADA, {"id_cancha": id_cancha, "activo": False})
     return {"ok": True}
 
 # ===== Fotos =====
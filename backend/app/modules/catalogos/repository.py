@@ -0,0 +1,31 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+_SCHEMA_CACHE: Dict[str, bool] = {}
+
+def _has_version(db: Session) -> bool:
+    if "catalogos_version" not in _SCHEMA_CACHE:
+        q = text("SELECT to_regclass('public.catalogos_version') IS NOT NULL")
+        _SCHEMA_CACHE["catalogos_version"] = bool(db.execute(q).scalar_one())
+    return _SCHEMA_CACHE["catalogos_version"]
+
+def get_version(db: Session) -> Optional[int]:
+    """Versión de catálogos (10_catalogos_version.sql); None si el esquema no la tiene."""
+    if not _has_version(db):
+        return None
+    v = db.execute(text("SELECT version FROM catalogos_version WHERE id")).scalar()
+    return int(v) if v is not None else None
+
+def list_deportes(db: Session) -> List[Dict[str, Any]]:
+    rows = db.execute(text("SELECT id_deporte, nombre FROM deportes ORDER BY nombre")).mappings().all()
+    return [dict(r) for r in rows]
+
+def list_comunas(db: Session) -> List[Dict[str, Any]]:
+    rows = db.execute(text("SELECT id_comuna, nombre FROM comunas ORDER BY nombre")).mappings().all()
+    return [dict(r) for r in rows]
+
+def list_servicios(db: Session) -> List[Dict[str, Any]]:
+    rows = db.execute(text("SELECT id_servicio, nombre, icono FROM servicios ORDER BY nombre")).mappings().all()
+    return [dict(r) for r in rows]
@@ -0,0 +1,31 @@
+from __future__ import annotations
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.orm import Session
+
+from app.shared.deps import get_db
+from app.modules.catalogos import service as svc
+from app.modules.catalogos.schemas import CatalogosOut
+
+router = APIRouter(prefix="/catalogos", tags=["catalogos"])
+
+_CACHE_CONTROL = "public, max-age=300"
+
+@router.get(
+    "",
+    response_model=CatalogosOut,
+    summary="Catálogos (deportes, comunas, servicios)",
+    description=(
+        "Listas para filtros y formularios. Se sirven desde memoria con `ETag`: si el cliente envía "
+        "`If-None-Match` con la versión vigente responde 304 sin cuerpo."
+    ),
+    responses={304: {"description": "Sin cambios desde la versión enviada"}},
+)
+def catalogos_endpoint(request: Request, response: Response, db: Session = Depends(get_db)):
+    cat = svc.get(db)
+    etag = f'"{cat.version}"'
+    headers = {"ETag": etag, "Cache-Control": _CACHE_CONTROL}
+    enviados = {t.strip() for t in request.headers.get("if-none-match", "").split(",")}
+    if etag in enviados or f"W/{etag}" in enviados:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return cat.dump()
@@ -0,0 +1,22 @@
+from __future__ import annotations
+from typing import List, Optional
+from pydantic import BaseModel
+
+class DeporteOut(BaseModel):
+    id_deporte: int
+    nombre: str
+
+class ComunaOut(BaseModel):
+    id_comuna: int
+    nombre: str
+
+class ServicioOut(BaseModel):
+    id_servicio: int
+    nombre: str
+    icono: Optional[str] = None
+
+class CatalogosOut(BaseModel):
+    version: str
+    deportes: List[DeporteOut]
+    comunas: List[ComunaOut]
+    servicios: List[ServicioOut]
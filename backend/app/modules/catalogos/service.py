@@ -0,0 +1,109 @@
+# app/modules/catalogos/service.py
+"""Catálogos casi estáticos (deportes, comunas, servicios) en memoria.
+
+Se cargan completos una vez y se revalidan cada CATALOGOS_REVALIDAR_S comparando
+`catalogos_version` (un SELECT de una fila); si cambió, se recargan. La versión expuesta
+es un hash del contenido, así todas las réplicas entregan el mismo ETag.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import threading
+import time as _time
+from typing import Any, Dict, List, Optional
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+from app.modules.catalogos import repository as repo
+
+# recarga forzada por un nombre/id desconocido: como mucho una cada tantos segundos
+_RECARGA_POR_FALLO_S = 5.0
+
+class Catalogos:
+    def __init__(self, version_bd: Optional[int], deportes: List[Dict[str, Any]],
+                 comunas: List[Dict[str, Any]], servicios: List[Dict[str, Any]]):
+        self.version_bd = version_bd
+        self.deportes = deportes
+        self.comunas = comunas
+        self.servicios = servicios
+        self.deporte_por_nombre = {d["nombre"].lower(): d["id_deporte"] for d in deportes}
+        self.deporte_por_id = {d["id_deporte"]: d["nombre"] for d in deportes}
+        self.comuna_por_nombre = {c["nombre"].lower(): c["id_comuna"] for c in comunas}
+        self.comuna_por_id = {c["id_comuna"]: c["nombre"] for c in comunas}
+        crudo = json.dumps([deportes, comunas, servicios], sort_keys=True, default=str)
+        self.version = hashlib.sha1(crudo.encode()).hexdigest()[:16]
+
+    def dump(self) -> Dict[str, Any]:
+        return {"version": self.version, "deportes": self.deportes,
+                "comunas": self.comunas, "servicios": self.servicios}
+
+_ACTUAL: Optional[Catalogos] = None
+_REVISADO = 0.0       # monotonic de la última comparación de versión
+_RECARGADO = 0.0      # monotonic de la última carga completa
+_LOCK = threading.Lock()
+
+def _cargar(db: Session) -> Catalogos:
+    global _ACTUAL, _REVISADO, _RECARGADO
+    cat = Catalogos(repo.get_version(db), repo.list_deportes(db), repo.list_comunas(db), repo.list_servicios(db))
+    with _LOCK:
+        _ACTUAL = cat
+        _REVISADO = _RECARGADO = _time.monotonic()
+    return cat
+
+def invalidar() -> None:
+    global _ACTUAL
+    with _LOCK:
+        _ACTUAL = None
+
+def get(db: Session) -> Catalogos:
+    global _REVISADO
+    with _LOCK:
+        cat, revisado = _ACTUAL, _REVISADO
+    if cat is None:
+        metrics.cache("catalogos", False)
+        return _cargar(db)
+    if _time.monotonic() - revisado < settings.CATALOGOS_REVALIDAR_S:
+        metrics.cache("catalogos", True)
+        return cat
+    v = repo.get_version(db)
+    if v is None or v != cat.version_bd:
+        # sin tabla de versión no hay cómo saberlo: se recarga (son tres tablas chicas)
+        metrics.cache("catalogos", False)
+        return _cargar(db)
+    metrics.cache("catalogos", True)
+    with _LOCK:
+        _REVISADO = _time.monotonic()
+    return cat
+
+def _tras_fallo(db: Session) -> Optional[Catalogos]:
+    """Recarga si el valor pudo haberse creado hace poco; None si ya se recargó recién."""
+    with _LOCK:
+        reciente = _time.monotonic() - _RECARGADO < _RECARGA_POR_FALLO_S
+    return None if reciente else _cargar(db)
+
+def deporte_id(db: Session, nombre: str) -> Optional[int]:
+    clave = nombre.lower()
+    r = get(db).deporte_por_nombre.get(clave)
+    if r is None and (cat := _tras_fallo(db)):
+        r = cat.deporte_por_nombre.get(clave)
+    return r
+
+def deporte_nombre(db: Session, id_deporte: int) -> Optional[str]:
+    r = get(db).deporte_por_id.get(id_deporte)
+    if r is None and (cat := _tras_fallo(db)):
+        r = cat.deporte_por_id.get(id_deporte)
+    return r
+
+def comuna_id(db: Session, nombre: str) -> Optional[int]:
+    clave = nombre.lower()
+    r = get(db).comuna_por_nombre.get(clave)
+    if r is None and (cat := _tras_fallo(db)):
+        r = cat.comuna_por_nombre.get(clave)
+    return r
+
+def comuna_nombre(db: Session, id_comuna: int) -> Optional[str]:
+    r = get(db).comuna_por_id.get(id_comuna)
+    if r is None and (cat := _tras_fallo(db)):
+        r = cat.comuna_por_id.get(id_comuna)
+    return r
@@ -3,6 +3,11 @@ from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.modules.catalogos import service as catalogos
+from app.shared import geo
+from app.shared.busqueda import match_texto, relevancia_texto
+from app.shared.deportes import existe_deporte, tiene_deporte
+
 # =========================
 # Detección de esquema (cache)
 # =========================
@@ -31,6 +36,8 @@ def _schema_info(db: Session) -> Dict[str, Any]:
     has_comuna_text = "comuna" in cols_c            # algunos esquemas la traen
     has_id_comuna = "id_comuna" in cols_c           # tu esquema: SÍ
     has_loc = "loc" in cols_c                       # tu esquema: SÍ
+    has_busqueda = {"busqueda_txt", "busqueda_tsv"} <= cols_c   # 08_busqueda_texto.sql
+    has_deportes_ids = "deportes_ids" in cols_c                 # 09_deportes_complejo.sql
     comunas_exists = _table_exists(db, "comunas")
     comunas_name_col: Optional[str] = None
     if comunas_exists:
@@ -44,6 +51,8 @@ def _schema_info(db: Session) -> Dict[str, Any]:
         "has_comuna_text": has_comuna_text,
         "has_id_comuna": has_id_comuna,
         "has_loc": has_loc,
+        "has_busqueda": has_busqueda,
+        "has_deportes_ids": has_deportes_ids,
         "comunas_exists": comunas_exists,
         "comunas_name_col": comunas_name_col,
     }
@@ -53,7 +62,7 @@ def _schema_info(db: Session) -> Dict[str, Any]:
 # =========================
 # SELECT dinámico
 # =========================
-def _base_select(info: Dict[str, Any], dist_calc: bool) -> str:
+def _base_select(info: Dict[str, Any], dist_calc: bool, relevancia: bool = False, grilla: bool = False) -> str:
     # columnas de comuna
     if info["has_comuna_text"]:
         comuna_sel = "c.comuna AS comuna"
@@ -72,9 +81,14 @@ def _base_select(info: Dict[str, Any], dist_calc: bool) -> str:
         id_comuna_sel = "NULL::bigint AS id_comuna"
         join_co = ""
 
-    # distancia: usa loc (PostGIS) si existe, si no, Haversine
+    # distancia: usa loc (PostGIS) si existe; si no, distancias precalculadas por la grilla
+    # en memoria (:g_ids/:g_km) o, para una sola fila, Haversine
+    join_g = ""
     if dist_calc:
-        if info["has_loc"]:
+        if grilla:
+            dist = ", MIN(g.km) AS distancia_km"
+            join_g = " LEFT JOIN unnest(CAST(:g_ids AS bigint[]), CAST(:g_km AS float8[])) AS g(id, km) ON g.id = c.id_complejo "
+        elif info["has_loc"]:
             dist = """
               , CASE WHEN :lat IS NOT NULL AND :lon IS NOT NULL AND c.loc IS NOT NULL THEN
                     ST_Distance(
@@ -95,6 +109,10 @@ def _base_select(info: Dict[str, Any], dist_calc: bool) -> str:
     else:
         dist = ", NULL::numeric AS distancia_km"
 
+    # relevancia: full-text (pesos nombre > comuna > dirección) + similitud trigram (typos)
+    if relevancia:
+        dist += f", {relevancia_texto('c')} AS relevancia"
+
     return f"""
     SELECT
       c.id_complejo, c.id_dueno, c.nombre, c.direccion,
@@ -105,7 +123,7 @@ def _base_select(info: Dict[str, Any], dist_calc: bool) -> str:
       {dist}
     FROM complejos c
     LEFT JOIN resenas r ON r.id_complejo = c.id_complejo
-    {join_co}
+    {join_co}{join_g}
     """
 
 def _comuna_for_where(info: Dict[str, Any]) -> Optional[str]:
@@ -134,8 +152,10 @@ def search_complejos(
     limit: int,
 ) -> Tuple[List[Dict[str, Any]], int]:
     info = _schema_info(db)
+    texto = bool(q) and info["has_busqueda"]
     params = {
         "q": f"%{q.lower()}%" if q else None,
+        "q_raw": q,
         "comuna": comuna.lower() if comuna else None,
         "id_comuna": id_comuna,
         "deporte": deporte.lower() if deporte else None,
@@ -144,19 +164,24 @@ def search_complejos(
         "offset": offset, "limit": limit
     }
 
-    base = _base_select(info, dist_calc=(lat is not None and lon is not None))
-    joins = ""
+    dist_calc = lat is not None and lon is not None
+    usa_grilla = dist_calc and not info["has_loc"]
+    if usa_grilla:
+        from app.modules.nearby.grid import grilla_cargada
+        cerca = grilla_cargada(db).cercanos(lat, lon, max_km)
+        params["g_ids"] = [i for i, _ in cerca]
+        params["g_km"] = [d for _, d in cerca]
+    base = _base_select(info, dist_calc=dist_calc, relevancia=texto, grilla=usa_grilla)
     wheres = ["c.activo = TRUE", "c.deleted_at IS NULL"]
 
     if deporte:
-        joins += """
-            JOIN canchas ch ON ch.id_complejo = c.id_complejo AND ch.activo = TRUE AND ch.deleted_at IS NULL
-            JOIN deportes d ON d.id_deporte = ch.id_deporte
-        """
-        wheres.append("lower(d.nombre) = :deporte")
+        # sin JOIN a canchas: no multiplica las filas de reseñas antes del GROUP BY
+        wheres.append(tiene_deporte("c") if info["has_deportes_ids"] else existe_deporte("c"))
 
     comuna_expr = _comuna_for_where(info)
-    if q:
+    if texto:
+        wheres.append(match_texto("c"))
+    elif q:
         if comuna_expr:
             wheres.append(f"(lower(c.nombre) LIKE :q OR lower(c.direccion) LIKE :q OR lower({comuna_expr}) LIKE :q)")
         else:
@@ -168,12 +193,20 @@ def search_complejos(
     if id_comuna is not None and info["has_id_comuna"]:
         wheres.append("c.id_comuna = :id_comuna")
 
+    # prefiltro por radio antes de agregar: usa el índice GiST de loc (o la caja lat/lon)
+    if max_km is not None and lat is not None and lon is not None:
+        if info["has_loc"]:
+            params["radio_m"] = max_km * 1000
+            wheres.append(geo.dentro_de_radio("c.loc"))
+        else:
+            wheres.append("c.id_complejo = ANY(CAST(:g_ids AS bigint[]))")
+
     # 🔧 GROUP BY dinámico
     group_by_cols = ["c.id_complejo"]
     if info["has_id_comuna"] and info["comunas_exists"] and info["comunas_name_col"]:
         group_by_cols.append(f"co.{info['comunas_name_col']}")
 
-    sql = base + joins + " WHERE " + " AND ".join(wheres) + " GROUP BY " + ", ".join(group_by_cols)
+    sql = base + " WHERE " + " AND ".join(wheres) + " GROUP BY " + ", ".join(group_by_cols)
 
     if max_km is not None and lat is not None and lon is not None:
         sql = f"WITH base AS ({sql}) SELECT * FROM base WHERE distancia_km <= :max_km"
@@ -186,9 +219,12 @@ def search_complejos(
         "nombre": "nombre",
         "recientes": "id_complejo DESC"
     }
-    ob = ordermap.get(sort_by, "nombre")
-    direction = "ASC" if (order or "").lower() == "asc" else "DESC"
-    sql += f" ORDER BY {ob} {direction}"
+    if sort_by == "relevancia" and texto:
+        sql += " ORDER BY relevancia DESC, nombre ASC"
+    else:
+        ob = ordermap.get(sort_by, "nombre")
+        direction = "ASC" if (order or "").lower() == "asc" else "DESC"
+        sql += f" ORDER BY {ob} {direction}"
 
     count_sql = f"SELECT count(*) FROM ({sql}) t"
     total = db.execute(text(count_sql), params).scalar_one()
@@ -213,21 +249,32 @@ def get_complejo_by_id(db: Session, id_complejo: int, lat: Optional[float]=None,
     return dict(row) if row else None
 
 # ====== Helpers comuna ======
+# el catálogo en memoria lee comunas.nombre; con otra columna de nombre se consulta directo
 def _resolve_comuna_id(db: Session, info: Dict[str, Any], nombre: str) -> Optional[int]:
-    if not (info["comunas_exists"] and info["comunas_name_col"]):
+    col = info["comunas_name_col"]
+    if not (info["comunas_exists"] and col):
         return None
-    q = text(f"SELECT id_comuna FROM comunas WHERE lower({info['comunas_name_col']}) = :n LIMIT 1")
+    if col == "nombre":
+        return catalogos.comuna_id(db, nombre)
+    q = text(f"SELECT id_comuna FROM comunas WHERE lower({col}) = :n LIMIT 1")
     r = db.execute(q, {"n": nombre.lower()}).first()
     return int(r[0]) if r else None
 
 def _resolve_comuna_nombre(db: Session, info: Dict[str, Any], id_comuna: int) -> Optional[str]:
-    if not (info["comunas_exists"] and info["comunas_name_col"]):
+    col = info["comunas_name_col"]
+    if not (info["comunas_exists"] and col):
         return None
-    q = text(f"SELECT {info['comunas_name_col']} FROM comunas WHERE id_comuna = :i")
+    if col == "nombre":
+        return catalogos.comuna_nombre(db, id_comuna)
+    q = text(f"SELECT {col} FROM comunas WHERE id_comuna = :i")
     r = db.execute(q, {"i": id_comuna}).first()
     return str(r[0]) if r else None
 
 # ====== Insert/Update ======
+def _loc_expr(lat: str, lon: str) -> str:
+    # NULL si falta alguna coordenada (ST_MakePoint con NULL da NULL)
+    return f"ST_SetSRID(ST_MakePoint({lon}, {lat}), 4326)::geography"
+
 def insert_complejo(db: Session, id_dueno: int, data: Dict[str, Any]) -> Dict[str, Any]:
     info = _schema_info(db)
     payload: Dict[str, Any] = {
@@ -263,6 +310,11 @@ def insert_complejo(db: Session, id_dueno: int, data: Dict[str, Any]) -> Dict[st
         cols = "(id_dueno, nombre, descripcion, direccion, latitud, longitud, activo)"
         vals = "(:id_dueno, :nombre, :descripcion, :direccion, :latitud, :longitud, TRUE)"
 
+    # mantener loc (PostGIS) en sync para búsquedas por cercanía con índice GiST
+    if info["has_loc"]:
+        cols = cols[:-1] + ", loc)"
+        vals = vals[:-1] + ", " + _loc_expr("CAST(:latitud AS float8)", "CAST(:longitud AS float8)") + ")"
+
     sql = text(f"""
         INSERT INTO complejos {cols}
         VALUES {vals}
@@ -306,6 +358,10 @@ def update_complejo(db: Session, id_complejo: int, data: Dict[str, Any]) -> Opti
         return get_complejo_by_id(db, id_complejo)
 
     set_parts = [f"{k} = :{k}" for k in updates.keys()]
+    if info["has_loc"] and ("latitud" in updates or "longitud" in updates):
+        lat = "CAST(:latitud AS float8)" if "latitud" in updates else "latitud::float8"
+        lon = "CAST(:longitud AS float8)" if "longitud" in updates else "longitud::float8"
+        set_parts.append(f"loc = {_loc_expr(lat, lon)}")
     params = {"id": id_complejo, **updates}
     sql = text(f"""
         UPDATE complejos SET {", ".join(set_parts)}, updated_at = now()
@@ -373,50 +429,184 @@ def list_bloqueos(db: Session, id_complejo: int) -> List[Dict[str, Any]]:
     return [dict(r) for r in rows]
 
 def resumen_basico(db: Session, id_complejo: int, desde: str, hasta: str) -> Dict[str, Any]:
-    n_canchas = db.execute(
-        text("SELECT COUNT(*) FROM canchas WHERE id_complejo=:id AND activo=TRUE AND deleted_at IS NULL"),
-        {"id": id_complejo}
-    ).scalar_one()
-
+    # KPIs desde el acumulado diario (reservas_diarias) y capacidad desde el calendario precalculado
     q = text("""
-        SELECT
-          COUNT(*) FILTER (WHERE r.estado='confirmada') AS reservas_confirmadas,
-          COALESCE(SUM(EXTRACT(EPOCH FROM (r.fin - r.inicio))/3600.0) FILTER (WHERE r.estado='confirmada'), 0) AS horas_reservadas,
-          COALESCE(SUM(r.precio_total) FILTER (WHERE r.estado='confirmada'), 0) AS ingresos_confirmados
-        FROM reservas r
-        JOIN canchas ch ON ch.id_cancha = r.id_cancha
-        WHERE ch.id_complejo = :id
-          AND r.inicio::date BETWEEN :desde AND :hasta
+        WITH k AS (
+          SELECT COALESCE(SUM(d.reservas_confirmadas), 0) AS reservas_confirmadas,
+                 COALESCE(SUM(d.horas_reservadas), 0)     AS horas_reservadas,
+                 COALESCE(SUM(d.ingresos_confirmados), 0) AS ingresos_confirmados
+          FROM reservas_diarias d
+          JOIN canchas ch ON ch.id_cancha = d.id_cancha
+          WHERE ch.id_complejo = :id
+            AND d.fecha BETWEEN CAST(:desde AS date) AND CAST(:hasta AS date)
+        ),
+        cap AS (
+          SELECT COALESCE(SUM(EXTRACT(EPOCH FROM (h.hora_cierre - h.hora_apertura))/3600.0), 0) AS horas_disponibles
+          FROM calendario cal
+          JOIN horarios_atencion h ON h.dia = cal.dia AND h.id_complejo = :id AND h.id_cancha IS NULL
+          WHERE cal.fecha BETWEEN CAST(:desde AS date) AND CAST(:hasta AS date)
+        )
+        SELECT k.*, cap.horas_disponibles,
+               (SELECT COUNT(*) FROM canchas
+                WHERE id_complejo = :id AND activo = TRUE AND deleted_at IS NULL) AS n_canchas
+        FROM k, cap
     """)
-    kpis = db.execute(q, {"id": id_complejo, "desde": desde, "hasta": hasta}).mappings().first()
-    reservas_confirmadas = int(kpis["reservas_confirmadas"] or 0)
+    kpis = db.execute(q, {"id": id_complejo, "desde": desde, "hasta": hasta}).mappings().one()
     horas_reservadas = float(kpis["horas_reservadas"] or 0.0)
-    ingresos_confirmados = float(kpis["ingresos_confirmados"] or 0.0)
-
-    horarios = db.execute(text("""
-        SELECT dia::text AS dia, EXTRACT(EPOCH FROM (hora_cierre - hora_apertura))/3600.0 AS horas
-        FROM horarios_atencion
-        WHERE id_complejo = :id AND id_cancha IS NULL
-    """), {"id": id_complejo}).mappings().all()
-    horas_por_dia = {h["dia"].lower(): float(h["horas"]) for h in horarios}
-
-    from datetime import datetime, timedelta
-    d0 = datetime.fromisoformat(desde).date()
-    d1 = datetime.fromisoformat(hasta).date()
-    total_dias = (d1 - d0).days + 1
-    dias_sem = {"lunes":0,"martes":0,"miercoles":0,"jueves":0,"viernes":0,"sabado":0,"domingo":0}
-    for i in range(total_dias):
-        d = d0 + timedelta(days=i)
-        key = ["lunes","martes","miercoles","jueves","viernes","sabado","domingo"][d.weekday()]
-        dias_sem[key] += 1
-
-    horas_disponibles = sum((horas_por_dia.get(k, 0.0) * n) for k, n in dias_sem.items())
-    capacidad = horas_disponibles * (n_canchas or 0)
+    capacidad = float(kpis["horas_disponibles"] or 0.0) * int(kpis["n_canchas"] or 0)
     ocupacion = float(horas_reservadas / capacidad) if capacidad > 0 else 0.0
 
     return {
-        "reservas_confirmadas": reservas_confirmadas,
+        "reservas_confirmadas": int(kpis["reservas_confirmadas"] or 0),
         "horas_reservadas": horas_reservadas,
-        "ingresos_confirmados": ingresos_confirmados,
+        "ingresos_confirmados": float(kpis["ingresos_confirmados"] or 0.0),
         "ocupacion": round(ocupacion, 4),
     }
+
+def portafolio(db: Session, id_usuario: int, desde: str, hasta: str, por_cancha: bool = False) -> List[Dict[str, Any]]:
+    """
+    KPIs de todos los complejos de un dueño (o donde es manager) en una sola consulta agrupada.
+    Con por_cancha=True agrega filas por cancha (GROUPING SETS); es_total marca la fila del complejo.
+    """
+    if por_cancha:
+        cols = "ch.id_cancha, MIN(ch.nombre) AS cancha, GROUPING(ch.id_cancha) = 1 AS es_total"
+        grupos = "GROUPING SETS ((cx.id_complejo), (cx.id_complejo, ch.id_cancha))"
+    else:
+        cols = "NULL::bigint AS id_cancha, NULL::text AS cancha, TRUE AS es_total"
+        grupos = "cx.id_complejo"
+
+    q = text(f"""
+        WITH cx AS (
+          SELECT c.id_complejo, c.nombre, c.activo
+          FROM complejos c
+          WHERE c.id_dueno = :u
+             OR EXISTS (SELECT 1 FROM complejo_usuarios cu
+                        WHERE cu.id_complejo = c.id_complejo AND cu.id_usuario = :u AND cu.rol = 'manager')
+        ),
+        dias AS (
+          SELECT (ARRAY['lunes','martes','miercoles','jueves','viernes','sabado','domingo'])[EXTRACT(ISODOW FROM d)] AS dia,
+                 COUNT(*) AS n
+          FROM generate_series(CAST(:desde AS date), CAST(:hasta AS date), INTERVAL '1 day') AS d
+          GROUP BY 1
+        ),
+        cap AS (
+          SELECT h.id_complejo,
+                 SUM(dias.n * EXTRACT(EPOCH FROM (h.hora_cierre - h.hora_apertura))/3600.0) AS horas
+          FROM horarios_atencion h
+          JOIN cx   ON cx.id_complejo = h.id_complejo
+          JOIN dias ON dias.dia = h.dia::text
+          WHERE h.id_cancha IS NULL
+          GROUP BY h.id_complejo
+        ),
+        k AS (
+          SELECT d.id_cancha,
+                 SUM(d.reservas_confirmadas) AS reservas,
+                 SUM(d.horas_reservadas)     AS horas,
+                 SUM(d.ingresos_confirmados) AS ingresos
+          FROM reservas_diarias d
+          JOIN canchas ch ON ch.id_cancha = d.id_cancha
+          JOIN cx ON cx.id_complejo = ch.id_complejo
+          WHERE d.fecha BETWEEN CAST(:desde AS date) AND CAST(:hasta AS date)
+          GROUP BY d.id_cancha
+        )
+        SELECT cx.id_complejo, MIN(cx.nombre) AS nombre, BOOL_AND(cx.activo) AS activo,
+               {cols},
+               COALESCE(SUM(k.reservas), 0) AS reservas_confirmadas,
+               COALESCE(SUM(k.horas), 0)    AS horas_reservadas,
+               COALESCE(SUM(k.ingresos), 0) AS ingresos_confirmados,
+               COUNT(ch.id_cancha) FILTER (WHERE ch.activo AND ch.deleted_at IS NULL) AS n_canchas,
+               COALESCE(MIN(cap.horas), 0)  AS horas_disponibles
+        FROM cx
+        LEFT JOIN canchas ch ON ch.id_complejo = cx.id_complejo
+        LEFT JOIN k   ON k.id_cancha = ch.id_cancha
+        LEFT JOIN cap ON cap.id_complejo = cx.id_complejo
+        GROUP BY {grupos}
+        ORDER BY cx.id_complejo, es_total DESC, id_cancha
+    """)
+    rows = db.execute(q, {"u": id_usuario, "desde": desde, "hasta": hasta}).mappings().all()
+    return [dict(r) for r in rows]
+
+def heatmap_ocupacion(
+    db: Session, id_complejo: int, desde: str, hasta: str, id_cancha: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Minutos reservados (confirmados) y disponibles por (día ISO 0=lunes, hora local) en America/Santiago.
+    Cada reserva se parte en tramos de 1 hora recortados a los bordes del bucket y del rango.
+    La capacidad usa el horario de la cancha si existe para ese día; si no, el general del complejo.
+    Devuelve siempre las 7x24 celdas.
+    """
+    q = text("""
+        WITH lim AS (
+          SELECT CAST(:desde AS date)::timestamp                        AS ini_local,
+                 (CAST(:hasta AS date) + 1)::timestamp                  AS fin_local,
+                 CAST(:desde AS date)::timestamp AT TIME ZONE 'America/Santiago'       AS ini_ts,
+                 (CAST(:hasta AS date) + 1)::timestamp AT TIME ZONE 'America/Santiago' AS fin_ts
+        ),
+        ch AS (
+          SELECT id_cancha, (activo AND deleted_at IS NULL) AS activa
+          FROM canchas
+          WHERE id_complejo = :id
+            AND (CAST(:cancha AS bigint) IS NULL OR id_cancha = CAST(:cancha AS bigint))
+        ),
+        r AS (
+          SELECT GREATEST(r.inicio AT TIME ZONE 'America/Santiago', lim.ini_local) AS ini,
+                 LEAST(r.fin AT TIME ZONE 'America/Santiago', lim.fin_local)       AS fin
+          FROM reservas r
+          JOIN ch ON ch.id_cancha = r.id_cancha
+          CROSS JOIN lim
+          WHERE r.estado = 'confirmada'
+            -- cotas sobre inicio con los parámetros (no con lim) para podar particiones
+            AND r.inicio >= (CAST(:desde AS date)::timestamp AT TIME ZONE 'America/Santiago') - INTERVAL '1 day'
+            AND r.inicio <  ((CAST(:hasta AS date) + 1)::timestamp AT TIME ZONE 'America/Santiago')
+            AND tstzrange(r.inicio, r.fin, '[)') && tstzrange(lim.ini_ts, lim.fin_ts, '[)')
+        ),
+        occ AS (
+          SELECT EXTRACT(ISODOW FROM b.h)::int - 1 AS dow,
+                 EXTRACT(HOUR FROM b.h)::int       AS hora,
+                 SUM(EXTRACT(EPOCH FROM (LEAST(r.fin, b.h + INTERVAL '1 hour') - GREATEST(r.ini, b.h))) / 60.0) AS minutos
+          FROM r
+          CROSS JOIN LATERAL generate_series(date_trunc('hour', r.ini), r.fin - INTERVAL '1 microsecond', INTERVAL '1 hour') AS b(h)
+          WHERE r.fin > r.ini
+          GROUP BY 1, 2
+        ),
+        dias AS (
+          SELECT EXTRACT(ISODOW FROM d)::int - 1 AS dow,
+                 (ARRAY['lunes','martes','miercoles','jueves','viernes','sabado','domingo'])[EXTRACT(ISODOW FROM d)] AS dia,
+                 COUNT(*) AS n
+          FROM generate_series(CAST(:desde AS date), CAST(:hasta AS date), INTERVAL '1 day') AS d
+          GROUP BY 1, 2
+        ),
+        hz AS (
+          SELECT h.dia::text AS dia,
+                 EXTRACT(EPOCH FROM h.hora_apertura) / 60.0 AS ap,
+                 EXTRACT(EPOCH FROM h.hora_cierre) / 60.0   AS ci
+          FROM ch
+          JOIN horarios_atencion h
+            ON h.id_complejo = :id
+           AND (h.id_cancha = ch.id_cancha
+                OR (h.id_cancha IS NULL AND NOT EXISTS (
+                      SELECT 1 FROM horarios_atencion h2
+                      WHERE h2.id_cancha = ch.id_cancha AND h2.dia = h.dia)))
+          WHERE ch.activa
+        ),
+        cap AS (
+          SELECT dias.dow, hr AS hora,
+                 SUM(dias.n * GREATEST(0, LEAST(hz.ci, (hr + 1) * 60) - GREATEST(hz.ap, hr * 60))) AS minutos
+          FROM hz
+          JOIN dias ON dias.dia = hz.dia
+          CROSS JOIN generate_series(0, 23) AS hr
+          GROUP BY 1, 2
+        )
+        SELECT d.dow, h.hora,
+               COALESCE(occ.minutos, 0) AS minutos_reservados,
+               COALESCE(cap.minutos, 0) AS minutos_disponibles
+        FROM generate_series(0, 6) AS d(dow)
+        CROSS JOIN generate_series(0, 23) AS h(hora)
+        LEFT JOIN occ ON occ.dow = d.dow AND occ.hora = h.hora
+        LEFT JOIN cap ON cap.dow = d.dow AND cap.hora = h.hora
+        ORDER BY d.dow, h.hora
+    """)
+    rows = db.execute(
+        q, {"id": id_complejo, "cancha": id_cancha, "desde": desde, "hasta": hasta}
+    ).mappings().all()
+    return [dict(r) for r in rows]
@@ -6,7 +6,7 @@ from app.shared.deps import get_db, get_current_user
 from app.modules.auth.model import Usuario
 from app.modules.complejos.schemas import (
     ComplejosQuery, ComplejosListOut, ComplejoOut, ComplejoCreateIn, ComplejoUpdateIn,
-    CanchaOut, HorarioOut, BloqueoOut, ResumenOut
+    CanchaOut, HorarioOut, BloqueoOut, ResumenOut, PortafolioOut, HeatmapOut
 )
 from app.modules.complejos.service import (
     list_complejos as svc_list,
@@ -18,6 +18,8 @@ from app.modules.complejos.service import (
     horarios as svc_horarios,
     bloqueos as svc_bloqueos,
     resumen as svc_resumen,
+    portafolio as svc_portafolio,
+    heatmap as svc_heatmap,
 )
 
 router = APIRouter(prefix="/complejos", tags=["complejos"])
@@ -28,7 +30,8 @@ router = APIRouter(prefix="/complejos", tags=["complejos"])
     summary="Listar complejos",
     description=(
         "Lista recintos con **filtros**: texto (`q`), `comuna` (nombre), `id_comuna` (FK), `deporte`, y **distancia** (lat/lon + `max_km`). "
-        "Orden por `distancia`, `rating`, `nombre` o `recientes`. Soporta paginación."
+        "Orden por `distancia`, `rating`, `nombre`, `recientes` o `relevancia` (con `q`). "
+        "La búsqueda de texto ignora acentos y tolera errores de tipeo. Soporta paginación."
     ),
     response_description="Listado paginado de complejos."
 )
@@ -40,7 +43,7 @@ def list_endpoint(
     lat: float | None = Query(None, ge=-90, le=90),
     lon: float | None = Query(None, ge=-180, le=180),
     max_km: float | None = Query(None, gt=0),
-    sort_by: str | None = Query("nombre", pattern="^(distancia|rating|nombre|recientes)$"),
+    sort_by: str | None = Query("nombre", pattern="^(distancia|rating|nombre|recientes|relevancia)$"),
     order: str | None = Query("asc", pattern="^(asc|desc)$"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
@@ -67,6 +70,28 @@ def create_endpoint(
 ):
     return svc_create(db, current, payload)
 
+# Debe declararse antes de "/{id_complejo}" para no ser capturada por esa ruta
+@router.get(
+    "/portafolio",
+    response_model=PortafolioOut,
+    summary="Portafolio del dueño (KPIs)",
+    description=(
+        "KPIs de **todos** los complejos del usuario (como dueño o `manager`) en un rango "
+        "(`desde`, `hasta` en formato YYYY-MM-DD; por defecto los últimos 30 días). "
+        "`por_cancha=true` agrega el desglose por cancha. Un admin puede consultar otro `id_dueno`."
+    ),
+    response_description="KPIs por complejo y totales."
+)
+def portafolio_endpoint(
+    desde: str | None = Query(None, description="YYYY-MM-DD"),
+    hasta: str | None = Query(None, description="YYYY-MM-DD"),
+    por_cancha: bool = Query(False),
+    id_dueno: int | None = Query(None, description="Solo admin/superadmin"),
+    db: Session = Depends(get_db),
+    current: Usuario = Depends(get_current_user),
+):
+    return svc_portafolio(db, current, desde, hasta, por_cancha=por_cancha, id_dueno=id_dueno)
+
 @router.get(
     "/{id_complejo}",
     response_model=ComplejoOut,
@@ -166,3 +191,24 @@ def resumen_endpoint(
     db: Session = Depends(get_db),
 ):
     return svc_resumen(db, id_complejo, desde, hasta)
+
+@router.get(
+    "/{id_complejo}/heatmap",
+    response_model=HeatmapOut,
+    summary="Mapa de calor de ocupación (día x hora)",
+    description=(
+        "Minutos reservados (confirmados) vs. disponibles en una grilla **7x24** en hora de Chile, "
+        "para el complejo o una cancha (`id_cancha`). Rango `desde`/`hasta` (YYYY-MM-DD; por defecto "
+        "últimos 30 días). Solo **dueño** o **admin/superadmin**."
+    ),
+    response_description="Matrices 7x24 de minutos y ocupación."
+)
+def heatmap_endpoint(
+    id_complejo: int,
+    desde: str | None = Query(None, description="YYYY-MM-DD"),
+    hasta: str | None = Query(None, description="YYYY-MM-DD"),
+    id_cancha: int | None = Query(None),
+    db: Session = Depends(get_db),
+    current: Usuario = Depends(get_current_user),
+):
+    return svc_heatmap(db, current, id_complejo, desde, hasta, id_cancha=id_cancha)
@@ -38,7 +38,7 @@ class ComplejosQuery(BaseModel):
     lat: Optional[Lat] = None
     lon: Optional[Lon] = None
     max_km: Optional[PositiveKm] = Field(None, description="Radio máximo en km (requiere lat/lon)")
-    sort_by: Optional[Literal["distancia", "rating", "nombre", "recientes"]] = "nombre"
+    sort_by: Optional[Literal["distancia", "rating", "nombre", "recientes", "relevancia"]] = "nombre"
     order: Optional[Literal["asc", "desc"]] = "asc"
     page: Page = 1
     page_size: PageSize = 20
@@ -102,3 +102,41 @@ class ResumenOut(BaseModel):
     horas_reservadas: float
     ingresos_confirmados: float
     ocupacion: float = Field(..., description="0..1 aprox. horas reservadas / (horas disponibles * #canchas)")
+
+class PortafolioCanchaOut(BaseModel):
+    id_cancha: int
+    nombre: str
+    reservas_confirmadas: int
+    horas_reservadas: float
+    ingresos_confirmados: float
+    ocupacion: float
+
+class PortafolioComplejoOut(BaseModel):
+    id_complejo: int
+    nombre: str
+    activo: bool
+    n_canchas: int
+    reservas_confirmadas: int
+    horas_reservadas: float
+    ingresos_confirmados: float
+    ocupacion: float
+    canchas: Optional[List[PortafolioCanchaOut]] = None
+
+class PortafolioOut(BaseModel):
+    id_usuario: int
+    desde: str
+    hasta: str
+    reservas_confirmadas: int
+    horas_reservadas: float
+    ingresos_confirmados: float
+    items: List[PortafolioComplejoOut]
+
+class HeatmapOut(BaseModel):
+    id_complejo: int
+    id_cancha: Optional[int] = None
+    desde: str
+    hasta: str
+    dias: List[str] = Field(..., description="Filas de las matrices (lunes..domingo)")
+    minutos_reservados: List[List[float]] = Field(..., description="7x24, hora local America/Santiago")
+    minutos_disponibles: List[List[float]] = Field(..., description="7x24 según horarios de atención")
+    ocupacion: List[List[Optional[float]]] = Field(..., description="7x24 reservados/disponibles; null sin capacidad")
@@ -7,9 +7,13 @@ from sqlalchemy.orm import Session
 from app.modules.auth.model import Usuario
 from app.modules.complejos.schemas import (
     ComplejosQuery, ComplejosListOut, ComplejoOut, ComplejoCreateIn, ComplejoUpdateIn,
-    CanchaOut, HorarioOut, BloqueoOut, ResumenOut
+    CanchaOut, HorarioOut, BloqueoOut, ResumenOut,
+    PortafolioOut, PortafolioComplejoOut, PortafolioCanchaOut, HeatmapOut
 )
 from app.modules.complejos import repository as repo
+from app.shared import auditoria, events
+
+TOPIC_COMPLEJO_CAMBIADO = "complejo.cambiado"
 
 def _is_admin(user: Usuario) -> bool:
     return user.rol in ("admin","superadmin")
@@ -40,7 +44,9 @@ def create_complejo(db: Session, current: Usuario, data: ComplejoCreateIn) -> Co
     row["rating_promedio"] = None
     row["total_resenas"] = 0
     row["distancia_km"] = None
-    return ComplejoOut(**row)
+    out = ComplejoOut(**row)
+    events.publish(TOPIC_COMPLEJO_CAMBIADO, out.model_dump())
+    return out
 
 def get_complejo(db: Session, id_complejo: int, lat: Optional[float], lon: Optional[float]) -> ComplejoOut:
     row = repo.get_complejo_by_id(db, id_complejo, lat=lat, lon=lon)
@@ -61,7 +67,9 @@ def update_complejo(db: Session, current: Usuario, id_complejo: int, data: Compl
     if not row:
         raise HTTPException(status_code=500, detail="No se pudo actualizar el complejo")
     reloaded = repo.get_complejo_by_id(db, id_complejo)
-    return ComplejoOut(**reloaded)
+    out = ComplejoOut(**reloaded)
+    events.publish(TOPIC_COMPLEJO_CAMBIADO, out.model_dump())
+    return out
 
 def delete_complejo(db: Session, current: Usuario, id_complejo: int) -> dict:
     owner_id = repo.owner_of_complejo(db, id_complejo)
@@ -70,6 +78,9 @@ def delete_complejo(db: Session, current: Usuario, id_complejo: int) -> dict:
     if not _is_owner_or_admin(current, owner_id):
         raise HTTPException(status_code=403, detail="No autorizado")
     repo.soft_delete_complejo(db, id_complejo)
+    auditoria.registrar("desactivar_complejo", actor_id=current.id_usuario, objeto_tipo="complejo",
+                        id_objeto=id_complejo, snapshot={"id_dueno": owner_id})
+    events.publish(TOPIC_COMPLEJO_CAMBIADO, {"id_complejo": id_complejo, "activo": False})
     return {"detail": "Complejo desactivado."}
 
 def canchas(db: Session, id_complejo: int):
@@ -81,12 +92,16 @@ def horarios(db: Session, id_complejo: int):
 def bloqueos(db: Session, id_complejo: int):
     return [BloqueoOut(**r) for r in repo.list_bloqueos(db, id_complejo)]
 
-def resumen(db: Session, id_complejo: int, desde: Optional[str], hasta: Optional[str]) -> ResumenOut:
+def _rango_por_defecto(desde: Optional[str], hasta: Optional[str]) -> tuple[str, str]:
     if not desde or not hasta:
         h = date.today()
         d = h - timedelta(days=29)
         desde = desde or d.isoformat()
         hasta = hasta or h.isoformat()
+    return desde, hasta
+
+def resumen(db: Session, id_complejo: int, desde: Optional[str], hasta: Optional[str]) -> ResumenOut:
+    desde, hasta = _rango_por_defecto(desde, hasta)
     base = repo.get_complejo_by_id(db, id_complejo)
     if not base:
         raise HTTPException(status_code=404, detail="Complejo no encontrado")
@@ -98,3 +113,79 @@ def resumen(db: Session, id_complejo: int, desde: Optional[str], hasta: Optional
         ingresos_confirmados=float(kpis["ingresos_confirmados"]),
         ocupacion=float(kpis["ocupacion"])
     )
+
+def _ocupacion(horas: float, capacidad: float) -> float:
+    return round(horas / capacidad, 4) if capacidad > 0 else 0.0
+
+def portafolio(
+    db: Session, current: Usuario, desde: Optional[str], hasta: Optional[str],
+    por_cancha: bool = False, id_dueno: Optional[int] = None,
+) -> PortafolioOut:
+    if id_dueno is not None and id_dueno != current.id_usuario and not _is_admin(current):
+        raise HTTPException(status_code=403, detail="No autorizado")
+    id_usuario = id_dueno or current.id_usuario
+    desde, hasta = _rango_por_defecto(desde, hasta)
+    if desde > hasta:
+        raise HTTPException(status_code=400, detail="desde debe ser <= hasta")
+
+    items: list[PortafolioComplejoOut] = []
+    for r in repo.portafolio(db, id_usuario, desde, hasta, por_cancha=por_cancha):
+        horas = float(r["horas_reservadas"])
+        disponibles = float(r["horas_disponibles"])
+        if r["es_total"]:
+            items.append(PortafolioComplejoOut(
+                id_complejo=r["id_complejo"], nombre=r["nombre"], activo=r["activo"],
+                n_canchas=int(r["n_canchas"]),
+                reservas_confirmadas=int(r["reservas_confirmadas"]),
+                horas_reservadas=horas,
+                ingresos_confirmados=float(r["ingresos_confirmados"]),
+                ocupacion=_ocupacion(horas, disponibles * int(r["n_canchas"])),
+                canchas=[] if por_cancha else None,
+            ))
+        elif r["id_cancha"] is not None:
+            # las filas vienen ordenadas: primero el total del complejo, luego sus canchas
+            items[-1].canchas.append(PortafolioCanchaOut(
+                id_cancha=r["id_cancha"], nombre=r["cancha"],
+                reservas_confirmadas=int(r["reservas_confirmadas"]),
+                horas_reservadas=horas,
+                ingresos_confirmados=float(r["ingresos_confirmados"]),
+                ocupacion=_ocupacion(horas, disponibles if r["n_canchas"] else 0.0),
+            ))
+
+    return PortafolioOut(
+        id_usuario=id_usuario, desde=desde, hasta=hasta,
+        reservas_confirmadas=sum(i.reservas_confirmadas for i in items),
+        horas_reservadas=sum(i.horas_reservadas for i in items),
+        ingresos_confirmados=sum(i.ingresos_confirmados for i in items),
+        items=items,
+    )
+
+_DIAS = ["lunes", "martes", "miercoles", "jueves", "viernes", "sabado", "domingo"]
+
+def heatmap(
+    db: Session, current: Usuario, id_complejo: int,
+    desde: Optional[str], hasta: Optional[str], id_cancha: Optional[int] = None,
+) -> HeatmapOut:
+    owner_id = repo.owner_of_complejo(db, id_complejo)
+    if not owner_id:
+        raise HTTPException(status_code=404, detail="Complejo no encontrado")
+    if not _is_owner_or_admin(current, owner_id):
+        raise HTTPException(status_code=403, detail="No autorizado")
+    desde, hasta = _rango_por_defecto(desde, hasta)
+    if desde > hasta:
+        raise HTTPException(status_code=400, detail="desde debe ser <= hasta")
+
+    reservados = [[0.0] * 24 for _ in range(7)]
+    disponibles = [[0.0] * 24 for _ in range(7)]
+    ocupacion: list[list[Optional[float]]] = [[None] * 24 for _ in range(7)]
+    for r in repo.heatmap_ocupacion(db, id_complejo, desde, hasta, id_cancha=id_cancha):
+        d, h = r["dow"], r["hora"]
+        reservados[d][h] = round(float(r["minutos_reservados"]), 2)
+        disponibles[d][h] = round(float(r["minutos_disponibles"]), 2)
+        if disponibles[d][h] > 0:
+            ocupacion[d][h] = round(reservados[d][h] / disponibles[d][h], 4)
+
+    return HeatmapOut(
+        id_complejo=id_complejo, id_cancha=id_cancha, desde=desde, hasta=hasta, dias=_DIAS,
+        minutos_reservados=reservados, minutos_disponibles=disponibles, ocupacion=ocupacion,
+    )
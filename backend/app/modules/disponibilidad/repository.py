@@ -46,6 +46,7 @@ def _intervalos_ocupados(db: Session, id_cancha: int, fecha) -> List[Tuple[datet
         """
         SELECT inicio, fin FROM reservas
          WHERE id_cancha=:c AND estado IN ('pendiente','confirmada')
+           AND inicio >= CAST(:start AS timestamptz) - INTERVAL '1 day'  -- poda particiones
            AND NOT (fin<=:start OR inicio>=:end)
         """
     ), {"c": id_cancha, "start": start, "end": end}).all()
@@ -85,4 +86,25 @@ def slots_disponibles(db: Session, *, id_cancha: int, fecha, slot_min: int) -> L
         if libre(cur, nxt):
             slots.append((cur.strftime('%H:%M'), nxt.strftime('%H:%M')))
         cur = nxt
-    return slots
\ No newline at end of file
+    return slots
+
+def alternativas(db: Session, *, id_cancha: int, fecha, h_ini: time, h_fin: time, n: int = 3, paso_min: int = 30) -> List[Tuple[str, str]]:
+    """Los `n` horarios libres de igual duración más cercanos al pedido (mismo día)."""
+    h_ap, h_cie = _get_ventana_horaria(db, id_cancha, fecha)
+    win_start = datetime.combine(fecha, h_ap).replace(tzinfo=_TZ)
+    win_end   = datetime.combine(fecha, h_cie).replace(tzinfo=_TZ)
+    deseado   = datetime.combine(fecha, h_ini).replace(tzinfo=_TZ)
+    dur = datetime.combine(fecha, h_fin) - datetime.combine(fecha, h_ini)
+
+    ocupados = _intervalos_ocupados(db, id_cancha, fecha)
+    libres: List[datetime] = []
+    cur = win_start
+    step = timedelta(minutes=paso_min)
+    while cur + dur <= win_end:
+        fin = cur + dur
+        if all(fin <= x or cur >= y for (x, y) in ocupados):
+            libres.append(cur)
+        cur += step
+
+    libres.sort(key=lambda a: (abs(a - deseado), a))
+    return [(a.strftime('%H:%M'), (a + dur).strftime('%H:%M')) for a in libres[:n]]
@@ -0,0 +1,124 @@
+from __future__ import annotations
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+# complejos visibles para un dueño: propios o donde es manager (igual que el portafolio)
+_COMPLEJOS_DE = """
+    SELECT c.id_complejo FROM complejos c
+    WHERE c.id_dueno = :u
+       OR EXISTS (SELECT 1 FROM complejo_usuarios cu
+                  WHERE cu.id_complejo = c.id_complejo AND cu.id_usuario = :u AND cu.rol = 'manager')
+"""
+
+def gestiona_complejo(db: Session, id_usuario: int, id_complejo: int) -> Optional[bool]:
+    """None si el complejo no existe."""
+    row = db.execute(text(f"""
+        SELECT c.id_complejo IN ({_COMPLEJOS_DE}) FROM complejos c WHERE c.id_complejo = :c
+    """), {"u": id_usuario, "c": id_complejo}).first()
+    return bool(row[0]) if row else None
+
+RESERVAS_COLS = [
+    "id_reserva", "id_complejo", "complejo", "id_cancha", "cancha", "id_usuario", "email",
+    "fecha", "hora_inicio", "hora_fin", "estado", "precio_total", "created_at",
+]
+
+def sql_reservas(
+    *, id_dueno: Optional[int], id_complejo: Optional[int],
+    desde: Optional[date], hasta: Optional[date], estado: Optional[str],
+) -> Tuple[str, Dict[str, Any]]:
+    wheres: List[str] = []
+    params: Dict[str, Any] = {}
+    if id_dueno is not None:
+        wheres.append(f"c.id_complejo IN ({_COMPLEJOS_DE})")
+        params["u"] = id_dueno
+    if id_complejo is not None:
+        wheres.append("c.id_complejo = :c")
+        params["c"] = id_complejo
+    # rango sobre r.inicio (no sobre la fecha derivada) para usar índices
+    if desde is not None:
+        wheres.append("r.inicio >= (CAST(:desde AS date)::timestamp AT TIME ZONE 'America/Santiago')")
+        params["desde"] = desde
+    if hasta is not None:
+        wheres.append("r.inicio < ((CAST(:hasta AS date) + 1)::timestamp AT TIME ZONE 'America/Santiago')")
+        params["hasta"] = hasta
+    if estado is not None:
+        wheres.append("r.estado = CAST(:estado AS estado_reserva)")
+        params["estado"] = estado
+    sql = f"""
+        SELECT r.id_reserva, c.id_complejo, c.nombre AS complejo, ch.id_cancha, ch.nombre AS cancha,
+               r.id_usuario, u.email,
+               (r.inicio AT TIME ZONE 'America/Santiago')::date AS fecha,
+               to_char(r.inicio AT TIME ZONE 'America/Santiago', 'HH24:MI') AS hora_inicio,
+               to_char(r.fin    AT TIME ZONE 'America/Santiago', 'HH24:MI') AS hora_fin,
+               r.estado::text AS estado, r.precio_total, r.created_at
+        FROM reservas r
+        JOIN canchas ch  ON ch.id_cancha = r.id_cancha
+        JOIN complejos c ON c.id_complejo = ch.id_complejo
+        JOIN usuarios u  ON u.id_usuario = r.id_usuario
+        {"WHERE " + " AND ".join(wheres) if wheres else ""}
+        ORDER BY r.inicio, r.id_reserva
+    """
+    return sql, params
+
+USUARIOS_COLS = [
+    "id_usuario", "nombre", "apellido", "email", "telefono", "rol", "verificado", "esta_activo", "created_at",
+]
+
+def sql_usuarios(
+    *, id_dueno: Optional[int], id_complejo: Optional[int],
+    desde: Optional[date], hasta: Optional[date], rol: Optional[str], activo: Optional[bool],
+) -> Tuple[str, Dict[str, Any]]:
+    """Sin dueño: todos (filtro de fechas sobre created_at). Con dueño o complejo: clientes con
+    reservas en esos complejos (filtro de fechas sobre la reserva)."""
+    wheres: List[str] = []
+    params: Dict[str, Any] = {}
+    reservas: List[str] = []
+    if id_dueno is not None:
+        reservas.append(f"ch.id_complejo IN ({_COMPLEJOS_DE})")
+        params["u"] = id_dueno
+    if id_complejo is not None:
+        reservas.append("ch.id_complejo = :c")
+        params["c"] = id_complejo
+    col_fecha = "r.inicio" if reservas else "u.created_at"
+    rango: List[str] = []
+    if desde is not None:
+        rango.append(f"{col_fecha} >= (CAST(:desde AS date)::timestamp AT TIME ZONE 'America/Santiago')")
+        params["desde"] = desde
+    if hasta is not None:
+        rango.append(f"{col_fecha} < ((CAST(:hasta AS date) + 1)::timestamp AT TIME ZONE 'America/Santiago')")
+        params["hasta"] = hasta
+    if reservas:
+        wheres.append(f"""EXISTS (
+            SELECT 1 FROM reservas r JOIN canchas ch ON ch.id_cancha = r.id_cancha
+            WHERE r.id_usuario = u.id_usuario AND {" AND ".join(reservas + rango)}
+        )""")
+    else:
+        wheres.extend(rango)
+    if rol is not None:
+        wheres.append("u.rol = CAST(:rol AS rol_usuario)")
+        params["rol"] = rol
+    if activo is not None:
+        wheres.append("u.esta_activo = :activo")
+        params["activo"] = activo
+    sql = f"""
+        SELECT u.id_usuario, u.nombre, u.apellido, u.email, u.telefono, u.rol::text AS rol,
+               u.verificado, u.esta_activo, u.created_at
+        FROM usuarios u
+        {"WHERE " + " AND ".join(wheres) if wheres else ""}
+        ORDER BY u.id_usuario
+    """
+    return sql, params
+
+def stream(db: Session, sql: str, params: Dict[str, Any]) -> Iterator[List[Dict[str, Any]]]:
+    """Lotes de filas desde un cursor del lado del servidor: memoria constante sin importar el total."""
+    conn = db.connection(execution_options={"stream_results": True, "yield_per": settings.EXPORT_YIELD_PER})
+    result = conn.execute(text(sql), params)
+    try:
+        for lote in result.mappings().partitions():
+            yield [dict(r) for r in lote]
+    finally:
+        result.close()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+from datetime import date
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.shared.deps import get_db, require_roles
+from app.modules.auth.model import Usuario
+from app.modules.exportes import service as svc
+
+router = APIRouter(prefix="/exportes", tags=["exportes"])
+
+_FORMATO = Query("csv", pattern="^(csv|ndjson)$", description="csv o ndjson (un objeto JSON por línea)")
+
+@router.get(
+    "/reservas",
+    summary="Exportar reservas",
+    description=(
+        "Descarga reservas en CSV o NDJSON, en streaming (sin límite de filas). "
+        "Admin: todas. Dueño: solo las de sus complejos (propios o como manager). "
+        "Filtros: `id_complejo`, rango `desde`/`hasta` (fecha de la reserva) y `estado`."
+    ),
+    response_description="Archivo CSV/NDJSON",
+)
+def exportar_reservas_endpoint(
+    formato: str = _FORMATO,
+    id_complejo: int | None = Query(None),
+    desde: date | None = Query(None),
+    hasta: date | None = Query(None),
+    estado: str | None = Query(None, pattern="^(pendiente|confirmada|cancelada|expirada)$"),
+    user: Usuario = Depends(require_roles("dueno", "admin", "superadmin")),
+    db: Session = Depends(get_db),
+):
+    return svc.exportar_reservas(
+        db, user, formato=formato, id_complejo=id_complejo, desde=desde, hasta=hasta, estado=estado,
+    )
+
+@router.get(
+    "/usuarios",
+    summary="Exportar usuarios",
+    description=(
+        "Descarga usuarios en CSV o NDJSON, en streaming. Admin: todos (`desde`/`hasta` sobre la fecha de "
+        "registro). Dueño: solo clientes con reservas en sus complejos (`desde`/`hasta` sobre la reserva). "
+        "Con `id_complejo`, los clientes de ese complejo."
+    ),
+    response_description="Archivo CSV/NDJSON",
+)
+def exportar_usuarios_endpoint(
+    formato: str = _FORMATO,
+    id_complejo: int | None = Query(None),
+    desde: date | None = Query(None),
+    hasta: date | None = Query(None),
+    rol: str | None = Query(None, pattern="^(usuario|dueno|admin|superadmin)$"),
+    activo: bool | None = Query(None),
+    user: Usuario = Depends(require_roles("dueno", "admin", "superadmin")),
+    db: Session = Depends(get_db),
+):
+    return svc.exportar_usuarios(
+        db, user, formato=formato, id_complejo=id_complejo, desde=desde, hasta=hasta, rol=rol, activo=activo,
+    )
@@ -0,0 +1,77 @@
+from __future__ import annotations
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.modules.auth.model import Usuario
+from app.modules.exportes import repository as repo
+
+_MEDIA = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+def _alcance(db: Session, user: Usuario, id_complejo: Optional[int]) -> Optional[int]:
+    """id del dueño al que se restringe el export (None = sin restricción, admins)."""
+    if user.rol in ("admin", "superadmin"):
+        return None
+    if id_complejo is not None:
+        gestiona = repo.gestiona_complejo(db, user.id_usuario, id_complejo)
+        if gestiona is None:
+            raise HTTPException(status_code=404, detail="Complejo no encontrado")
+        if not gestiona:
+            raise HTTPException(status_code=403, detail="No autorizado para este complejo")
+    return user.id_usuario
+
+def _validar_rango(desde: Optional[date], hasta: Optional[date]) -> None:
+    if desde and hasta and desde > hasta:
+        raise HTTPException(status_code=400, detail="'desde' no puede ser mayor que 'hasta'")
+
+def _filas(sql: str, params: Dict[str, Any], cols: List[str], formato: str) -> Iterator[str]:
+    # sesión propia: la del request se cierra antes de que termine de enviarse la respuesta
+    with SessionLocal() as db:
+        if formato == "csv":
+            buf = io.StringIO()
+            w = csv.writer(buf)
+            w.writerow(cols)
+            for lote in repo.stream(db, sql, params):
+                w.writerows([r[c] for c in cols] for r in lote)
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+            if buf.tell():  # sin filas: queda solo el encabezado
+                yield buf.getvalue()
+        else:
+            for lote in repo.stream(db, sql, params):
+                yield "".join(json.dumps(r, default=str, ensure_ascii=False) + "\n" for r in lote)
+
+def _respuesta(nombre: str, sql: str, params: Dict[str, Any], cols: List[str], formato: str) -> StreamingResponse:
+    archivo = f"{nombre}_{datetime.now():%Y%m%d_%H%M}.{formato}"
+    return StreamingResponse(
+        _filas(sql, params, cols, formato),
+        media_type=_MEDIA[formato],
+        headers={"Content-Disposition": f'attachment; filename="{archivo}"'},
+    )
+
+def exportar_reservas(
+    db: Session, user: Usuario, *, formato: str, id_complejo: Optional[int],
+    desde: Optional[date], hasta: Optional[date], estado: Optional[str],
+) -> StreamingResponse:
+    _validar_rango(desde, hasta)
+    id_dueno = _alcance(db, user, id_complejo)
+    sql, params = repo.sql_reservas(id_dueno=id_dueno, id_complejo=id_complejo, desde=desde, hasta=hasta, estado=estado)
+    return _respuesta("reservas", sql, params, repo.RESERVAS_COLS, formato)
+
+def exportar_usuarios(
+    db: Session, user: Usuario, *, formato: str, id_complejo: Optional[int],
+    desde: Optional[date], hasta: Optional[date], rol: Optional[str], activo: Optional[bool],
+) -> StreamingResponse:
+    _validar_rango(desde, hasta)
+    id_dueno = _alcance(db, user, id_complejo)
+    sql, params = repo.sql_usuarios(
+        id_dueno=id_dueno, id_complejo=id_complejo, desde=desde, hasta=hasta, rol=rol, activo=activo,
+    )
+    return _respuesta("usuarios", sql, params, repo.USUARIOS_COLS, formato)
@@ -0,0 +1,50 @@
+# Uso: python -m app.modules.liquidaciones --periodo 2025-01 [--lote 50] [--worker 0 --workers 4]
+#      python -m app.modules.liquidaciones --desde 2025-01-01 --hasta 2025-01-15
+from __future__ import annotations
+import argparse
+import calendar
+from datetime import date
+
+from app.modules.liquidaciones.service import generar
+
+def _periodo(valor: str) -> tuple[date, date]:
+    anio, mes = (int(x) for x in valor.split("-"))
+    return date(anio, mes, 1), date(anio, mes, calendar.monthrange(anio, mes)[1])
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Genera liquidaciones a dueños para un periodo.")
+    ap.add_argument("--periodo", help="Mes YYYY-MM")
+    ap.add_argument("--desde", type=date.fromisoformat, help="YYYY-MM-DD")
+    ap.add_argument("--hasta", type=date.fromisoformat, help="YYYY-MM-DD")
+    ap.add_argument("--lote", type=int, help="Dueños por transacción")
+    ap.add_argument("--comision", type=float, help="%% de comisión (por defecto LIQUIDACION_COMISION_PCT)")
+    ap.add_argument("--worker", type=int, default=0)
+    ap.add_argument("--workers", type=int, default=1)
+    args = ap.parse_args()
+
+    if args.periodo:
+        desde, hasta = _periodo(args.periodo)
+    elif args.desde and args.hasta:
+        desde, hasta = args.desde, args.hasta
+    else:
+        ap.error("indica --periodo o --desde y --hasta")
+    if not 0 <= args.worker < args.workers:
+        ap.error("--worker debe estar en [0, --workers)")
+
+    def imprimir(r: dict) -> None:
+        print(
+            f"lote {r['lote']:>4}: {r['duenos']} dueños ({r['omitidos']} omitidos), "
+            f"{r['liquidaciones']} liquidaciones, {r['detalles']} pagos, "
+            f"bruto {r['bruto']:.2f} en {r['ms']} ms"
+        )
+
+    reportes = generar(
+        desde, hasta, lote=args.lote, comision_pct=args.comision,
+        worker=args.worker, workers=args.workers, on_lote=imprimir,
+    )
+    total = sum(r["detalles"] for r in reportes)
+    ms = sum(r["ms"] for r in reportes)
+    print(f"OK -> {desde}..{hasta}: {total} pagos liquidados en {len(reportes)} lotes ({ms:.0f} ms)")
+
+if __name__ == "__main__":
+    main()
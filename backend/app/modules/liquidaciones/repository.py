@@ -0,0 +1,79 @@
+from __future__ import annotations
+from datetime import date
+from typing import Any, Dict, List
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# espacio de advisory locks de liquidaciones (el de reservas es 26_029)
+_LOCK_NS_DUENO = 26_033
+
+def list_duenos(db: Session, *, worker: int = 0, workers: int = 1) -> List[int]:
+    """Dueños con al menos un complejo; `worker`/`workers` reparte el universo entre procesos."""
+    rows = db.execute(text("""
+        SELECT DISTINCT id_dueno
+        FROM complejos
+        WHERE id_dueno % :n = :w
+        ORDER BY id_dueno
+    """), {"n": workers, "w": worker}).all()
+    return [int(r[0]) for r in rows]
+
+def bloquear_duenos(db: Session, duenos: List[int]) -> List[int]:
+    """Toma (sin esperar) el lock transaccional de cada dueño; devuelve los que quedaron tomados."""
+    rows = db.execute(text("""
+        SELECT d FROM unnest(CAST(:ids AS bigint[])) AS d
+        WHERE pg_try_advisory_xact_lock(:ns, CAST(d AS int))
+    """), {"ids": duenos, "ns": _LOCK_NS_DUENO}).all()
+    return [int(r[0]) for r in rows]
+
+_LIQUIDAR = text("""
+    WITH pend AS (
+      SELECT p.id_pago, p.monto, c.id_dueno, c.id_complejo
+      FROM pagos p
+      JOIN reservas r   ON r.id_reserva = p.id_reserva
+      JOIN canchas ch   ON ch.id_cancha = r.id_cancha
+      JOIN complejos c  ON c.id_complejo = ch.id_complejo
+      WHERE c.id_dueno = ANY(CAST(:duenos AS bigint[]))
+        AND p.estado = 'pagado'
+        AND r.inicio >= (CAST(:ini AS date)::timestamp AT TIME ZONE 'America/Santiago')
+        AND r.inicio <  ((CAST(:fin AS date) + 1)::timestamp AT TIME ZONE 'America/Santiago')
+        AND NOT EXISTS (
+          SELECT 1
+          FROM liquidacion_detalle ld
+          JOIN liquidaciones l ON l.id_liquidacion = ld.id_liquidacion
+          WHERE ld.id_pago = p.id_pago AND l.estado <> 'anulada'
+        )
+    ),
+    cab AS (
+      INSERT INTO liquidaciones (id_dueno, id_complejo, periodo_inicio, periodo_fin, bruto, comision)
+      SELECT id_dueno, id_complejo, CAST(:ini AS date), CAST(:fin AS date),
+             SUM(monto), ROUND(SUM(monto) * CAST(:pct AS numeric) / 100, 2)
+      FROM pend
+      GROUP BY id_dueno, id_complejo
+      ON CONFLICT (id_dueno, id_complejo, periodo_inicio, periodo_fin) WHERE estado = 'pendiente'
+      DO UPDATE SET bruto    = liquidaciones.bruto + EXCLUDED.bruto,
+                    comision = liquidaciones.comision + EXCLUDED.comision
+      RETURNING id_liquidacion, id_dueno, id_complejo
+    ),
+    det AS (
+      INSERT INTO liquidacion_detalle (id_liquidacion, id_pago, monto, descripcion)
+      SELECT cab.id_liquidacion, pend.id_pago, pend.monto, 'Pago #' || pend.id_pago
+      FROM pend
+      JOIN cab ON cab.id_dueno = pend.id_dueno AND cab.id_complejo = pend.id_complejo
+      ON CONFLICT (id_liquidacion, id_pago) DO NOTHING
+      RETURNING monto
+    )
+    SELECT (SELECT COUNT(*) FROM cab)  AS liquidaciones,
+           COUNT(*)                    AS detalles,
+           COALESCE(SUM(monto), 0)     AS bruto
+    FROM det
+""")
+
+def liquidar_duenos(db: Session, *, duenos: List[int], desde: date, hasta: date, comision_pct: float) -> Dict[str, Any]:
+    """
+    Liquida en una sola sentencia los pagos 'pagado' aún no liquidados de estos dueños cuyo
+    inicio de reserva cae en [desde, hasta] (fecha local). No hace commit.
+    """
+    row = db.execute(_LIQUIDAR, {
+        "duenos": duenos, "ini": desde, "fin": hasta, "pct": comision_pct,
+    }).mappings().one()
+    return dict(row)
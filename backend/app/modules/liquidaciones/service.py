@@ -0,0 +1,74 @@
+# app/modules/liquidaciones/service.py
+"""Generación por lotes de liquidaciones a dueños.
+
+Cada lote de dueños es una transacción: advisory lock por dueño (los tomados por otro worker se
+saltan), un único INSERT ... SELECT de cabeceras + detalle y commit. Como solo se liquidan pagos
+sin detalle vigente, re-ejecutar tras una caída retoma donde quedó sin duplicar nada.
+"""
+from __future__ import annotations
+import logging
+import time
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.modules.liquidaciones import repository as repo
+
+log = logging.getLogger(__name__)
+
+def generar(
+    desde: date,
+    hasta: date,
+    *,
+    lote: Optional[int] = None,
+    comision_pct: Optional[float] = None,
+    worker: int = 0,
+    workers: int = 1,
+    on_lote: Optional[Callable[[Dict[str, Any]], None]] = None,
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> List[Dict[str, Any]]:
+    """Liquida el periodo para todos los dueños del worker; devuelve un reporte por lote."""
+    if hasta < desde:
+        raise ValueError("hasta debe ser >= desde")
+    lote = lote or settings.LIQUIDACION_LOTE_DUENOS
+    pct = settings.LIQUIDACION_COMISION_PCT if comision_pct is None else comision_pct
+
+    db = session_factory()
+    try:
+        duenos = repo.list_duenos(db, worker=worker, workers=workers)
+    finally:
+        db.close()
+
+    reportes: List[Dict[str, Any]] = []
+    for i in range(0, len(duenos), lote):
+        chunk = duenos[i:i + lote]
+        t0 = time.perf_counter()
+        db = session_factory()
+        try:
+            tomados = repo.bloquear_duenos(db, chunk)
+            res = {"liquidaciones": 0, "detalles": 0, "bruto": 0}
+            if tomados:
+                res = repo.liquidar_duenos(db, duenos=tomados, desde=desde, hasta=hasta, comision_pct=pct)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        reporte = {
+            "lote": i // lote + 1,
+            "duenos": len(chunk),
+            "omitidos": len(chunk) - len(tomados),  # en proceso por otro worker
+            "liquidaciones": int(res["liquidaciones"]),
+            "detalles": int(res["detalles"]),
+            "bruto": float(res["bruto"]),
+            "ms": round((time.perf_counter() - t0) * 1000, 1),
+        }
+        log.info("Liquidaciones lote %(lote)s: %(duenos)s dueños, %(detalles)s pagos, %(ms)s ms", reporte)
+        if on_lote:
+            on_lote(reporte)
+        reportes.append(reporte)
+    return reportes
@@ -0,0 +1,141 @@
+# app/modules/nearby/grid.py
+"""Índice espacial en memoria para esquemas sin PostGIS (`complejos.loc` ausente).
+
+Grilla uniforme de celdas de ~CELDA_KM: una consulta por radio solo revisa las celdas que tocan
+la caja del círculo y calcula la distancia exacta de los candidatos en una sola pasada NumPy.
+Se carga perezosamente en la primera consulta y se mantiene con `complejo.cambiado`; cada
+COMPLEJOS_CACHE_REVALIDAR_S se compara conteo + max(updated_at) con la BD y se recarga si cambió.
+"""
+from __future__ import annotations
+import math
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.modules.complejos.service import TOPIC_COMPLEJO_CAMBIADO
+from app.modules.nearby import repository as repo
+from app.shared import events, geo
+from app.shared.revalidacion import Revalidacion
+
+CELDA_KM = 5.0
+_R_TIERRA_KM = 6371.0
+
+Celda = Tuple[int, int]
+
+def haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    la1, lo1 = math.radians(lat), math.radians(lon)
+    la2, lo2 = np.radians(lats), np.radians(lons)
+    a = np.sin((la2 - la1) / 2) ** 2 + math.cos(la1) * np.cos(la2) * np.sin((lo2 - lo1) / 2) ** 2
+    return 2 * _R_TIERRA_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+class GrillaGeo:
+    def __init__(self, celda_km: float = CELDA_KM):
+        self._paso = celda_km / 111.32  # grados por celda (lat y lon)
+        self._celdas: Dict[Celda, Set[int]] = defaultdict(set)
+        self._pos: Dict[int, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        # arreglos de todos los puntos para consultas sin radio (se invalidan al escribir)
+        self._todos: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self.cargada = False
+
+    def _celda(self, lat: float, lon: float) -> Celda:
+        return (math.floor(lat / self._paso), math.floor(lon / self._paso))
+
+    def cargar(self, filas: List[Tuple[int, float, float]]) -> None:
+        celdas: Dict[Celda, Set[int]] = defaultdict(set)
+        pos: Dict[int, Tuple[float, float]] = {}
+        for id_, lat, lon in filas:
+            pos[id_] = (lat, lon)
+            celdas[self._celda(lat, lon)].add(id_)
+        with self._lock:
+            self._celdas, self._pos = celdas, pos
+            self._todos = None
+            self.cargada = True
+
+    def upsert(self, id_: int, lat: Optional[float], lon: Optional[float]) -> None:
+        with self._lock:
+            self._quitar(id_)
+            if lat is not None and lon is not None:
+                self._todos = None
+                self._pos[id_] = (lat, lon)
+                self._celdas[self._celda(lat, lon)].add(id_)
+
+    def quitar(self, id_: int) -> None:
+        with self._lock:
+            self._quitar(id_)
+
+    def _quitar(self, id_: int) -> None:
+        self._todos = None
+        previo = self._pos.pop(id_, None)
+        if previo is not None:
+            celda = self._celda(*previo)
+            self._celdas[celda].discard(id_)
+            if not self._celdas[celda]:
+                del self._celdas[celda]
+
+    def _candidatos(self, lat: float, lon: float, km: Optional[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """(ids, coords Nx2) de las celdas que tocan la caja del radio."""
+        if km is None:
+            if self._todos is None:
+                ids = list(self._pos)
+                self._todos = (
+                    np.array(ids, dtype=np.int64),
+                    np.array([self._pos[i] for i in ids], dtype=np.float64).reshape(-1, 2),
+                )
+            return self._todos
+        b = geo.bbox_params(lat, lon, km)
+        i0, j0 = self._celda(b["lat_min"], b["lon_min"])
+        i1, j1 = self._celda(b["lat_max"], b["lon_max"])
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > len(self._celdas):
+            # radio enorme: más barato recorrer las celdas ocupadas
+            celdas = [c for c in self._celdas if i0 <= c[0] <= i1 and j0 <= c[1] <= j1]
+        else:
+            celdas = [(i, j) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1) if (i, j) in self._celdas]
+        ids = [id_ for c in celdas for id_ in self._celdas[c]]
+        coords = np.array([self._pos[i] for i in ids], dtype=np.float64).reshape(-1, 2)
+        return np.array(ids, dtype=np.int64), coords
+
+    def cercanos(self, lat: float, lon: float, km: Optional[float] = None) -> List[Tuple[int, float]]:
+        """(id_complejo, distancia_km) dentro del radio (o todos si km es None), del más cercano."""
+        with self._lock:
+            arr_ids, coords = self._candidatos(lat, lon, km)
+        if not len(arr_ids):
+            return []
+        dist = haversine_km(lat, lon, coords[:, 0], coords[:, 1])
+        if km is not None:
+            dentro = dist <= km
+            arr_ids, dist = arr_ids[dentro], dist[dentro]
+        orden = np.argsort(dist, kind="stable")
+        return list(zip(arr_ids[orden].tolist(), dist[orden].tolist()))
+
+grilla = GrillaGeo()
+_revalidacion = Revalidacion(lambda: settings.COMPLEJOS_CACHE_REVALIDAR_S)
+
+def grilla_cargada(db: Session) -> GrillaGeo:
+    if grilla.cargada and not _revalidacion.toca():
+        return grilla
+    # la versión se lee antes que las filas: lo escrito durante la carga se verá en la próxima revisión
+    if _revalidacion.cambio(repo.version_complejos(db)) or not grilla.cargada:
+        rows = db.execute(text("""
+            SELECT id_complejo, latitud::float8, longitud::float8
+            FROM complejos
+            WHERE activo = TRUE AND deleted_at IS NULL
+              AND latitud IS NOT NULL AND longitud IS NOT NULL
+        """)).all()
+        grilla.cargar([(int(r[0]), float(r[1]), float(r[2])) for r in rows])
+    return grilla
+
+def _on_complejo(p: Dict) -> None:
+    if not grilla.cargada:
+        return  # se leerá completa desde la BD en la primera consulta
+    if p.get("activo", True):
+        grilla.upsert(int(p["id_complejo"]), p.get("latitud"), p.get("longitud"))
+    else:
+        grilla.quitar(int(p["id_complejo"]))
+
+events.subscribe(TOPIC_COMPLEJO_CAMBIADO, _on_complejo)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.shared import geo
+from app.shared.deportes import existe_deporte, tiene_deporte
+
+_SCHEMA_CACHE: Dict[str, bool] = {}
+
+def _has_loc(db: Session) -> bool:
+    if "has_loc" not in _SCHEMA_CACHE:
+        q = text("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema='public' AND table_name='complejos' AND column_name='loc'
+        """)
+        _SCHEMA_CACHE["has_loc"] = db.execute(q).first() is not None
+    return _SCHEMA_CACHE["has_loc"]
+
+def _has_deportes_ids(db: Session) -> bool:
+    if "has_deportes_ids" not in _SCHEMA_CACHE:
+        q = text("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema='public' AND table_name='complejos' AND column_name='deportes_ids'
+        """)
+        _SCHEMA_CACHE["has_deportes_ids"] = db.execute(q).first() is not None
+    return _SCHEMA_CACHE["has_deportes_ids"]
+
+_COLS = """
+    c.id_complejo, c.nombre, c.direccion, co.nombre AS comuna,
+    c.latitud::float8 AS latitud, c.longitud::float8 AS longitud
+"""
+
+def cercanos(
+    db: Session, *, lat: float, lon: float, radio_km: float, deporte: Optional[str], limit: int
+) -> List[Dict[str, Any]]:
+    """Complejos activos dentro del radio, del más cercano al más lejano."""
+    params: Dict[str, Any] = {
+        "lat": lat, "lon": lon, "radio_m": radio_km * 1000,
+        "deporte": deporte.lower() if deporte else None, "limit": limit,
+    }
+    filtro = ""
+    if deporte:
+        filtro = "AND " + (tiene_deporte("c") if _has_deportes_ids(db) else existe_deporte("c"))
+    if _has_loc(db):
+        # ST_DWithin y <-> usan el índice GiST idx_complejos_loc_gist: el costo depende de
+        # cuántos complejos hay en el radio, no del tamaño de la tabla
+        sql = f"""
+            SELECT {_COLS},
+                   ST_Distance(c.loc, {geo.PUNTO}) / 1000.0 AS distancia_km
+            FROM complejos c
+            LEFT JOIN comunas co ON co.id_comuna = c.id_comuna
+            WHERE c.activo = TRUE AND c.deleted_at IS NULL
+              AND {geo.dentro_de_radio("c.loc")}
+              {filtro}
+            ORDER BY {geo.knn("c.loc")}
+            LIMIT :limit
+        """
+    else:
+        # sin PostGIS: la grilla en memoria poda por celdas y calcula distancias con NumPy;
+        # la BD solo trae (y filtra por deporte) los ids que sobreviven
+        from app.modules.nearby.grid import grilla_cargada
+        cerca = grilla_cargada(db).cercanos(lat, lon, radio_km)
+        if not cerca:
+            return []
+        params["g_ids"] = [i for i, _ in cerca]
+        params["g_km"] = [d for _, d in cerca]
+        sql = f"""
+            SELECT {_COLS}, g.km AS distancia_km
+            FROM unnest(CAST(:g_ids AS bigint[]), CAST(:g_km AS float8[])) AS g(id, km)
+            JOIN complejos c ON c.id_complejo = g.id
+            LEFT JOIN comunas co ON co.id_comuna = c.id_comuna
+            WHERE c.activo = TRUE AND c.deleted_at IS NULL
+              {filtro}
+            ORDER BY g.km
+            LIMIT :limit
+        """
+    rows = db.execute(text(sql), params).mappings().all()
+    return [dict(r) for r in rows]
+
+def puntos_en_bbox(db: Session, *, sur: float, oeste: float, norte: float, este: float) -> List[Tuple[int, float, float]]:
+    """(id_complejo, lat, lon) de complejos activos dentro de la caja."""
+    params = {"s": sur, "w": oeste, "n": norte, "e": este}
+    if _has_loc(db):
+        filtro = "c.loc && ST_MakeEnvelope(:w, :s, :e, :n, 4326)::geography"
+    else:
+        filtro = "c.latitud BETWEEN :s AND :n AND c.longitud BETWEEN :w AND :e"
+    rows = db.execute(text(f"""
+        SELECT c.id_complejo, c.latitud::float8, c.longitud::float8
+        FROM complejos c
+        WHERE c.activo = TRUE AND c.deleted_at IS NULL
+          AND c.latitud IS NOT NULL AND c.longitud IS NOT NULL
+          AND {filtro}
+    """), params).all()
+    return [(int(r[0]), float(r[1]), float(r[2])) for r in rows]
+
+def version_complejos(db: Session) -> Tuple[int, Any]:
+    """Versión barata de la tabla para revalidar la grilla y los tiles: (conteo, max(updated_at))."""
+    row = db.execute(text("SELECT count(*), max(updated_at) FROM complejos")).one()
+    return int(row[0]), row[1]
@@ -0,0 +1,49 @@
+from __future__ import annotations
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.shared.deps import get_db
+from app.modules.nearby.schemas import CercanosOut, ViewportOut
+from app.modules.nearby.service import cercanos as svc_cercanos, viewport as svc_viewport
+from app.modules.nearby.tiles import ZOOM_MAX
+
+router = APIRouter(prefix="/search", tags=["nearby"])
+
+@router.get(
+    "/nearby",
+    response_model=CercanosOut,
+    summary="Complejos cercanos",
+    description=(
+        "Complejos activos dentro de `radio_km` desde (`lat`, `lon`), ordenados por distancia. "
+        "Filtro opcional por `deporte`. Usa el índice espacial de PostGIS si está disponible."
+    ),
+)
+def nearby_endpoint(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radio_km: float = Query(5, gt=0, le=100),
+    deporte: str | None = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    return svc_cercanos(db, lat=lat, lon=lon, radio_km=radio_km, deporte=deporte, limit=limit)
+
+@router.get(
+    "/viewport",
+    response_model=ViewportOut,
+    summary="Marcadores agrupados del mapa",
+    description=(
+        "Clusters de complejos activos dentro del bbox (`sur`, `oeste`, `norte`, `este`) para el `zoom` del mapa. "
+        "Se agrupan por celdas de 64 px de cada tile; cada cluster trae cantidad, centroide y un complejo representante. "
+        "Los tiles quedan en cache hasta que cambia algún complejo dentro de ellos."
+    ),
+)
+def viewport_endpoint(
+    sur: float = Query(..., ge=-90, le=90),
+    oeste: float = Query(..., ge=-180, le=180),
+    norte: float = Query(..., ge=-90, le=90),
+    este: float = Query(..., ge=-180, le=180),
+    zoom: int = Query(..., ge=0, le=ZOOM_MAX),
+    db: Session = Depends(get_db),
+):
+    return svc_viewport(db, sur=sur, oeste=oeste, norte=norte, este=este, zoom=zoom)
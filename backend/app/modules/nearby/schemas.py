@@ -0,0 +1,36 @@
+from __future__ import annotations
+from typing import List, Optional
+from pydantic import BaseModel
+
+class CercanoOut(BaseModel):
+    id_complejo: int
+    nombre: str
+    direccion: Optional[str] = None
+    comuna: Optional[str] = None
+    latitud: Optional[float] = None
+    longitud: Optional[float] = None
+    distancia_km: float
+
+class CercanosOut(BaseModel):
+    lat: float
+    lon: float
+    radio_km: float
+    items: List[CercanoOut]
+
+class ClusterOut(BaseModel):
+    cantidad: int
+    lat: float
+    lon: float
+    id_complejo: int  # representante: el más cercano al centroide
+
+class TileOut(BaseModel):
+    z: int
+    x: int
+    y: int
+    clusters: List[ClusterOut]
+
+class ViewportOut(BaseModel):
+    zoom: int
+    tiles: List[TileOut]
+    total: int
+    tiles_en_cache: int
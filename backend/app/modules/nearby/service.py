@@ -0,0 +1,30 @@
+from __future__ import annotations
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.modules.nearby import repository as repo
+from app.modules.nearby import tiles
+from app.modules.nearby.schemas import CercanosOut, CercanoOut, ViewportOut
+
+def cercanos(
+    db: Session, *, lat: float, lon: float, radio_km: float, deporte: Optional[str], limit: int
+) -> CercanosOut:
+    rows = repo.cercanos(db, lat=lat, lon=lon, radio_km=radio_km, deporte=deporte, limit=limit)
+    return CercanosOut(lat=lat, lon=lon, radio_km=radio_km, items=[CercanoOut(**r) for r in rows])
+
+def viewport(
+    db: Session, *, sur: float, oeste: float, norte: float, este: float, zoom: int
+) -> ViewportOut:
+    if sur > norte or oeste > este:
+        raise HTTPException(status_code=400, detail="bbox inválido: se espera sur <= norte y oeste <= este")
+    try:
+        por_tile, en_cache = tiles.viewport(db, sur=sur, oeste=oeste, norte=norte, este=este, zoom=zoom)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ViewportOut(
+        zoom=zoom,
+        tiles=[{"z": t[0], "x": t[1], "y": t[2], "clusters": c} for t, c in por_tile],
+        total=sum(k["cantidad"] for _, c in por_tile for k in c),
+        tiles_en_cache=en_cache,
+    )
@@ -0,0 +1,174 @@
+# app/modules/nearby/tiles.py
+"""Clustering de marcadores del mapa por tiles (Web Mercator, como los del mapa del app).
+
+Cada tile de 256 px se divide en SUBDIV x SUBDIV celdas; los complejos de una celda forman un
+cluster (cantidad, centroide y el complejo más cercano al centroide como representante).
+Los tiles calculados se guardan por (zoom, x, y) en un LRU; al crear, mover o desactivar un
+complejo se invalidan solo los tiles de su posición anterior y nueva en cada zoom. Lo escrito
+fuera del proceso se detecta comparando conteo + max(updated_at) cada COMPLEJOS_CACHE_REVALIDAR_S
+y vacía el cache completo.
+"""
+from __future__ import annotations
+import math
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+from app.modules.complejos.service import TOPIC_COMPLEJO_CAMBIADO
+from app.modules.nearby import repository as repo
+from app.shared import events
+from app.shared.revalidacion import Revalidacion
+
+SUBDIV = 4              # 256 px / 4 = celdas de 64 px
+ZOOM_MAX = 20
+MAX_TILES = 64          # por request
+_CACHE_MAX = 20_000     # tiles en memoria
+
+Tile = Tuple[int, int, int]  # (zoom, x, y)
+
+_LAT_MAX = 85.05112878
+
+def _frac(lat: np.ndarray, lon: np.ndarray, z: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Posición en unidades de tile (x, y) a zoom z."""
+    n = 2 ** z
+    lat = np.clip(lat, -_LAT_MAX, _LAT_MAX)
+    x = (lon + 180.0) / 360.0 * n
+    rad = np.radians(lat)
+    y = (1.0 - np.log(np.tan(rad) + 1.0 / np.cos(rad)) / math.pi) / 2.0 * n
+    return np.clip(x, 0, n - 1e-9), np.clip(y, 0, n - 1e-9)
+
+def tile_de(lat: float, lon: float, z: int) -> Tile:
+    x, y = _frac(np.array([lat]), np.array([lon]), z)
+    return (z, int(x[0]), int(y[0]))
+
+def _limites(t: Tile) -> Tuple[float, float, float, float]:
+    """(sur, oeste, norte, este) del tile."""
+    z, x, y = t
+    n = 2 ** z
+    def lat(yy: float) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * yy / n))))
+    return lat(y + 1), x / n * 360.0 - 180.0, lat(y), (x + 1) / n * 360.0 - 180.0
+
+def tiles_de_bbox(sur: float, oeste: float, norte: float, este: float, z: int) -> List[Tile]:
+    _, x0, y0 = tile_de(norte, oeste, z)
+    _, x1, y1 = tile_de(sur, este, z)
+    return [(z, x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+
+def agrupar(t: Tile, puntos: List[Tuple[int, float, float]]) -> List[Dict[str, Any]]:
+    if not puntos:
+        return []
+    z, tx, ty = t
+    ids = np.array([p[0] for p in puntos], dtype=np.int64)
+    lat = np.array([p[1] for p in puntos], dtype=np.float64)
+    lon = np.array([p[2] for p in puntos], dtype=np.float64)
+    fx, fy = _frac(lat, lon, z)
+    celda = (np.floor((fx - tx) * SUBDIV).astype(np.int64).clip(0, SUBDIV - 1) * SUBDIV
+             + np.floor((fy - ty) * SUBDIV).astype(np.int64).clip(0, SUBDIV - 1))
+    clusters: List[Dict[str, Any]] = []
+    for c in np.unique(celda):
+        m = celda == c
+        clat, clon = float(lat[m].mean()), float(lon[m].mean())
+        rep = int(ids[m][np.argmin((lat[m] - clat) ** 2 + (lon[m] - clon) ** 2)])
+        clusters.append({"cantidad": int(m.sum()), "lat": clat, "lon": clon, "id_complejo": rep})
+    return clusters
+
+class CacheTiles:
+    def __init__(self, maximo: int = _CACHE_MAX):
+        self._tiles: "OrderedDict[Tile, Tuple[List[Dict[str, Any]], Set[int]]]" = OrderedDict()
+        self._por_id: Dict[int, Set[Tile]] = defaultdict(set)
+        self._max = maximo
+        self._lock = threading.Lock()
+
+    def get(self, t: Tile) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            hit = self._tiles.get(t)
+            if hit is None:
+                return None
+            self._tiles.move_to_end(t)
+            return hit[0]
+
+    def put(self, t: Tile, clusters: List[Dict[str, Any]], ids: Set[int]) -> None:
+        with self._lock:
+            self._sacar(t)
+            self._tiles[t] = (clusters, ids)
+            for i in ids:
+                self._por_id[i].add(t)
+            while len(self._tiles) > self._max:
+                self._sacar(next(iter(self._tiles)))
+
+    def invalidar_id(self, id_complejo: int, lat: Optional[float], lon: Optional[float]) -> None:
+        with self._lock:
+            afectados = set(self._por_id.get(id_complejo, ()))
+            if lat is not None and lon is not None:
+                afectados.update(tile_de(lat, lon, z) for z in range(ZOOM_MAX + 1))
+            for t in afectados:
+                self._sacar(t)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._tiles.clear()
+            self._por_id.clear()
+
+    def _sacar(self, t: Tile) -> None:
+        previo = self._tiles.pop(t, None)
+        if previo is None:
+            return
+        for i in previo[1]:
+            tiles = self._por_id.get(i)
+            if tiles is not None:
+                tiles.discard(t)
+                if not tiles:
+                    del self._por_id[i]
+
+cache = CacheTiles()
+_revalidacion = Revalidacion(lambda: settings.COMPLEJOS_CACHE_REVALIDAR_S)
+
+def viewport(db: Session, *, sur: float, oeste: float, norte: float, este: float, zoom: int) -> Tuple[List[Tuple[Tile, List[Dict[str, Any]]]], int]:
+    """Clusters por tile del viewport; devuelve también cuántos tiles salieron del cache."""
+    tiles = tiles_de_bbox(sur, oeste, norte, este, zoom)
+    if len(tiles) > MAX_TILES:
+        raise ValueError("Viewport demasiado grande para este zoom")
+    if _revalidacion.toca() and _revalidacion.cambio(repo.version_complejos(db)):
+        cache.limpiar()
+    out: Dict[Tile, List[Dict[str, Any]]] = {}
+    faltan: List[Tile] = []
+    for t in tiles:
+        hit = cache.get(t)
+        if hit is None:
+            faltan.append(t)
+        else:
+            out[t] = hit
+    if faltan:
+        # una sola consulta para la caja que cubre todos los tiles faltantes
+        lims = [_limites(t) for t in faltan]
+        puntos = repo.puntos_en_bbox(
+            db,
+            sur=min(l[0] for l in lims), oeste=min(l[1] for l in lims),
+            norte=max(l[2] for l in lims), este=max(l[3] for l in lims),
+        )
+        por_tile: Dict[Tile, List[Tuple[int, float, float]]] = defaultdict(list)
+        for p in puntos:
+            por_tile[tile_de(p[1], p[2], zoom)].append(p)
+        for t in faltan:
+            pts = por_tile.get(t, [])
+            out[t] = agrupar(t, pts)
+            cache.put(t, out[t], {p[0] for p in pts})
+    metrics.cache("tiles", True, len(tiles) - len(faltan))
+    metrics.cache("tiles", False, len(faltan))
+    return [(t, out[t]) for t in tiles], len(tiles) - len(faltan)
+
+def _on_complejo(p: Dict[str, Any]) -> None:
+    # posición nueva (si sigue activo) + tiles donde ya aparecía (posición anterior)
+    activo = p.get("activo", True)
+    cache.invalidar_id(
+        int(p["id_complejo"]),
+        p.get("latitud") if activo else None,
+        p.get("longitud") if activo else None,
+    )
+
+events.subscribe(TOPIC_COMPLEJO_CAMBIADO, _on_complejo)
@@ -0,0 +1,71 @@
+# app/modules/pagos/procesador.py
+"""Procesamiento en segundo plano de webhook_eventos.
+
+Cada pasada toma hasta PAGOS_WEBHOOK_BATCH eventos pendientes (FOR UPDATE SKIP LOCKED: varias
+instancias pueden drenar a la vez) y aplica en una sola sentencia las transiciones de pagos y
+reservas. La ingesta despierta al procesador; si no, corre cada PAGOS_WEBHOOK_INTERVAL_S.
+"""
+from __future__ import annotations
+import logging
+import threading
+from datetime import datetime
+from typing import Optional
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.modules.pagos import repository as repo
+from app.modules.reservas.sweeper import publicar_liberadas
+
+log = logging.getLogger(__name__)
+
+_stop = threading.Event()
+_wake = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+def despertar() -> None:
+    _wake.set()
+
+def procesar_una_vez() -> int:
+    """Drena eventos pendientes hasta vaciar la cola; devuelve cuántos procesó."""
+    total = 0
+    while not _stop.is_set():
+        db = SessionLocal()
+        try:
+            res = repo.procesar_lote(db, lote=settings.PAGOS_WEBHOOK_BATCH)
+        finally:
+            db.close()
+        # json_agg entrega los timestamps como texto ISO
+        canceladas = [
+            {**r, "inicio": datetime.fromisoformat(r["inicio"]), "fin": datetime.fromisoformat(r["fin"])}
+            for r in res["reservas"] if r["estado"] == "cancelada"
+        ]
+        publicar_liberadas(canceladas, "reembolso")
+        if res["errores"]:
+            log.warning("Webhooks con error: %s de %s", res["errores"], res["eventos"])
+        total += res["eventos"]
+        if res["eventos"] < settings.PAGOS_WEBHOOK_BATCH:
+            break
+    return total
+
+def _loop() -> None:
+    while not _stop.is_set():
+        _wake.clear()
+        try:
+            procesar_una_vez()
+        except Exception:
+            log.exception("Falló el procesamiento de webhooks de pagos")
+        _wake.wait(settings.PAGOS_WEBHOOK_INTERVAL_S)
+
+def start() -> None:
+    global _thread
+    if _thread and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_loop, name="pagos-webhooks", daemon=True)
+    _thread.start()
+
+def stop(timeout: float = 5.0) -> None:
+    _stop.set()
+    _wake.set()
+    if _thread:
+        _thread.join(timeout)
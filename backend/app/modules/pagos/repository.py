@@ -1,2 +1,99 @@
-class Repository:
-    pass
+from __future__ import annotations
+import json
+from typing import Any, Dict, Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+def insert_evento(
+    db: Session, *, proveedor: str, id_evento_externo: str, tipo_evento: Optional[str], payload: Dict[str, Any]
+) -> Optional[int]:
+    """Guarda el evento una sola vez; None si el proveedor ya lo había enviado (reintento)."""
+    row = db.execute(text("""
+        INSERT INTO webhook_eventos (proveedor, id_evento_externo, tipo_evento, payload)
+        VALUES (:p, :ext, :tipo, CAST(:payload AS jsonb))
+        ON CONFLICT (proveedor, id_evento_externo) DO NOTHING
+        RETURNING id_evento
+    """), {"p": proveedor, "ext": id_evento_externo, "tipo": tipo_evento, "payload": json.dumps(payload)}).first()
+    db.commit()
+    return int(row[0]) if row else None
+
+# tipo de evento -> (estado de pago, rango). Una transición solo avanza de rango, así los
+# reintentos y eventos fuera de orden no retroceden un pago.
+_PROCESAR = text("""
+    WITH lote AS (
+      SELECT id_evento, proveedor, tipo_evento, payload->'data'->>'id_externo' AS id_externo
+      FROM webhook_eventos
+      WHERE estado = 'pendiente'
+      ORDER BY id_evento
+      LIMIT :lote
+      FOR UPDATE SKIP LOCKED
+    ),
+    ev AS (
+      SELECT l.*, m.nuevo, m.rango
+      FROM lote l
+      LEFT JOIN (VALUES
+        ('payment.authorized', 'autorizado',  1),
+        ('payment.failed',     'fallido',     2),
+        ('payment.succeeded',  'pagado',      3),
+        ('payment.refunded',   'reembolsado', 4)
+      ) AS m(tipo, nuevo, rango) ON m.tipo = l.tipo_evento
+    ),
+    destino AS (
+      -- el estado más avanzado que trae el lote para cada pago
+      SELECT DISTINCT ON (proveedor, id_externo) proveedor, id_externo, nuevo, rango
+      FROM ev
+      WHERE nuevo IS NOT NULL AND id_externo IS NOT NULL
+      ORDER BY proveedor, id_externo, rango DESC
+    ),
+    pg AS (
+      UPDATE pagos p
+      SET estado = CAST(d.nuevo AS estado_pago), updated_at = now()
+      FROM destino d
+      WHERE p.proveedor = d.proveedor
+        AND p.id_externo = d.id_externo
+        AND d.rango > CASE p.estado
+                        WHEN 'creado' THEN 0 WHEN 'autorizado' THEN 1 WHEN 'fallido' THEN 2
+                        WHEN 'pagado' THEN 3 ELSE 4 END
+      RETURNING p.id_pago, p.id_reserva, p.estado::text AS estado
+    ),
+    rv AS (
+      -- pago confirmado => la retención pasa a reserva; reembolso => se libera el horario.
+      -- Sin cota de inicio a propósito: un reembolso puede llegar por una reserva de cualquier mes
+      UPDATE reservas r
+      SET estado = CASE WHEN pg.estado = 'pagado' THEN 'confirmada'::estado_reserva
+                        ELSE 'cancelada'::estado_reserva END,
+          expira_at = NULL,
+          updated_at = now()
+      FROM pg
+      WHERE r.id_reserva = pg.id_reserva
+        AND ((pg.estado = 'pagado' AND r.estado = 'pendiente')
+          OR (pg.estado = 'reembolsado' AND r.estado = 'confirmada'))
+      RETURNING r.id_reserva, r.id_cancha, r.id_usuario, r.inicio, r.fin, r.estado::text AS estado
+    ),
+    conocidos AS (
+      SELECT DISTINCT p.proveedor, p.id_externo
+      FROM pagos p
+      JOIN destino d ON d.proveedor = p.proveedor AND d.id_externo = p.id_externo
+    ),
+    marca AS (
+      UPDATE webhook_eventos w
+      SET estado = CASE WHEN ev.nuevo IS NULL OR c.id_externo IS NULL THEN 'error' ELSE 'ok' END,
+          error  = CASE WHEN ev.nuevo IS NULL THEN 'tipo de evento no soportado'
+                        WHEN c.id_externo IS NULL THEN 'pago no encontrado' END,
+          procesado_at = now()
+      FROM ev
+      LEFT JOIN conocidos c ON c.proveedor = ev.proveedor AND c.id_externo = ev.id_externo
+      WHERE w.id_evento = ev.id_evento
+      RETURNING w.estado
+    )
+    SELECT (SELECT COUNT(*) FROM marca)                      AS eventos,
+           (SELECT COUNT(*) FROM marca WHERE estado = 'error') AS errores,
+           (SELECT COUNT(*) FROM pg)                          AS pagos,
+           (SELECT COALESCE(json_agg(rv), '[]'::json) FROM rv) AS reservas
+""")
+
+def procesar_lote(db: Session, *, lote: int) -> Dict[str, Any]:
+    """Aplica un lote de eventos pendientes en una sola sentencia y hace commit."""
+    row = db.execute(_PROCESAR, {"lote": lote}).mappings().one()
+    db.commit()
+    return dict(row)
@@ -1,8 +1,40 @@
-from fastapi import APIRouter, Depends
-from app.shared.deps import require_roles
+from fastapi import APIRouter, Depends, Header, Request
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-router = APIRouter(prefix="/pagos")
+from app.shared.deps import get_db
+from app.modules.pagos import procesador
+from app.modules.pagos.schemas import WebhookAckOut
+from app.modules.pagos.service import ingestar_webhook
+
+router = APIRouter(prefix="/pagos", tags=["pagos"])
 
 @router.get("/ping")
 def ping():
     return {"module": "pagos", "status": "ok"}
+
+@router.post(
+    "/webhooks/{proveedor}",
+    response_model=WebhookAckOut,
+    summary="Webhook de proveedor de pagos",
+    description=(
+        "Recibe eventos del proveedor. Valida `X-Signature` (`sha256=<hmac hex del cuerpo>`), "
+        "deduplica por id de evento (`X-Event-Id` o `id` del cuerpo) y responde de inmediato; "
+        "los cambios de estado de pagos y reservas se aplican en segundo plano."
+    ),
+)
+async def webhook_endpoint(
+    proveedor: str,
+    request: Request,
+    x_signature: str | None = Header(None),
+    x_event_id: str | None = Header(None),
+    db: Session = Depends(get_db),
+):
+    cuerpo = await request.body()
+    # el INSERT es bloqueante: fuera del event loop
+    ack = await run_in_threadpool(
+        ingestar_webhook, db, proveedor=proveedor, cuerpo=cuerpo, firma=x_signature, id_evento=x_event_id
+    )
+    if not ack.duplicado:
+        procesador.despertar()
+    return ack
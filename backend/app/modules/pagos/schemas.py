@@ -1,4 +1,5 @@
 from pydantic import BaseModel
 
-class Placeholder(BaseModel):
-    pass
+class WebhookAckOut(BaseModel):
+    ok: bool = True
+    duplicado: bool = False
@@ -1,2 +1,40 @@
-class Service:
-    pass
+from __future__ import annotations
+import hashlib
+import hmac
+import json
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.modules.pagos import repository as repo
+from app.modules.pagos.schemas import WebhookAckOut
+
+def firmar(secreto: str, cuerpo: bytes) -> str:
+    return "sha256=" + hmac.new(secreto.encode(), cuerpo, hashlib.sha256).hexdigest()
+
+def ingestar_webhook(
+    db: Session, *, proveedor: str, cuerpo: bytes, firma: Optional[str], id_evento: Optional[str]
+) -> WebhookAckOut:
+    """Solo valida firma, deduplica y guarda; el procesamiento ocurre fuera del request."""
+    proveedor = proveedor.lower()
+    secreto = settings.pagos_webhook_secrets.get(proveedor)
+    if secreto is None:
+        raise HTTPException(status_code=404, detail="Proveedor no configurado")
+    if not firma or not hmac.compare_digest(firma, firmar(secreto, cuerpo)):
+        raise HTTPException(status_code=401, detail="Firma inválida")
+    try:
+        payload = json.loads(cuerpo)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="JSON inválido")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="JSON inválido")
+
+    id_evento = id_evento or payload.get("id")
+    if not id_evento:
+        raise HTTPException(status_code=400, detail="Falta id de evento")
+    nuevo = repo.insert_evento(
+        db, proveedor=proveedor, id_evento_externo=str(id_evento),
+        tipo_evento=payload.get("type"), payload=payload,
+    )
+    return WebhookAckOut(duplicado=nuevo is None)
@@ -1,2 +1,51 @@
-class Repository:
-    pass
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+def get_complejo_de_cancha(db: Session, id_cancha: int) -> Optional[int]:
+    row = db.execute(text("SELECT id_complejo FROM canchas WHERE id_cancha = :c"), {"c": id_cancha}).first()
+    return int(row[0]) if row else None
+
+def list_reglas(db: Session, id_cancha: int) -> List[Dict[str, Any]]:
+    rows = db.execute(text("""
+        SELECT id_regla, id_cancha, dia::text AS dia, hora_inicio, hora_fin,
+               precio_por_hora, vigente_desde, vigente_hasta
+        FROM reglas_precio
+        WHERE id_cancha = :c
+        ORDER BY id_regla
+    """), {"c": id_cancha}).mappings().all()
+    return [dict(r) for r in rows]
+
+def list_promociones_activas(db: Session, id_cancha: int, id_complejo: int) -> List[Dict[str, Any]]:
+    # la vigencia por fecha se evalúa en memoria al cotizar
+    rows = db.execute(text("""
+        SELECT id_promocion, titulo, tipo::text AS tipo, valor, vigente_desde, vigente_hasta
+        FROM promociones
+        WHERE estado = 'activa'
+          AND (id_cancha = :c OR id_complejo = :x)
+        ORDER BY id_promocion
+    """), {"c": id_cancha, "x": id_complejo}).mappings().all()
+    return [dict(r) for r in rows]
+
+def insert_regla(db: Session, data: Dict[str, Any]) -> Dict[str, Any]:
+    row = db.execute(text("""
+        INSERT INTO reglas_precio (id_cancha, dia, hora_inicio, hora_fin, precio_por_hora, vigente_desde, vigente_hasta)
+        VALUES (:id_cancha, CAST(:dia AS dia_semana), :hora_inicio, :hora_fin, :precio_por_hora, :vigente_desde, :vigente_hasta)
+        RETURNING id_regla, id_cancha, dia::text AS dia, hora_inicio, hora_fin,
+                  precio_por_hora, vigente_desde, vigente_hasta
+    """), data).mappings().one()
+    db.commit()
+    return dict(row)
+
+def delete_regla(db: Session, id_regla: int) -> Optional[int]:
+    """Elimina la regla y devuelve el id_cancha afectado (None si no existía)."""
+    row = db.execute(
+        text("DELETE FROM reglas_precio WHERE id_regla = :r RETURNING id_cancha"), {"r": id_regla}
+    ).first()
+    db.commit()
+    return int(row[0]) if row else None
+
+def cancha_de_regla(db: Session, id_regla: int) -> Optional[int]:
+    row = db.execute(text("SELECT id_cancha FROM reglas_precio WHERE id_regla = :r"), {"r": id_regla}).first()
+    return int(row[0]) if row else None
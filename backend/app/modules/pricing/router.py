@@ -1,8 +1,87 @@
-from fastapi import APIRouter, Depends
-from app.shared.deps import require_roles
+from __future__ import annotations
+from datetime import date, time
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
 
-router = APIRouter(prefix="/pricing")
+from app.shared.deps import get_db, require_roles
+from app.modules.auth.model import Usuario
+from app.modules.canchas import repository as canchas_repo
+from app.modules.pricing import repository as repo
+from app.modules.pricing.schemas import CotizacionOut, ReglaPrecioIn, ReglaPrecioOut
+from app.modules.pricing.service import Service
+
+router = APIRouter(prefix="/pricing", tags=["pricing"])
+
+def _check_owner(db: Session, user: Usuario, id_cancha: int) -> None:
+    id_dueno = canchas_repo.owner_of_cancha(db, id_cancha)
+    if id_dueno is None:
+        raise HTTPException(status_code=404, detail="Cancha no encontrada")
+    if user.rol not in ("admin", "superadmin") and user.id_usuario != id_dueno:
+        raise HTTPException(status_code=403, detail="No autorizado para esta cancha")
 
 @router.get("/ping")
 def ping():
     return {"module": "pricing", "status": "ok"}
+
+@router.get(
+    "/cotizar",
+    response_model=CotizacionOut,
+    summary="Cotiza una reserva",
+    description=(
+        "Calcula el precio de `[hora_inicio, hora_fin)` para la cancha en la fecha indicada, "
+        "según sus **reglas de precio** vigentes, y aplica la **mejor promoción** activa."
+    ),
+)
+def cotizar_endpoint(
+    id_cancha: int = Query(..., gt=0),
+    fecha: date = Query(...),
+    hora_inicio: time = Query(...),
+    hora_fin: time = Query(...),
+    db: Session = Depends(get_db),
+):
+    try:
+        return Service.cotizar(db, id_cancha=id_cancha, fecha=fecha, h_ini=hora_inicio, h_fin=hora_fin)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.get("/reglas", response_model=list[ReglaPrecioOut], summary="Reglas de precio de una cancha")
+def reglas_endpoint(
+    id_cancha: int = Query(..., gt=0),
+    db: Session = Depends(get_db),
+):
+    return Service.reglas(db, id_cancha=id_cancha)
+
+@router.post(
+    "/reglas",
+    response_model=ReglaPrecioOut,
+    status_code=status.HTTP_201_CREATED,
+    summary="Crea una regla de precio (dueño/admin)",
+)
+def crear_regla_endpoint(
+    payload: ReglaPrecioIn,
+    user: Usuario = Depends(require_roles("dueno", "admin", "superadmin")),
+    db: Session = Depends(get_db),
+):
+    _check_owner(db, user, payload.id_cancha)
+    if payload.hora_fin <= payload.hora_inicio:
+        raise HTTPException(status_code=400, detail="hora_fin debe ser > hora_inicio")
+    return Service.crear_regla(db, data=payload.model_dump())
+
+@router.delete(
+    "/reglas/{id_regla}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Elimina una regla de precio (dueño/admin)",
+)
+def eliminar_regla_endpoint(
+    id_regla: int,
+    user: Usuario = Depends(require_roles("dueno", "admin", "superadmin")),
+    db: Session = Depends(get_db),
+):
+    id_cancha = repo.cancha_de_regla(db, id_regla)
+    if id_cancha is None:
+        raise HTTPException(status_code=404, detail="Regla no encontrada")
+    _check_owner(db, user, id_cancha)
+    Service.eliminar_regla(db, id_regla=id_regla)
+    return None
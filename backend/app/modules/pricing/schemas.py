@@ -1,4 +1,37 @@
-from pydantic import BaseModel
+from __future__ import annotations
+from datetime import date, time
+from typing import Literal, Optional
+from pydantic import BaseModel, Field
 
-class Placeholder(BaseModel):
-    pass
+DiaSemana = Literal["lunes", "martes", "miercoles", "jueves", "viernes", "sabado", "domingo"]
+
+class CotizacionOut(BaseModel):
+    id_cancha: int
+    fecha: date
+    hora_inicio: str  # "HH:MM"
+    hora_fin: str     # "HH:MM"
+    minutos: int
+    subtotal: Optional[float] = Field(None, description="Null si alguna parte del tramo no tiene tarifa")
+    descuento: float = 0
+    total: Optional[float] = None
+    id_promocion: Optional[int] = None
+    promocion: Optional[str] = None
+
+class ReglaPrecioIn(BaseModel):
+    id_cancha: int = Field(..., gt=0)
+    dia: Optional[DiaSemana] = Field(None, description="Null = todos los días")
+    hora_inicio: time
+    hora_fin: time
+    precio_por_hora: float = Field(..., ge=0)
+    vigente_desde: Optional[date] = None
+    vigente_hasta: Optional[date] = None
+
+class ReglaPrecioOut(BaseModel):
+    id_regla: int
+    id_cancha: int
+    dia: Optional[str] = None
+    hora_inicio: time
+    hora_fin: time
+    precio_por_hora: float
+    vigente_desde: Optional[date] = None
+    vigente_hasta: Optional[date] = None
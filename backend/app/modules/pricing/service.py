@@ -1,2 +1,191 @@
+from __future__ import annotations
+import threading
+import time as _time
+from datetime import date, time
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+from app.modules.pricing import repository as repo
+
+_DIAS = ["lunes", "martes", "miercoles", "jueves", "viernes", "sabado", "domingo"]
+_CENT = Decimal("0.01")
+
+# (minuto_inicio, minuto_fin, precio_por_hora) con minutos desde las 00:00
+Banda = Tuple[int, int, Decimal]
+
+def _minutos(t: time, es_fin: bool = False) -> int:
+    m = t.hour * 60 + t.minute
+    # '24:00' llega como 00:00; como fin de franja significa fin del día
+    return 24 * 60 if (es_fin and m == 0) else m
+
+def _vigente(item: Dict[str, Any], fecha: date) -> bool:
+    desde, hasta = item.get("vigente_desde"), item.get("vigente_hasta")
+    return (desde is None or desde <= fecha) and (hasta is None or hasta >= fecha)
+
+def _prioridad(regla: Dict[str, Any]) -> Tuple[int, date, int]:
+    # regla de un día concreto > regla genérica; luego la vigencia más reciente y la última creada
+    return (1 if regla["dia"] else 0, regla["vigente_desde"] or date.min, regla["id_regla"])
+
+def compilar_bandas(reglas: List[Dict[str, Any]]) -> List[Banda]:
+    """Aplana reglas (posiblemente solapadas) en franjas ordenadas y disjuntas."""
+    cortes = sorted({m for r in reglas for m in (r["ini"], r["fin"])})
+    bandas: List[Banda] = []
+    for a, b in zip(cortes, cortes[1:]):
+        cubren = [r for r in reglas if r["ini"] <= a and r["fin"] >= b]
+        if not cubren:
+            continue
+        precio = max(cubren, key=_prioridad)["precio"]
+        if bandas and bandas[-1][1] == a and bandas[-1][2] == precio:
+            bandas[-1] = (bandas[-1][0], b, precio)
+        else:
+            bandas.append((a, b, precio))
+    return bandas
+
+def precio_bandas(bandas: List[Banda], ini: int, fin: int) -> Optional[Decimal]:
+    """Precio de [ini, fin) recorriendo las franjas una sola vez. None si algún minuto no tiene tarifa."""
+    total = Decimal(0)
+    cubierto = 0
+    for a, b, precio in bandas:
+        if b <= ini:
+            continue
+        if a >= fin:
+            break
+        m = min(b, fin) - max(a, ini)
+        total += precio * m / 60
+        cubierto += m
+    if cubierto != fin - ini:
+        return None
+    return total.quantize(_CENT, rounding=ROUND_HALF_UP)
+
+class Tarifario:
+    """Reglas de precio y promociones de una cancha, compiladas para cotizar sin ir a la BD."""
+
+    def __init__(self, id_cancha: int, id_complejo: int, reglas: List[Dict[str, Any]], promociones: List[Dict[str, Any]]):
+        self.id_cancha = id_cancha
+        self.id_complejo = id_complejo
+        self.reglas = [
+            {
+                **r,
+                "ini": _minutos(r["hora_inicio"]),
+                "fin": _minutos(r["hora_fin"], es_fin=True),
+                "precio": Decimal(r["precio_por_hora"]),
+            }
+            for r in reglas
+        ]
+        self.promociones = promociones
+        # el conjunto de reglas activas cambia poco entre fechas: memo por combinación
+        self._bandas: Dict[Tuple[int, ...], List[Banda]] = {}
+
+    def bandas(self, fecha: date) -> List[Banda]:
+        dia = _DIAS[fecha.weekday()]
+        activas = [r for r in self.reglas if (r["dia"] is None or r["dia"] == dia) and _vigente(r, fecha)]
+        clave = tuple(r["id_regla"] for r in activas)
+        bandas = self._bandas.get(clave)
+        if bandas is None:
+            bandas = compilar_bandas(activas)
+            self._bandas[clave] = bandas
+        return bandas
+
+    def mejor_promocion(self, fecha: date, subtotal: Decimal) -> Tuple[Optional[Dict[str, Any]], Decimal]:
+        mejor, descuento = None, Decimal(0)
+        for p in self.promociones:
+            if not _vigente(p, fecha):
+                continue
+            valor = Decimal(p["valor"])
+            d = min(subtotal * valor / 100 if p["tipo"] == "porcentaje" else valor, subtotal)
+            if d > descuento:
+                mejor, descuento = p, d
+        return mejor, descuento.quantize(_CENT, rounding=ROUND_HALF_UP)
+
+# =========================
+# Cache en memoria por cancha
+# =========================
+_TARIFARIOS: Dict[int, Tuple[float, Tarifario]] = {}
+_LOCK = threading.Lock()
+
+def invalidar(id_cancha: Optional[int] = None) -> None:
+    with _LOCK:
+        if id_cancha is None:
+            _TARIFARIOS.clear()
+        else:
+            _TARIFARIOS.pop(id_cancha, None)
+
+def get_tarifario(db: Session, id_cancha: int) -> Optional[Tarifario]:
+    ahora = _time.monotonic()
+    with _LOCK:
+        hit = _TARIFARIOS.get(id_cancha)
+    if hit and ahora - hit[0] < settings.PRICING_CACHE_TTL_S:
+        metrics.cache("tarifarios", True)
+        return hit[1]
+    metrics.cache("tarifarios", False)
+
+    id_complejo = repo.get_complejo_de_cancha(db, id_cancha)
+    if id_complejo is None:
+        return None
+    tarifario = Tarifario(
+        id_cancha,
+        id_complejo,
+        repo.list_reglas(db, id_cancha),
+        repo.list_promociones_activas(db, id_cancha, id_complejo),
+    )
+    with _LOCK:
+        _TARIFARIOS[id_cancha] = (ahora, tarifario)
+    return tarifario
+
+def cotizar(db: Session, *, id_cancha: int, fecha: date, h_ini: time, h_fin: time) -> Dict[str, Any]:
+    ini, fin = _minutos(h_ini), _minutos(h_fin, es_fin=True)
+    if fin <= ini:
+        raise ValueError("hora_fin debe ser > hora_inicio")
+    tarifario = get_tarifario(db, id_cancha)
+    if tarifario is None:
+        raise LookupError("Cancha no encontrada")
+
+    subtotal = precio_bandas(tarifario.bandas(fecha), ini, fin)
+    promo, descuento = (None, Decimal(0))
+    if subtotal is not None:
+        promo, descuento = tarifario.mejor_promocion(fecha, subtotal)
+    return {
+        "id_cancha": id_cancha,
+        "fecha": fecha,
+        "hora_inicio": h_ini.strftime("%H:%M"),
+        "hora_fin": h_fin.strftime("%H:%M"),
+        "minutos": fin - ini,
+        "subtotal": subtotal,
+        "descuento": descuento,
+        "total": (subtotal - descuento) if subtotal is not None else None,
+        "id_promocion": promo["id_promocion"] if promo else None,
+        "promocion": promo["titulo"] if promo else None,
+    }
+
+def precio_total(db: Session, *, id_cancha: int, fecha: date, h_ini: time, h_fin: time) -> Optional[Decimal]:
+    """Total a cobrar para una reserva; None si la cancha no tiene tarifa para todo el tramo."""
+    try:
+        return cotizar(db, id_cancha=id_cancha, fecha=fecha, h_ini=h_ini, h_fin=h_fin)["total"]
+    except (LookupError, ValueError):
+        return None
+
 class Service:
-    pass
+    @staticmethod
+    def cotizar(db: Session, *, id_cancha: int, fecha: date, h_ini: time, h_fin: time):
+        return cotizar(db, id_cancha=id_cancha, fecha=fecha, h_ini=h_ini, h_fin=h_fin)
+
+    @staticmethod
+    def reglas(db: Session, *, id_cancha: int):
+        return repo.list_reglas(db, id_cancha)
+
+    @staticmethod
+    def crear_regla(db: Session, *, data: Dict[str, Any]):
+        row = repo.insert_regla(db, data)
+        invalidar(row["id_cancha"])
+        return row
+
+    @staticmethod
+    def eliminar_regla(db: Session, *, id_regla: int) -> bool:
+        id_cancha = repo.delete_regla(db, id_regla)
+        if id_cancha is None:
+            return False
+        invalidar(id_cancha)
+        return True
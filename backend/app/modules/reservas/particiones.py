@@ -0,0 +1,53 @@
+# app/modules/reservas/particiones.py
+"""Mantención periódica de las particiones mensuales de reservas.
+
+Crea por adelantado RESERVAS_PARTICIONES_ADELANTE meses (cada uno con su EXCLUDE) y desacopla
+los meses más antiguos que RESERVAS_PARTICIONES_RETENER; las tablas desacopladas quedan en la BD
+para archivarlas. Varias instancias pueden correrlo: la función SQL toma un advisory lock.
+"""
+from __future__ import annotations
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.modules.reservas import repository as repo
+
+log = logging.getLogger(__name__)
+
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+def mantener_una_vez() -> List[Dict[str, Any]]:
+    db = SessionLocal()
+    try:
+        return repo.mantener_particiones(
+            db,
+            adelante=settings.RESERVAS_PARTICIONES_ADELANTE,
+            retener=settings.RESERVAS_PARTICIONES_RETENER or None,
+        )
+    finally:
+        db.close()
+
+def _loop() -> None:
+    while not _stop.is_set():
+        try:
+            for r in mantener_una_vez():
+                log.info("Partición de reservas %s: %s", r["accion"], r["particion"])
+        except Exception:
+            log.exception("Falló la mantención de particiones de reservas")
+        _stop.wait(settings.RESERVAS_PARTICIONES_INTERVALO_S)
+
+def start() -> None:
+    global _thread
+    if _thread and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_loop, name="reservas-particiones", daemon=True)
+    _thread.start()
+
+def stop(timeout: float = 5.0) -> None:
+    _stop.set()
+    if _thread:
+        _thread.join(timeout)
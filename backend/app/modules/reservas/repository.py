@@ -1,10 +1,12 @@
 from __future__ import annotations
-from datetime import datetime
+from datetime import date, datetime
 from zoneinfo import ZoneInfo
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+
 _TZ = ZoneInfo("America/Santiago")
 
 _DEF_SELECT = """
@@ -19,53 +21,235 @@ SELECT
     WHEN 'pendiente'  THEN 'pending'
     WHEN 'confirmada' THEN 'confirmed'
     WHEN 'cancelada'  THEN 'cancelled'
+    WHEN 'expirada'   THEN 'expired'
     ELSE 'pending'
   END AS estado,
-  r.precio_total AS monto_total
+  r.precio_total AS monto_total,
+  r.inicio
 FROM reservas r
 """
 
-def create_reserva(db: Session, *, id_usuario: int, id_cancha: int, fecha, h_ini, h_fin) -> Dict[str, Any]:
-    inicio = datetime.combine(fecha, h_ini).replace(tzinfo=_TZ)
-    fin    = datetime.combine(fecha, h_fin).replace(tzinfo=_TZ)
+_RETURNING = """
+RETURNING id_reserva, id_usuario, id_cancha,
+          (inicio AT TIME ZONE 'America/Santiago')::date AS fecha_reserva,
+          to_char(inicio AT TIME ZONE 'America/Santiago','HH24:MI') AS hora_inicio,
+          to_char(fin    AT TIME ZONE 'America/Santiago','HH24:MI') AS hora_fin,
+          CASE estado WHEN 'pendiente' THEN 'pending' WHEN 'confirmada' THEN 'confirmed' WHEN 'cancelada' THEN 'cancelled' WHEN 'expirada' THEN 'expired' ELSE 'pending' END AS estado,
+          precio_total AS monto_total,
+          expira_at
+"""
+
+# filas por INSERT multi-fila en reservas recurrentes
+_LOTE_INSERT = 100
+
+# espacio de nombres para pg_advisory_xact_lock(ns, id_cancha)
+_LOCK_NS_CANCHA = 26_029
+
+class SolapamientoError(RuntimeError):
+    """El horario ya está tomado. `origen`: 'precheck' (detectado antes de insertar) o 'exclude'."""
+
+    def __init__(self, motivo: str = "reserva", origen: str = "exclude"):
+        super().__init__("OVERLAP")
+        self.motivo = motivo
+        self.origen = origen
+        self.alternativas: List[Dict[str, Any]] = []
+
+def lock_cancha(db: Session, id_cancha: int) -> None:
+    """Serializa las reservas de una cancha hasta el fin de la transacción actual."""
+    db.execute(text("SELECT pg_advisory_xact_lock(:ns, CAST(:c AS int))"), {"ns": _LOCK_NS_CANCHA, "c": id_cancha})
+
+def _es_solapamiento(e: Exception) -> bool:
+    """True si la BD rechazó la fila por el EXCLUDE de solapamiento (SQLSTATE 23P01)."""
+    orig = getattr(e, "orig", None)
+    if getattr(orig, "pgcode", None) == "23P01":
+        return True
+    diag = getattr(orig, "diag", None)
+    return getattr(diag, "constraint_name", None) == "excl_reservas_solapadas"
+
+_SCHEMA_CACHE: Dict[str, bool] = {}
+
+def _particionada(db: Session) -> bool:
+    # 13_reservas_particionadas.sql
+    if "particionada" not in _SCHEMA_CACHE:
+        q = text("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass('public.reservas')")
+        _SCHEMA_CACHE["particionada"] = bool(db.execute(q).scalar())
+    return _SCHEMA_CACHE["particionada"]
+
+def _recientes(db: Session, columna: str = "inicio") -> str:
+    """Cota de `inicio` para que el planner descarte las particiones pasadas (solo si está particionada)."""
+    return f"AND {columna} >= now() - INTERVAL '1 day'" if _particionada(db) else ""
+
+def asegurar_particiones(db: Session, inicios: Sequence[datetime]) -> None:
+    """Crea los meses que falten más allá de los que ya mantiene el job (reservas muy adelantadas)."""
+    hoy = datetime.now(_TZ).date()
+    n = hoy.year * 12 + hoy.month - 1 + settings.RESERVAS_PARTICIONES_ADELANTE
+    limite = date(n // 12, n % 12 + 1, 1)
+    meses = sorted({m for m in (i.astimezone(_TZ).date().replace(day=1) for i in inicios) if m > limite})
+    if not meses or not _particionada(db):
+        return
+    db.execute(text("SELECT reservas_crear_particion(m) FROM unnest(CAST(:meses AS date[])) AS m"), {"meses": meses})
+
+def mantener_particiones(db: Session, *, adelante: int, retener: Optional[int]) -> List[Dict[str, Any]]:
+    """Crea los próximos meses y desacopla los más antiguos que `retener`; devuelve lo hecho."""
+    if not _particionada(db):
+        return []
+    rows = db.execute(
+        text("SELECT accion, particion FROM reservas_particiones_mantener(:a, :r)"),
+        {"a": adelante, "r": retener},
+    ).mappings().all()
+    db.commit()
+    return [dict(r) for r in rows]
+
+def rango(fecha, h_ini, h_fin) -> Tuple[datetime, datetime]:
+    return (
+        datetime.combine(fecha, h_ini).replace(tzinfo=_TZ),
+        datetime.combine(fecha, h_fin).replace(tzinfo=_TZ),
+    )
+
+def create_reserva(db: Session, *, id_usuario: int, id_cancha: int, fecha, h_ini, h_fin, precio_total=None) -> Dict[str, Any]:
+    inicio, fin = rango(fecha, h_ini, h_fin)
     if fin <= inicio:
         raise ValueError("hora_fin debe ser > hora_inicio")
 
     sql = text(
         """
         INSERT INTO reservas (id_cancha, id_usuario, inicio, fin, estado, precio_total)
-        VALUES (:id_cancha, :id_usuario, :inicio, :fin, 'confirmada', NULL)
-        RETURNING id_reserva, id_usuario, id_cancha,
-                  (inicio AT TIME ZONE 'America/Santiago')::date AS fecha_reserva,
-                  to_char(inicio AT TIME ZONE 'America/Santiago','HH24:MI') AS hora_inicio,
-                  to_char(fin    AT TIME ZONE 'America/Santiago','HH24:MI') AS hora_fin,
-                  CASE estado WHEN 'pendiente' THEN 'pending' WHEN 'confirmada' THEN 'confirmed' WHEN 'cancelada' THEN 'cancelled' ELSE 'pending' END AS estado,
-                  precio_total AS monto_total
-        """
+        VALUES (:id_cancha, :id_usuario, :inicio, :fin, 'confirmada', :precio_total)
+        """ + _RETURNING
     )
     try:
+        # con el lock tomado, el pre-chequeo indexado es definitivo: el perdedor no llega a insertar
+        lock_cancha(db, id_cancha)
+        asegurar_particiones(db, [inicio])
+        choque = conflictos(db, id_cancha=id_cancha, rangos=[(inicio, fin)])
+        if choque:
+            db.rollback()
+            raise SolapamientoError(choque[0], origen="precheck")
         row = db.execute(sql, {
             "id_cancha": id_cancha,
             "id_usuario": id_usuario,
             "inicio": inicio,
             "fin": fin,
+            "precio_total": precio_total,
         }).mappings().one()
         db.commit()
         return dict(row)
+    except SolapamientoError:
+        raise
     except Exception as e:
         db.rollback()
         # choque por constraint EXCLUDE (solapamiento)
-        msg = str(e).lower()
-        if "exclude" in msg or "tstzrange" in msg or "overlap" in msg:
-            raise RuntimeError("OVERLAP")
+        if _es_solapamiento(e):
+            raise SolapamientoError()
+        raise
+
+def conflictos(db: Session, *, id_cancha: int, rangos: Sequence[Tuple[datetime, datetime]]) -> Dict[int, str]:
+    """Índice de cada rango que choca con una reserva activa o un bloqueo -> motivo.
+
+    Una sola consulta para todos los rangos; usa idx_reservas_rango / idx_bloqueos_rango y solo
+    lee las particiones de reservas de esas fechas (las reservas duran menos de un día).
+    """
+    if not rangos:
+        return {}
+    rows = db.execute(text(
+        """
+        WITH o AS (
+          SELECT t.ord - 1 AS idx, tstzrange(t.i, t.f, '[)') AS rg
+          FROM unnest(CAST(:inicios AS timestamptz[]), CAST(:fines AS timestamptz[])) WITH ORDINALITY AS t(i, f, ord)
+        )
+        SELECT o.idx, 'reserva' AS motivo FROM o
+         WHERE EXISTS (
+           SELECT 1 FROM reservas r
+            WHERE r.id_cancha = :c AND r.estado IN ('pendiente','confirmada')
+              AND r.inicio >= CAST(:desde AS timestamptz) - INTERVAL '1 day'
+              AND r.inicio <  CAST(:hasta AS timestamptz)
+              AND tstzrange(r.inicio, r.fin, '[)') && o.rg
+         )
+        UNION ALL
+        SELECT o.idx, 'bloqueo' AS motivo FROM o
+         WHERE EXISTS (
+           SELECT 1 FROM bloqueos b
+            WHERE b.id_cancha = :c AND tstzrange(b.inicio, b.fin, '[)') && o.rg
+         )
+        """
+    ), {
+        "c": id_cancha,
+        "inicios": [a for a, _ in rangos],
+        "fines": [b for _, b in rangos],
+        # cotas constantes sobre inicio: el planner descarta las particiones fuera del rango
+        "desde": min(a for a, _ in rangos),
+        "hasta": max(b for _, b in rangos),
+    }).all()
+    out: Dict[int, str] = {}
+    for idx, motivo in rows:
+        out.setdefault(int(idx), motivo)
+    return out
+
+def create_reservas_lote(
+    db: Session, *, id_usuario: int, id_cancha: int,
+    filas: Sequence[Tuple[datetime, datetime, Any]],
+) -> List[Dict[str, Any]]:
+    """Inserta (inicio, fin, precio_total) en una sola transacción, un INSERT multi-fila por lote.
+
+    Todo o nada: si otra reserva se cruzó entretanto, se revierte completo y lanza OVERLAP.
+    Quien llama debería tener tomado `lock_cancha` desde el chequeo de conflictos.
+    """
+    sql = text(
+        """
+        INSERT INTO reservas (id_cancha, id_usuario, inicio, fin, estado, precio_total)
+        SELECT :id_cancha, :id_usuario, t.i, t.f, 'confirmada', t.p
+        FROM unnest(CAST(:inicios AS timestamptz[]), CAST(:fines AS timestamptz[]), CAST(:precios AS numeric[])) AS t(i, f, p)
+        """ + _RETURNING
+    )
+    creadas: List[Dict[str, Any]] = []
+    try:
+        asegurar_particiones(db, [f[0] for f in filas])
+        for k in range(0, len(filas), _LOTE_INSERT):
+            lote = filas[k:k + _LOTE_INSERT]
+            rows = db.execute(sql, {
+                "id_cancha": id_cancha,
+                "id_usuario": id_usuario,
+                "inicios": [f[0] for f in lote],
+                "fines": [f[1] for f in lote],
+                "precios": [f[2] for f in lote],
+            }).mappings().all()
+            creadas.extend(dict(r) for r in rows)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        if _es_solapamiento(e):
+            raise SolapamientoError()
         raise
+    creadas.sort(key=lambda r: (r["fecha_reserva"], r["hora_inicio"]))
+    return creadas
+
+def list_mis_reservas(
+    db: Session, *, id_usuario: int, scope: Optional[str] = None,
+    despues_de: Optional[Tuple[datetime, int]] = None, limit: int = 200,
+) -> List[Dict[str, Any]]:
+    """Reservas del usuario por keyset sobre (inicio, id_reserva); usa idx_reservas_usuario_inicio.
 
-def list_mis_reservas(db: Session, *, id_usuario: int) -> List[Dict[str, Any]]:
-    sql = text(_DEF_SELECT + " WHERE r.id_usuario = :uid ORDER BY r.inicio DESC LIMIT 200")
-    rows = db.execute(sql, {"uid": id_usuario}).mappings().all()
+    scope 'upcoming': aún no comienzan, la más próxima primero. 'past' o None: más recientes primero.
+    `despues_de`: (inicio, id_reserva) de la última fila de la página anterior.
+    """
+    asc = scope == "upcoming"
+    wheres = ["r.id_usuario = :uid"]
+    params: Dict[str, Any] = {"uid": id_usuario, "limit": limit}
+    if scope == "upcoming":
+        wheres.append("r.inicio >= now()")
+    elif scope == "past":
+        wheres.append("r.inicio < now()")
+    if despues_de is not None:
+        wheres.append(f"(r.inicio, r.id_reserva) {'>' if asc else '<'} (CAST(:c_ini AS timestamptz), :c_id)")
+        params["c_ini"], params["c_id"] = despues_de
+    d = "ASC" if asc else "DESC"
+    sql = text(_DEF_SELECT + f" WHERE {' AND '.join(wheres)} ORDER BY r.inicio {d}, r.id_reserva {d} LIMIT :limit")
+    rows = db.execute(sql, params).mappings().all()
     return [dict(r) for r in rows]
 
 def cancelar_reserva(db: Session, *, id_usuario: int, id_reserva: int) -> Dict[str, Any] | None:
+    # sin cota de inicio a propósito: se puede cancelar una reserva de cualquier mes, y es una
+    # búsqueda por PK (un probe de índice por partición)
     sql = text(
         """
         UPDATE reservas
@@ -84,4 +268,92 @@ def cancelar_reserva(db: Session, *, id_usuario: int, id_reserva: int) -> Dict[s
         db.rollback()
         return None
     db.commit()
-    return dict(row)
\ No newline at end of file
+    return dict(row)
+
+# =========================
+# Retenciones (pendiente + expira_at)
+# =========================
+_EXPIRAR = """
+WITH vencidas AS (
+  SELECT id_reserva, inicio FROM reservas
+   WHERE estado = 'pendiente' AND expira_at IS NOT NULL AND expira_at <= now()
+     {recientes}
+     {filtro}
+   ORDER BY expira_at
+   LIMIT :lote
+   FOR UPDATE SKIP LOCKED
+)
+-- inicio en el join y la misma cota afuera: el UPDATE tampoco recorre las particiones pasadas
+UPDATE reservas r
+   SET estado = 'expirada', updated_at = now()
+  FROM vencidas v
+ WHERE r.id_reserva = v.id_reserva AND r.inicio = v.inicio
+   {recientes_r}
+RETURNING r.id_reserva, r.id_cancha, r.id_usuario, r.inicio, r.fin
+"""
+
+def expirar_retenciones(db: Session, *, lote: int) -> List[Dict[str, Any]]:
+    """Expira hasta `lote` retenciones vencidas en un solo UPDATE ... RETURNING y confirma."""
+    sql = _EXPIRAR.format(recientes=_recientes(db), recientes_r=_recientes(db, "r.inicio"), filtro="")
+    rows = db.execute(text(sql), {"lote": lote}).mappings().all()
+    db.commit()
+    return [dict(r) for r in rows]
+
+def create_retencion(
+    db: Session, *, id_usuario: int, id_cancha: int, fecha, h_ini, h_fin, precio_total, ttl_min: int,
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Inserta la reserva como 'pendiente' con vencimiento.
+
+    Antes libera en la misma transacción las retenciones vencidas que pisan el rango, para no
+    depender del próximo barrido. Devuelve (reserva, retenciones liberadas).
+    """
+    inicio, fin = rango(fecha, h_ini, h_fin)
+    if fin <= inicio:
+        raise ValueError("hora_fin debe ser > hora_inicio")
+    params = {
+        "id_cancha": id_cancha, "id_usuario": id_usuario,
+        "inicio": inicio, "fin": fin, "precio_total": precio_total, "ttl": ttl_min,
+    }
+    try:
+        lock_cancha(db, id_cancha)
+        asegurar_particiones(db, [inicio])
+        liberadas = db.execute(text(_EXPIRAR.format(recientes=_recientes(db), recientes_r=_recientes(db, "r.inicio"), filtro="""
+             AND id_cancha = :id_cancha
+             AND tstzrange(inicio, fin, '[)') && tstzrange(:inicio, :fin, '[)')
+        """)), {**params, "lote": 50}).mappings().all()
+        choque = conflictos(db, id_cancha=id_cancha, rangos=[(inicio, fin)])
+        if choque:
+            db.rollback()
+            raise SolapamientoError(choque[0], origen="precheck")
+        row = db.execute(text(
+            """
+            INSERT INTO reservas (id_cancha, id_usuario, inicio, fin, estado, precio_total, expira_at)
+            VALUES (:id_cancha, :id_usuario, :inicio, :fin, 'pendiente', :precio_total,
+                    now() + make_interval(mins => :ttl))
+            """ + _RETURNING
+        ), params).mappings().one()
+        db.commit()
+    except SolapamientoError:
+        raise
+    except Exception as e:
+        db.rollback()
+        if _es_solapamiento(e):
+            raise SolapamientoError()
+        raise
+    return dict(row), [dict(r) for r in liberadas]
+
+def confirmar_retencion(db: Session, *, id_usuario: int, id_reserva: int) -> Dict[str, Any] | None:
+    row = db.execute(text(
+        f"""
+        UPDATE reservas
+           SET estado = 'confirmada', expira_at = NULL, updated_at = now()
+         WHERE id_reserva = :rid AND id_usuario = :uid
+           AND estado = 'pendiente' AND (expira_at IS NULL OR expira_at > now())
+           {_recientes(db)}
+        """ + _RETURNING
+    ), {"rid": id_reserva, "uid": id_usuario}).mappings().one_or_none()
+    if row is None:
+        db.rollback()
+        return None
+    db.commit()
+    return dict(row)
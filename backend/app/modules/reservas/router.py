@@ -1,20 +1,55 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from app.shared.deps import get_db, require_roles
 from app.modules.auth.model import Usuario
-from app.modules.reservas.schemas import ReservaCreateIn, ReservaOut
+from app.modules.reservas.schemas import ReservaCreateIn, ReservaOut, RetencionOut, ReservaRecurrenteIn, ReservaRecurrenteOut
+from app.modules.reservas.repository import SolapamientoError
 from app.modules.reservas.service import Service
 
 router = APIRouter(prefix="/reservas", tags=["reservas"])
 
-@router.get("/mias", response_model=list[ReservaOut])
+def _conflicto(e: SolapamientoError) -> HTTPException:
+    return HTTPException(status_code=409, detail={
+        "code": "OVERLAP",
+        "message": "La cancha ya está reservada en ese horario",
+        "motivo": e.motivo,
+        "alternativas": jsonable_encoder(e.alternativas),
+    })
+
+@router.get(
+    "/mias",
+    response_model=list[ReservaOut],
+    summary="Mis reservas",
+    description=(
+        "Reservas del usuario autenticado, paginadas por cursor. `scope=upcoming`: las que aún no "
+        "comienzan, la más próxima primero; `scope=past`: las ya comenzadas, más recientes primero "
+        "(sin `scope`: todas, más recientes primero). Si hay más, el header `X-Next-Cursor` trae el "
+        "`cursor` para la página siguiente."
+    ),
+)
 def mis_reservas(
+    response: Response,
+    scope: str | None = Query(None, pattern="^(upcoming|past)$"),
+    cursor: str | None = Query(None, description="Valor de X-Next-Cursor de la página anterior"),
+    limit: int = Query(200, ge=1, le=200),
     user: Usuario = Depends(require_roles("usuario", "dueno", "admin", "superadmin")),
     db: Session = Depends(get_db)
 ):
-    return Service.mias(db, user_id=user.id_usuario)
+    try:
+        rows, siguiente = Service.mias(db, user_id=user.id_usuario, scope=scope, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if siguiente:
+        response.headers["X-Next-Cursor"] = siguiente
+    return rows
 
-@router.post("", response_model=ReservaOut, status_code=201)
+@router.post(
+    "",
+    response_model=ReservaOut,
+    status_code=201,
+    responses={409: {"description": "Horario ocupado; `detail.alternativas` trae los horarios libres más cercanos"}},
+)
 def crear_reserva(
     body: ReservaCreateIn,
     user: Usuario = Depends(require_roles("usuario", "dueno", "admin", "superadmin")),
@@ -22,10 +57,71 @@ def crear_reserva(
 ):
     try:
         return Service.crear(db, user_id=user.id_usuario, data=body)
-    except RuntimeError as e:
-        if str(e) == "OVERLAP":
-            raise HTTPException(status_code=409, detail="La cancha ya está reservada en ese horario")
-        raise
+    except SolapamientoError as e:
+        raise _conflicto(e)
+
+@router.post(
+    "/retenciones",
+    response_model=RetencionOut,
+    status_code=201,
+    summary="Retener un horario",
+    description=(
+        "Bloquea el horario como reserva **pendiente** durante unos minutos (`expira_at`) mientras "
+        "se completa el pago. Confirmar con `POST /reservas/{id}/confirmar`; si vence, se libera sola."
+    ),
+)
+def retener_horario(
+    body: ReservaCreateIn,
+    user: Usuario = Depends(require_roles("usuario", "dueno", "admin", "superadmin")),
+    db: Session = Depends(get_db)
+):
+    try:
+        return Service.retener(db, user_id=user.id_usuario, data=body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except SolapamientoError as e:
+        raise _conflicto(e)
+
+@router.post("/{id_reserva}/confirmar", response_model=ReservaOut)
+def confirmar_reserva(
+    id_reserva: int,
+    user: Usuario = Depends(require_roles("usuario", "dueno", "admin", "superadmin")),
+    db: Session = Depends(get_db)
+):
+    r = Service.confirmar(db, user_id=user.id_usuario, reserva_id=id_reserva)
+    if not r:
+        raise HTTPException(status_code=409, detail="La retención no existe, ya venció o ya fue confirmada")
+    return r
+
+@router.post(
+    "/recurrentes",
+    response_model=ReservaRecurrenteOut,
+    status_code=201,
+    summary="Reserva recurrente",
+    description=(
+        "Reserva la misma cancha y horario cada `intervalo` semanas (`semanal`) o días (`diaria`), "
+        "hasta una fecha (`hasta`) o un número de `repeticiones`, en **una sola transacción**. "
+        "`todo_o_nada` responde 409 con la lista de `conflictos` si alguna ocurrencia choca; "
+        "`omitir_conflictos` crea las libres y devuelve las omitidas en `conflictos`."
+    ),
+)
+def crear_reserva_recurrente(
+    body: ReservaRecurrenteIn,
+    user: Usuario = Depends(require_roles("usuario", "dueno", "admin", "superadmin")),
+    db: Session = Depends(get_db)
+):
+    try:
+        out = Service.crear_recurrente(db, user_id=user.id_usuario, data=body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except SolapamientoError:
+        raise HTTPException(status_code=409, detail="Otra reserva tomó uno de los horarios; intenta nuevamente")
+    if out["conflictos"] and not out["creadas"]:
+        raise HTTPException(status_code=409, detail={
+            "message": "Hay ocurrencias que chocan con reservas o bloqueos existentes",
+            "conflictos": jsonable_encoder(out["conflictos"]),
+        })
+    return out
 
 @router.post("/{id_reserva}/cancelar", response_model=ReservaOut)
 def cancelar_reserva(
@@ -1,5 +1,6 @@
 from __future__ import annotations
-from datetime import date, time
+from datetime import date, datetime, time
+from typing import Literal
 from pydantic import BaseModel, Field
 
 class ReservaCreateIn(BaseModel):
@@ -15,5 +16,30 @@ class ReservaOut(BaseModel):
     fecha_reserva: date
     hora_inicio: str  # "HH:MM"
     hora_fin: str     # "HH:MM"
-    estado: str       # "pending" | "confirmed" | "cancelled"
-    monto_total: float | None = None
\ No newline at end of file
+    estado: str       # "pending" | "confirmed" | "cancelled" | "expired"
+    monto_total: float | None = None
+
+class RetencionOut(ReservaOut):
+    expira_at: datetime
+
+class ReservaRecurrenteIn(BaseModel):
+    id_cancha: int = Field(..., gt=0)
+    fecha_inicio: date
+    hora_inicio: time
+    hora_fin: time
+    frecuencia: Literal["semanal", "diaria"] = "semanal"
+    intervalo: int = Field(1, ge=1, le=52, description="Cada cuántas semanas/días se repite")
+    # Envía uno de los dos
+    hasta: date | None = Field(None, description="Última fecha posible (inclusive)")
+    repeticiones: int | None = Field(None, ge=1, description="Cantidad de ocurrencias")
+    modo: Literal["todo_o_nada", "omitir_conflictos"] = "todo_o_nada"
+
+class ConflictoOut(BaseModel):
+    fecha_reserva: date
+    hora_inicio: str  # "HH:MM"
+    hora_fin: str     # "HH:MM"
+    motivo: str       # "reserva" | "bloqueo"
+
+class ReservaRecurrenteOut(BaseModel):
+    creadas: list[ReservaOut]
+    conflictos: list[ConflictoOut]
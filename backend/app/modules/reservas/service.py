@@ -1,24 +1,183 @@
 from __future__ import annotations
+from datetime import date, datetime, timedelta
+from typing import List, Optional
 from sqlalchemy.orm import Session
-from app.modules.reservas.schemas import ReservaCreateIn
+from app.modules.reservas.schemas import ReservaCreateIn, ReservaRecurrenteIn
+from app.core import metrics
+from app.core.config import settings
 from app.modules.reservas import repository as repo
+from app.modules.reservas.sweeper import publicar_liberadas
+from app.modules.pricing import service as pricing
+from app.modules.disponibilidad import repository as disponibilidad_repo
+from app.shared import auditoria
+from app.shared.utils.pagination import decode_cursor, encode_cursor
+
+RESERVAS_INTENTOS = metrics.counter(
+    "reservas_intentos_total", "Intentos de reserva por tipo", ("tipo",))
+RESERVAS_CONFLICTOS = metrics.counter(
+    "reservas_conflictos_total", "Intentos rechazados por horario ocupado", ("tipo", "origen"))
+
+def _con_alternativas(db: Session, e: repo.SolapamientoError, data: ReservaCreateIn) -> repo.SolapamientoError:
+    e.alternativas = [
+        {"fecha_reserva": data.fecha_reserva, "hora_inicio": a, "hora_fin": b}
+        for a, b in disponibilidad_repo.alternativas(
+            db, id_cancha=data.id_cancha, fecha=data.fecha_reserva, h_ini=data.hora_inicio, h_fin=data.hora_fin,
+        )
+    ]
+    return e
+
+# tope de ocurrencias por solicitud (un semestre semanal cabe holgado)
+MAX_OCURRENCIAS = 120
+
+def fechas_recurrencia(data: ReservaRecurrenteIn) -> List[date]:
+    if (data.hasta is None) == (data.repeticiones is None):
+        raise ValueError("Debe enviar 'hasta' o 'repeticiones' (solo uno)")
+    if data.hasta is not None and data.hasta < data.fecha_inicio:
+        raise ValueError("'hasta' debe ser >= fecha_inicio")
+    paso = timedelta(days=data.intervalo * (7 if data.frecuencia == "semanal" else 1))
+    fechas: List[date] = []
+    f = data.fecha_inicio
+    while (data.repeticiones is None or len(fechas) < data.repeticiones) and (data.hasta is None or f <= data.hasta):
+        if len(fechas) == MAX_OCURRENCIAS:
+            raise ValueError(f"La recurrencia supera el máximo de {MAX_OCURRENCIAS} ocurrencias")
+        fechas.append(f)
+        f += paso
+    return fechas
 
 class Service:
     @staticmethod
     def crear(db: Session, *, user_id: int, data: ReservaCreateIn):
-        return repo.create_reserva(
+        precio = pricing.precio_total(
             db,
-            id_usuario=user_id,
             id_cancha=data.id_cancha,
             fecha=data.fecha_reserva,
             h_ini=data.hora_inicio,
             h_fin=data.hora_fin,
         )
+        RESERVAS_INTENTOS.inc(tipo="simple")
+        try:
+            row = repo.create_reserva(
+                db,
+                id_usuario=user_id,
+                id_cancha=data.id_cancha,
+                fecha=data.fecha_reserva,
+                h_ini=data.hora_inicio,
+                h_fin=data.hora_fin,
+                precio_total=precio,
+            )
+        except repo.SolapamientoError as e:
+            RESERVAS_CONFLICTOS.inc(tipo="simple", origen=e.origen)
+            raise _con_alternativas(db, e, data)
+        auditoria.registrar("crear_reserva", actor_id=user_id, objeto_tipo="reserva",
+                            id_objeto=row["id_reserva"], snapshot=row)
+        return row
 
     @staticmethod
-    def mias(db: Session, *, user_id: int):
-        return repo.list_mis_reservas(db, id_usuario=user_id)
+    def mias(db: Session, *, user_id: int, scope: Optional[str] = None, cursor: Optional[str] = None, limit: int = 200):
+        """(página, cursor de la siguiente o None). ValueError si el cursor no es válido."""
+        despues_de = None
+        if cursor:
+            ini, id_reserva = decode_cursor(cursor, 2)
+            if not isinstance(id_reserva, int):
+                raise ValueError("Cursor inválido")
+            try:
+                despues_de = (datetime.fromisoformat(str(ini)), id_reserva)
+            except ValueError:
+                raise ValueError("Cursor inválido")
+        rows = repo.list_mis_reservas(db, id_usuario=user_id, scope=scope, despues_de=despues_de, limit=limit + 1)
+        siguiente = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            siguiente = encode_cursor([rows[-1]["inicio"].isoformat(), rows[-1]["id_reserva"]])
+        return rows, siguiente
 
     @staticmethod
     def cancelar(db: Session, *, user_id: int, reserva_id: int):
-        return repo.cancelar_reserva(db, id_usuario=user_id, id_reserva=reserva_id)
\ No newline at end of file
+        r = repo.cancelar_reserva(db, id_usuario=user_id, id_reserva=reserva_id)
+        if r:
+            auditoria.registrar("cancelar_reserva", actor_id=user_id, objeto_tipo="reserva",
+                                id_objeto=r["id_reserva"], snapshot=r)
+            publicar_liberadas([{"id_reserva": r["id_reserva"], "id_cancha": r["id_cancha"], "id_usuario": user_id}], "cancelada")
+        return r
+
+    @staticmethod
+    def retener(db: Session, *, user_id: int, data: ReservaCreateIn):
+        precio = pricing.precio_total(
+            db,
+            id_cancha=data.id_cancha,
+            fecha=data.fecha_reserva,
+            h_ini=data.hora_inicio,
+            h_fin=data.hora_fin,
+        )
+        RESERVAS_INTENTOS.inc(tipo="retencion")
+        try:
+            row, liberadas = repo.create_retencion(
+                db,
+                id_usuario=user_id,
+                id_cancha=data.id_cancha,
+                fecha=data.fecha_reserva,
+                h_ini=data.hora_inicio,
+                h_fin=data.hora_fin,
+                precio_total=precio,
+                ttl_min=settings.HOLD_TTL_MINUTES,
+            )
+        except repo.SolapamientoError as e:
+            RESERVAS_CONFLICTOS.inc(tipo="retencion", origen=e.origen)
+            raise _con_alternativas(db, e, data)
+        auditoria.registrar("crear_retencion", actor_id=user_id, objeto_tipo="reserva",
+                            id_objeto=row["id_reserva"], snapshot=row)
+        publicar_liberadas(liberadas, "expirada")
+        return row
+
+    @staticmethod
+    def confirmar(db: Session, *, user_id: int, reserva_id: int):
+        r = repo.confirmar_retencion(db, id_usuario=user_id, id_reserva=reserva_id)
+        if r:
+            auditoria.registrar("confirmar_reserva", actor_id=user_id, objeto_tipo="reserva",
+                                id_objeto=r["id_reserva"], snapshot=r)
+        return r
+
+    @staticmethod
+    def crear_recurrente(db: Session, *, user_id: int, data: ReservaRecurrenteIn):
+        """Devuelve {creadas, conflictos}. En modo todo_o_nada no inserta nada si hay conflictos."""
+        if data.hora_fin <= data.hora_inicio:
+            raise ValueError("hora_fin debe ser > hora_inicio")
+        fechas = fechas_recurrencia(data)
+        rangos = [repo.rango(f, data.hora_inicio, data.hora_fin) for f in fechas]
+
+        RESERVAS_INTENTOS.inc(tipo="recurrente")
+        # lock por cancha desde el chequeo hasta el commit del INSERT
+        repo.lock_cancha(db, data.id_cancha)
+        choques = repo.conflictos(db, id_cancha=data.id_cancha, rangos=rangos)
+        conflictos = [
+            {
+                "fecha_reserva": fechas[i],
+                "hora_inicio": data.hora_inicio.strftime("%H:%M"),
+                "hora_fin": data.hora_fin.strftime("%H:%M"),
+                "motivo": motivo,
+            }
+            for i, motivo in sorted(choques.items())
+        ]
+        if conflictos:
+            RESERVAS_CONFLICTOS.inc(tipo="recurrente", origen="precheck")
+        if conflictos and data.modo == "todo_o_nada":
+            db.rollback()
+            return {"creadas": [], "conflictos": conflictos}
+
+        filas = [
+            (ini, fin, pricing.precio_total(db, id_cancha=data.id_cancha, fecha=fechas[i], h_ini=data.hora_inicio, h_fin=data.hora_fin))
+            for i, (ini, fin) in enumerate(rangos)
+            if i not in choques
+        ]
+        if not filas:
+            db.rollback()
+            return {"creadas": [], "conflictos": conflictos}
+        try:
+            creadas = repo.create_reservas_lote(db, id_usuario=user_id, id_cancha=data.id_cancha, filas=filas)
+        except repo.SolapamientoError as e:
+            RESERVAS_CONFLICTOS.inc(tipo="recurrente", origen=e.origen)
+            raise
+        for r in creadas:
+            auditoria.registrar("crear_reserva", actor_id=user_id, objeto_tipo="reserva",
+                                id_objeto=r["id_reserva"], snapshot={**r, "recurrente": True})
+        return {"creadas": creadas, "conflictos": conflictos}
\ No newline at end of file
@@ -0,0 +1,65 @@
+# app/modules/reservas/sweeper.py
+"""Barrido en segundo plano de retenciones vencidas.
+
+Cada pasada expira como máximo HOLD_SWEEP_BATCH filas con un solo UPDATE ... RETURNING
+(FOR UPDATE SKIP LOCKED: varias instancias pueden barrer a la vez sin pisarse) y publica
+`reserva.horario_liberado` por cada horario que vuelve a estar disponible.
+"""
+from __future__ import annotations
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.modules.reservas import repository as repo
+from app.shared import events
+
+log = logging.getLogger(__name__)
+
+TOPIC_HORARIO_LIBERADO = "reserva.horario_liberado"
+
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+def publicar_liberadas(filas: List[Dict[str, Any]], motivo: str) -> None:
+    for f in filas:
+        events.publish(TOPIC_HORARIO_LIBERADO, {**f, "motivo": motivo})
+
+def barrer_una_vez() -> int:
+    """Expira retenciones hasta vaciar el atraso; devuelve cuántas expiró."""
+    total = 0
+    while not _stop.is_set():
+        db = SessionLocal()
+        try:
+            filas = repo.expirar_retenciones(db, lote=settings.HOLD_SWEEP_BATCH)
+        finally:
+            db.close()
+        publicar_liberadas(filas, "expirada")
+        total += len(filas)
+        if len(filas) < settings.HOLD_SWEEP_BATCH:
+            break
+    return total
+
+def _loop() -> None:
+    while not _stop.is_set():
+        try:
+            n = barrer_una_vez()
+            if n:
+                log.info("Retenciones expiradas: %s", n)
+        except Exception:
+            log.exception("Falló el barrido de retenciones")
+        _stop.wait(settings.HOLD_SWEEP_INTERVAL_S)
+
+def start() -> None:
+    global _thread
+    if _thread and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_loop, name="reservas-sweeper", daemon=True)
+    _thread.start()
+
+def stop(timeout: float = 5.0) -> None:
+    _stop.set()
+    if _thread:
+        _thread.join(timeout)
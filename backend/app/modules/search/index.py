@@ -0,0 +1,196 @@
+# app/modules/search/index.py
+"""Índice de prefijos en memoria para sugerencias (typeahead).
+
+Arreglo ordenado de claves normalizadas (minúsculas, sin acentos) + bisect. Cada nombre se
+indexa desde cada palabra ("Complejo Ñielol" responde a "com" y a "nie"). Se construye una vez
+desde la BD y luego se mantiene con los eventos de escritura de complejos y canchas; consultar
+nunca toca Postgres. Para ver lo escrito fuera del proceso, cada COMPLEJOS_CACHE_REVALIDAR_S un
+hilo compara la versión en BD y, si cambió, reconstruye el índice completo.
+"""
+from __future__ import annotations
+import logging
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.modules.canchas.service import TOPIC_CANCHA_CAMBIADA
+from app.modules.complejos.service import TOPIC_COMPLEJO_CAMBIADO
+from app.modules.search import repository as repo
+from app.shared import events
+from app.shared.revalidacion import Revalidacion
+
+log = logging.getLogger(__name__)
+
+# a igual coincidencia, primero lo que más acota la búsqueda
+_PESO = {"comuna": 0, "deporte": 1, "complejo": 2, "cancha": 3}
+# tope de claves revisadas por consulta: acota prefijos muy cortos ("a")
+_MAX_ESCANEO = 400
+
+Clave = Tuple[str, str, int]  # (texto normalizado, tipo, id)
+
+def normalizar(texto: str) -> str:
+    sin_acentos = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode()
+    return " ".join(sin_acentos.lower().split())
+
+def _claves(nombre: str) -> List[str]:
+    palabras = normalizar(nombre).split(" ")
+    return [" ".join(palabras[i:]) for i in range(len(palabras)) if palabras[i]]
+
+class IndicePrefijos:
+    def __init__(self) -> None:
+        self._claves: List[Clave] = []
+        self._items: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        self._nombres: Dict[Tuple[str, int], str] = {}  # nombre normalizado completo
+        self._lock = threading.Lock()
+        self.listo = False
+
+    def cargar(self, items: List[Dict[str, Any]]) -> None:
+        claves: List[Clave] = []
+        por_id: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        nombres: Dict[Tuple[str, int], str] = {}
+        for it in items:
+            llave = (it["tipo"], it["id"])
+            por_id[llave] = it
+            nombres[llave] = normalizar(it["nombre"])
+            claves.extend((k, *llave) for k in _claves(it["nombre"]))
+        claves.sort()
+        with self._lock:
+            self._claves, self._items, self._nombres = claves, por_id, nombres
+            self.listo = True
+
+    def upsert(self, item: Dict[str, Any]) -> None:
+        with self._lock:
+            self._quitar((item["tipo"], item["id"]))
+            self._items[(item["tipo"], item["id"])] = item
+            self._nombres[(item["tipo"], item["id"])] = normalizar(item["nombre"])
+            for k in _claves(item["nombre"]):
+                insort(self._claves, (k, item["tipo"], item["id"]))
+
+    def quitar(self, tipo: str, id_: int) -> None:
+        with self._lock:
+            self._quitar((tipo, id_))
+
+    def quitar_canchas_de(self, id_complejo: int) -> None:
+        with self._lock:
+            for llave in [l for l, it in self._items.items() if l[0] == "cancha" and it.get("id_complejo") == id_complejo]:
+                self._quitar(llave)
+
+    def get(self, tipo: str, id_: int) -> Optional[Dict[str, Any]]:
+        return self._items.get((tipo, id_))
+
+    def _quitar(self, llave: Tuple[str, int]) -> None:
+        previo = self._items.pop(llave, None)
+        self._nombres.pop(llave, None)
+        if previo is None:
+            return
+        for k in _claves(previo["nombre"]):
+            i = bisect_left(self._claves, (k, *llave))
+            if i < len(self._claves) and self._claves[i] == (k, *llave):
+                del self._claves[i]
+
+    def sugerir(self, q: str, k: int = 8, tipos: Optional[set[str]] = None) -> List[Dict[str, Any]]:
+        pref = normalizar(q)
+        if not pref:
+            return []
+        vistos: Dict[Tuple[str, int], Tuple[int, int, int]] = {}
+        with self._lock:
+            i = bisect_left(self._claves, (pref,))
+            fin = min(len(self._claves), i + _MAX_ESCANEO)
+            while i < fin:
+                clave, tipo, id_ = self._claves[i]
+                if not clave.startswith(pref):
+                    break
+                if tipos is None or tipo in tipos:
+                    # coincidencia desde el inicio del nombre > desde una palabra interna
+                    orden = (0 if self._nombres[(tipo, id_)] == clave else 1, _PESO[tipo], len(clave))
+                    if (tipo, id_) not in vistos or orden < vistos[(tipo, id_)]:
+                        vistos[(tipo, id_)] = orden
+                i += 1
+            mejores = sorted(vistos.items(), key=lambda kv: kv[1])[:k]
+            return [dict(self._items[llave]) for llave, _ in mejores]
+
+indice = IndicePrefijos()
+_revalidacion = Revalidacion(lambda: settings.COMPLEJOS_CACHE_REVALIDAR_S)
+_CONSTRUYENDO = threading.Lock()
+
+def _item(tipo: str, r: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "tipo": tipo,
+        "id": int(r["id"]),
+        "nombre": r["nombre"],
+        "contexto": r.get("contexto"),
+        "id_complejo": r.get("id_complejo"),
+    }
+
+def construir() -> int:
+    db = SessionLocal()
+    try:
+        version = repo.version(db)
+        items = (
+            [_item("complejo", r) for r in repo.list_complejos(db)]
+            + [_item("cancha", r) for r in repo.list_canchas(db)]
+            + [_item("deporte", r) for r in repo.list_deportes(db)]
+            + [_item("comuna", r) for r in repo.list_comunas(db)]
+        )
+    finally:
+        db.close()
+    indice.cargar(items)
+    _revalidacion.cambio(version)
+    return len(items)
+
+def construir_en_segundo_plano() -> None:
+    def _run() -> None:
+        try:
+            n = construir()
+            log.info("Índice de sugerencias listo: %s entradas", n)
+        except Exception:
+            log.exception("No se pudo construir el índice de sugerencias")
+    threading.Thread(target=_run, name="search-index", daemon=True).start()
+
+def revalidar_en_segundo_plano() -> None:
+    """Si toca, compara la versión en BD en un hilo y reconstruye si cambió; quien llama no espera."""
+    if not indice.listo or not _revalidacion.toca():
+        return
+    def _run() -> None:
+        if not _CONSTRUYENDO.acquire(blocking=False):
+            return
+        try:
+            db = SessionLocal()
+            try:
+                v = repo.version(db)
+            finally:
+                db.close()
+            if _revalidacion.cambio(v):
+                n = construir()
+                log.info("Índice de sugerencias reconstruido: %s entradas", n)
+        except Exception:
+            _revalidacion.cambio(None)  # reintentar la reconstrucción en la próxima revisión
+            log.exception("No se pudo revalidar el índice de sugerencias")
+        finally:
+            _CONSTRUYENDO.release()
+    threading.Thread(target=_run, name="search-index-revalidar", daemon=True).start()
+
+# ---- mantenimiento incremental ----
+def _on_complejo(p: Dict[str, Any]) -> None:
+    if p.get("activo", True):
+        indice.upsert(_item("complejo", {"id": p["id_complejo"], "nombre": p["nombre"], "contexto": p.get("comuna")}))
+    else:
+        indice.quitar("complejo", int(p["id_complejo"]))
+        indice.quitar_canchas_de(int(p["id_complejo"]))
+
+def _on_cancha(p: Dict[str, Any]) -> None:
+    if p.get("activo", True):
+        previo = indice.get("cancha", int(p["id_cancha"])) or {}
+        indice.upsert(_item("cancha", {
+            "id": p["id_cancha"], "nombre": p["nombre"],
+            "contexto": p.get("complejo") or previo.get("contexto"),
+            "id_complejo": p.get("id_complejo"),
+        }))
+    else:
+        indice.quitar("cancha", int(p["id_cancha"]))
+
+events.subscribe(TOPIC_COMPLEJO_CAMBIADO, _on_complejo)
+events.subscribe(TOPIC_CANCHA_CAMBIADA, _on_cancha)
@@ -0,0 +1,41 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.modules.catalogos import repository as catalogos_repo
+
+# Cargas completas para construir el índice de sugerencias (solo al iniciar)
+def list_complejos(db: Session) -> List[Dict[str, Any]]:
+    rows = db.execute(text("""
+        SELECT c.id_complejo AS id, c.nombre, co.nombre AS contexto
+        FROM complejos c
+        LEFT JOIN comunas co ON co.id_comuna = c.id_comuna
+        WHERE c.activo = TRUE AND c.deleted_at IS NULL
+    """)).mappings().all()
+    return [dict(r) for r in rows]
+
+def list_canchas(db: Session) -> List[Dict[str, Any]]:
+    rows = db.execute(text("""
+        SELECT ch.id_cancha AS id, ch.nombre, c.nombre AS contexto, ch.id_complejo
+        FROM canchas ch
+        JOIN complejos c ON c.id_complejo = ch.id_complejo
+        WHERE ch.activo = TRUE AND ch.deleted_at IS NULL AND c.activo = TRUE
+    """)).mappings().all()
+    return [dict(r) for r in rows]
+
+def list_deportes(db: Session) -> List[Dict[str, Any]]:
+    rows = db.execute(text("SELECT id_deporte AS id, nombre FROM deportes")).mappings().all()
+    return [dict(r) for r in rows]
+
+def list_comunas(db: Session) -> List[Dict[str, Any]]:
+    rows = db.execute(text("SELECT id_comuna AS id, nombre FROM comunas")).mappings().all()
+    return [dict(r) for r in rows]
+
+def version(db: Session) -> Tuple[Any, ...]:
+    """Versión barata de lo indexado: conteo + max(updated_at) de complejos y canchas y la de catálogos."""
+    row = db.execute(text("""
+        SELECT (SELECT count(*) FROM complejos), (SELECT max(updated_at) FROM complejos),
+               (SELECT count(*) FROM canchas),   (SELECT max(updated_at) FROM canchas)
+    """)).one()
+    return (*row, catalogos_repo.get_version(db))
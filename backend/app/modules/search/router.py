@@ -0,0 +1,26 @@
+from __future__ import annotations
+from typing import List, Optional
+from fastapi import APIRouter, Query
+
+from app.modules.search.index import indice, revalidar_en_segundo_plano
+from app.modules.search.schemas import SugerenciasOut, TipoSugerencia
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+@router.get(
+    "/sugerencias",
+    response_model=SugerenciasOut,
+    summary="Sugerencias (autocompletar)",
+    description=(
+        "Sugerencias por prefijo sobre complejos, canchas, deportes y comunas. Ignora mayúsculas y "
+        "acentos y reconoce cualquier palabra del nombre. Se responde desde un índice en memoria "
+        "(sin consultar la BD), apto para llamarse en cada tecla."
+    ),
+)
+def sugerencias_endpoint(
+    q: str = Query(..., min_length=1, max_length=80),
+    k: int = Query(8, ge=1, le=20),
+    tipos: Optional[List[TipoSugerencia]] = Query(None, description="Filtra por tipo de entidad"),
+):
+    revalidar_en_segundo_plano()
+    return SugerenciasOut(q=q, items=indice.sugerir(q, k=k, tipos=set(tipos) if tipos else None))
@@ -0,0 +1,16 @@
+from __future__ import annotations
+from typing import List, Literal, Optional
+from pydantic import BaseModel
+
+TipoSugerencia = Literal["complejo", "cancha", "deporte", "comuna"]
+
+class SugerenciaOut(BaseModel):
+    tipo: TipoSugerencia
+    id: int
+    nombre: str
+    contexto: Optional[str] = None      # comuna del complejo / complejo de la cancha
+    id_complejo: Optional[int] = None   # solo canchas
+
+class SugerenciasOut(BaseModel):
+    q: str
+    items: List[SugerenciaOut]
@@ -1,5 +1,6 @@
-from typing import List, Tuple, Optional
-from sqlalchemy import select, func, asc, desc
+import json
+from typing import Any, List, Tuple, Optional
+from sqlalchemy import select, func, asc, desc, literal_column, tuple_
 from sqlalchemy.orm import Session
 
 from app.modules.auth.model import Usuario  # reutilizamos el modelo
@@ -8,6 +9,30 @@ def get_by_id(db: Session, user_id: int) -> Usuario | None:
     stmt = select(Usuario).where(Usuario.id_usuario == user_id)
     return db.execute(stmt).scalar_one_or_none()
 
+def _orden(order_by: str):
+    # clave de orden de cada order_by permitido; calza con los índices de 11_usuarios_busqueda.sql
+    colmap = {
+        "id_usuario": Usuario.id_usuario,
+        "nombre": func.coalesce(Usuario.nombre, literal_column("''")),
+        "apellido": func.coalesce(Usuario.apellido, literal_column("''")),
+        "email": Usuario.email,
+    }
+    return colmap.get(order_by, Usuario.id_usuario)
+
+def clave_cursor(user: Usuario, order_by: str) -> List[Any]:
+    """Valores de `user` para el cursor keyset de `order_by`."""
+    if order_by in ("nombre", "apellido", "email"):
+        return [getattr(user, order_by) or "", user.id_usuario]
+    return [user.id_usuario]
+
+def _estimar(db: Session, stmt) -> int:
+    # filas estimadas por el planner: sin ejecutar la consulta
+    compiled = stmt.compile(dialect=db.get_bind().dialect)
+    plan = db.connection().exec_driver_sql("EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
 def search_users(
     db: Session,
     *,
@@ -19,10 +44,17 @@ def search_users(
     order: str,
     offset: int,
     limit: int,
-) -> Tuple[List[Usuario], int]:
+    despues_de: Optional[List[Any]] = None,
+    total: str = "exacto",
+) -> Tuple[List[Usuario], Optional[int]]:
+    """Página de usuarios + total ('exacto', 'estimado' o None con 'ninguno').
+
+    Con `despues_de` (valores de clave_cursor de la última fila) pagina por keyset e ignora `offset`.
+    """
     stmt = select(Usuario)
 
     if q:
+        # lower(col) LIKE: lo sirven los índices trigram
         q_like = f"%{q.lower()}%"
         stmt = stmt.where(
             func.lower(Usuario.nombre).like(q_like) |
@@ -39,25 +71,29 @@ def search_users(
     if verificado is not None:
         stmt = stmt.where(Usuario.verificado == verificado)
 
-    # Orden
-    colmap = {
-        "id_usuario": Usuario.id_usuario,
-        "nombre": Usuario.nombre,
-        "apellido": Usuario.apellido,
-        "email": Usuario.email,
-    }
-    col = colmap.get(order_by, Usuario.id_usuario)
-    stmt = stmt.order_by(asc(col) if order == "asc" else desc(col))
+    # Total (antes del keyset: es el del filtro completo)
+    n_total: Optional[int] = None
+    if total == "exacto":
+        n_total = db.execute(select(func.count()).select_from(stmt.subquery())).scalar_one()
+    elif total == "estimado":
+        n_total = _estimar(db, stmt)
 
-    # Total
-    count_stmt = select(func.count()).select_from(stmt.subquery())
-    total = db.execute(count_stmt).scalar_one()
+    # Orden: clave + id de desempate, en la misma dirección
+    col = _orden(order_by)
+    cols = [col] if col is Usuario.id_usuario else [col, Usuario.id_usuario]
+    stmt = stmt.order_by(*[asc(c) if order == "asc" else desc(c) for c in cols])
 
     # Paginación
-    stmt = stmt.offset(offset).limit(limit)
+    if despues_de is not None:
+        clave = tuple_(*cols) if len(cols) > 1 else cols[0]
+        valor = tuple_(*despues_de) if len(cols) > 1 else despues_de[0]
+        stmt = stmt.where(clave > valor if order == "asc" else clave < valor)
+    else:
+        stmt = stmt.offset(offset)
+    stmt = stmt.limit(limit)
 
     rows = db.execute(stmt).scalars().all()
-    return rows, total
+    return rows, n_total
 
 def update_user_admin(
     db: Session,
@@ -19,7 +19,11 @@ router = APIRouter(prefix="/usuarios", tags=["usuarios"])
     "",
     response_model=UsuariosListOut,
     summary="Listar usuarios",
-    description="Lista usuarios con **filtros y paginación**. Requiere rol **admin/superadmin** o **dueño** (owner) según política.",
+    description=(
+        "Lista usuarios con **filtros y paginación**. Requiere rol **admin/superadmin** o **dueño** (owner) según política. "
+        "Para listas grandes usa `cursor` (el `next_cursor` de la respuesta anterior) en vez de `page`, "
+        "y `total=estimado` o `total=ninguno` para no contar todas las filas."
+    ),
     response_description="Listado paginado de usuarios."
 )
 def list_usuarios_endpoint(
@@ -31,12 +35,15 @@ def list_usuarios_endpoint(
     page_size: int = Query(20, ge=1, le=100),
     order_by: str = Query("id_usuario", pattern="^(id_usuario|nombre|apellido|email)$"),
     order: str = Query("asc", pattern="^(asc|desc)$"),
+    cursor: str | None = Query(None, description="next_cursor de la página anterior (paginación keyset; ignora page)"),
+    total: str = Query("exacto", pattern="^(exacto|estimado|ninguno)$", description="Cómo calcular el total"),
     db: Session = Depends(get_db),
     current: Usuario = Depends(get_current_user),
 ):
     params = UsuariosQuery(
         q=q, rol=rol, activo=activo, verificado=verificado,
-        page=page, page_size=page_size, order_by=order_by, order=order
+        page=page, page_size=page_size, order_by=order_by, order=order,
+        cursor=cursor, total=total,
     )
     return svc_list_users(db, current, params)
 
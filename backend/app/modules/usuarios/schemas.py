@@ -18,9 +18,11 @@ class UsuarioDetailOut(UsuarioBaseOut):
 
 class UsuariosListOut(BaseModel):
     items: List[UsuarioBaseOut]
-    total: int
+    total: Optional[int] = None         # None con total="ninguno"
+    total_estimado: bool = False        # True si `total` viene del planner (total="estimado")
     page: int
     page_size: int
+    next_cursor: Optional[str] = None   # para pedir la página siguiente por keyset
 
 # === Filtros de entrada (query) ===
 class UsuariosQuery(BaseModel):
@@ -32,6 +34,8 @@ class UsuariosQuery(BaseModel):
     page_size: int = Field(default=20, ge=1, le=100)
     order_by: Optional[Literal["id_usuario", "nombre", "apellido", "email"]] = "id_usuario"
     order: Optional[Literal["asc", "desc"]] = "asc"
+    cursor: Optional[str] = Field(default=None, description="next_cursor de la página anterior (ignora page)")
+    total: Literal["exacto", "estimado", "ninguno"] = "exacto"
 
 # === Actualización (admin o el propio) ===
 class UsuarioUpdateIn(BaseModel):
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Any, List, Optional
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
@@ -8,6 +8,8 @@ from app.modules.usuarios.schemas import (
     UsuariosQuery, UsuariosListOut, UsuarioBaseOut, UsuarioDetailOut, UsuarioUpdateIn
 )
 from app.modules.auth.schemas import map_role_db_to_public
+from app.shared import auditoria
+from app.shared.utils.pagination import decode_cursor, encode_cursor
 
 # Helper de permisos
 def _is_admin_or_owner(user: Usuario) -> bool:
@@ -29,11 +31,31 @@ def _to_public(user: Usuario) -> UsuarioBaseOut:
         esta_activo=getattr(user, "esta_activo", None),
     )
 
+def _leer_cursor(cursor: str, order_by: str) -> List[Any]:
+    # el cursor debe corresponder al mismo order_by: [clave, id] o [id]
+    if order_by in ("nombre", "apellido", "email"):
+        clave, id_usuario = decode_cursor(cursor, 2)
+        if not isinstance(clave, str) or not isinstance(id_usuario, int):
+            raise ValueError("Cursor inválido")
+        return [clave, id_usuario]
+    (id_usuario,) = decode_cursor(cursor, 1)
+    if not isinstance(id_usuario, int):
+        raise ValueError("Cursor inválido")
+    return [id_usuario]
+
 def list_users(db: Session, current: Usuario, q: UsuariosQuery) -> UsuariosListOut:
     if not _is_admin_or_owner(current):
         # Ajusta si tu RLS permite otra cosa; por defecto solo admin/owner
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No autorizado")
 
+    order_by = q.order_by or "id_usuario"
+    despues_de = None
+    if q.cursor:
+        try:
+            despues_de = _leer_cursor(q.cursor, order_by)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
     offset = (q.page - 1) * q.page_size
     users, total = repo.search_users(
         db,
@@ -41,16 +63,22 @@ def list_users(db: Session, current: Usuario, q: UsuariosQuery) -> UsuariosListO
         rol=q.rol,
         activo=q.activo,
         verificado=q.verificado,
-        order_by=q.order_by or "id_usuario",
+        order_by=order_by,
         order=q.order or "asc",
         offset=offset,
-        limit=q.page_size,
+        limit=q.page_size + 1,  # una de más: indica si hay página siguiente
+        despues_de=despues_de,
+        total=q.total,
     )
+    hay_mas = len(users) > q.page_size
+    users = users[:q.page_size]
     return UsuariosListOut(
         items=[_to_public(u) for u in users],
         total=total,
+        total_estimado=q.total == "estimado",
         page=q.page,
         page_size=q.page_size,
+        next_cursor=encode_cursor(repo.clave_cursor(users[-1], order_by)) if hay_mas else None,
     )
 
 def get_user(db: Session, current: Usuario, user_id: int) -> UsuarioDetailOut:
@@ -110,4 +138,6 @@ def delete_user(db: Session, current: Usuario, user_id: int) -> dict:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
 
     repo.soft_delete_user(db, user)
+    auditoria.registrar("desactivar_usuario", actor_id=current.id_usuario, objeto_tipo="usuario",
+                        id_objeto=user_id, snapshot={"email": user.email, "rol": user.rol})
     return {"detail": "Usuario desactivado."}
@@ -0,0 +1,185 @@
+# app/shared/auditoria.py
+"""Auditoría con escritura diferida (write-behind) en la tabla `auditoria`.
+
+`registrar(...)` solo encola en memoria; un hilo escribe por lotes con un único INSERT desde
+`jsonb_to_recordset` (una fila JSON por evento, un solo parámetro sin importar el tamaño del lote).
+La cola es acotada: si se llena, quien registra espera hasta AUDITORIA_ESPERA_MAX_S (backpressure)
+y, si sigue llena, el evento se descarta y se cuenta en `auditoria_descartados_total`.
+Al apagar (`stop`) se vacía la cola antes de salir.
+
+IP y user-agent se toman del request en curso (OrigenMiddleware) si no se pasan explícitos.
+X-Forwarded-For solo se usa si la conexión viene de un proxy de AUDITORIA_PROXIES_CONFIABLES.
+"""
+from __future__ import annotations
+import atexit
+import contextvars
+import json
+import logging
+import queue
+import threading
+import time as _time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.core import metrics
+from app.core.config import settings
+
+log = logging.getLogger(__name__)
+
+AUDITORIA_ENCOLADOS = metrics.counter("auditoria_encolados_total", "Eventos de auditoría encolados")
+AUDITORIA_ESCRITOS = metrics.counter("auditoria_escritos_total", "Eventos de auditoría escritos en la BD")
+AUDITORIA_DESCARTADOS = metrics.counter(
+    "auditoria_descartados_total", "Eventos de auditoría perdidos", ("motivo",))
+
+_INSERT = text("""
+    INSERT INTO auditoria (actor_id, accion, objeto_tipo, id_objeto, snapshot, ip, user_agent, created_at)
+    SELECT t.actor_id, t.accion, t.objeto_tipo, t.id_objeto, t.snapshot, t.ip, t.user_agent, t.created_at
+    FROM jsonb_to_recordset(CAST(:filas AS jsonb)) AS t(
+      actor_id bigint, accion text, objeto_tipo text, id_objeto bigint,
+      snapshot jsonb, ip text, user_agent text, created_at timestamptz
+    )
+""")
+
+# (ip, user_agent) del request en curso
+_origen: contextvars.ContextVar[Tuple[Optional[str], Optional[str]]] = contextvars.ContextVar(
+    "auditoria_origen", default=(None, None))
+
+def _ip_cliente(directa: Optional[str], reenviada: str) -> Optional[str]:
+    """IP del cliente: la de la conexión, o, detrás de un proxy confiable, la última de
+    X-Forwarded-For que no sea otro proxy confiable (lo anterior lo puede escribir el cliente)."""
+    confiables = settings.auditoria_proxies_confiables
+    if directa not in confiables:
+        return directa
+    for ip in reversed([p.strip() for p in reenviada.split(",") if p.strip()]):
+        if ip not in confiables:
+            return ip
+    return directa
+
+class OrigenMiddleware:
+    """ASGI: deja IP y user-agent del request disponibles para `registrar`."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope.get("headers", [])}
+        ip = _ip_cliente((scope.get("client") or (None,))[0], headers.get("x-forwarded-for", ""))
+        token = _origen.set((ip, headers.get("user-agent")))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _origen.reset(token)
+
+_cola: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=settings.AUDITORIA_COLA_MAX)
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+
+def registrar(
+    accion: str,
+    *,
+    actor_id: Optional[int] = None,
+    objeto_tipo: Optional[str] = None,
+    id_objeto: Optional[int] = None,
+    snapshot: Optional[Dict[str, Any]] = None,
+    ip: Optional[str] = None,
+    user_agent: Optional[str] = None,
+) -> bool:
+    """Encola un evento; False si se descartó por cola llena."""
+    _asegurar_hilo()
+    o_ip, o_ua = _origen.get()
+    ip = ip or o_ip
+    evento = {
+        "actor_id": actor_id,
+        "accion": accion,
+        "objeto_tipo": objeto_tipo,
+        "id_objeto": id_objeto,
+        "snapshot": snapshot,
+        "ip": ip[:45] if ip else None,
+        "user_agent": user_agent or o_ua,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    try:
+        _cola.put(evento, timeout=settings.AUDITORIA_ESPERA_MAX_S)
+    except queue.Full:
+        AUDITORIA_DESCARTADOS.inc(motivo="cola_llena")
+        log.warning("Cola de auditoría llena: se descarta %s", accion)
+        return False
+    AUDITORIA_ENCOLADOS.inc()
+    return True
+
+def _escribir(lote: List[Dict[str, Any]]) -> None:
+    from app.db.session import SessionLocal  # diferido: el módulo se importa antes que la BD
+    filas = json.dumps(lote, default=str)
+    for intento in (1, 2):
+        db = SessionLocal()
+        try:
+            db.execute(_INSERT, {"filas": filas})
+            db.commit()
+            AUDITORIA_ESCRITOS.inc(len(lote))
+            return
+        except Exception:
+            db.rollback()
+            if intento == 2:
+                AUDITORIA_DESCARTADOS.inc(len(lote), motivo="error_bd")
+                log.exception("No se pudo escribir un lote de auditoría (%s eventos)", len(lote))
+            else:
+                _time.sleep(0.5)
+        finally:
+            db.close()
+
+def _drenar(espera: float) -> List[Dict[str, Any]]:
+    """Espera hasta `espera` s por el primer evento y junta lo que haya hasta el tamaño de lote."""
+    lote: List[Dict[str, Any]] = []
+    try:
+        lote.append(_cola.get(timeout=espera))
+    except queue.Empty:
+        return lote
+    while len(lote) < settings.AUDITORIA_LOTE:
+        try:
+            lote.append(_cola.get_nowait())
+        except queue.Empty:
+            break
+    return lote
+
+def _loop() -> None:
+    while not _stop.is_set():
+        lote = _drenar(settings.AUDITORIA_INTERVALO_S)
+        if lote:
+            _escribir(lote)
+    vaciar()
+
+def vaciar() -> int:
+    """Escribe todo lo encolado (síncrono); devuelve cuántos eventos escribió."""
+    total = 0
+    while True:
+        lote = _drenar(0)
+        if not lote:
+            return total
+        _escribir(lote)
+        total += len(lote)
+
+def _asegurar_hilo() -> None:
+    if _thread is None or not _thread.is_alive():
+        start()
+
+def start() -> None:
+    global _thread
+    with _lock:
+        if _thread and _thread.is_alive():
+            return
+        _stop.clear()
+        _thread = threading.Thread(target=_loop, name="auditoria-writer", daemon=True)
+        _thread.start()
+
+def stop(timeout: float = 10.0) -> None:
+    _stop.set()
+    if _thread:
+        _thread.join(timeout)
+
+# CLIs y scripts sin lifespan: lo encolado también se escribe al salir
+atexit.register(stop)
@@ -0,0 +1,21 @@
+# app/shared/busqueda.py
+"""Fragmentos SQL de búsqueda de texto (columnas de 08_busqueda_texto.sql).
+
+Sin acentos, tolerante a errores de tipeo y servidos por índices GIN. Esperan el parámetro
+`:q_raw` con el texto tal cual lo escribió el usuario; `alias` es el de la tabla en el FROM.
+"""
+from __future__ import annotations
+
+def match_texto(alias: str) -> str:
+    # full-text (palabras/raíces) OR subcadena OR palabra parecida (trigramas)
+    return (
+        f"({alias}.busqueda_tsv @@ websearch_to_tsquery('es_unaccent', :q_raw)"
+        f" OR {alias}.busqueda_txt LIKE '%' || f_unaccent(lower(:q_raw)) || '%'"
+        f" OR f_unaccent(lower(:q_raw)) <% {alias}.busqueda_txt)"
+    )
+
+def relevancia_texto(alias: str) -> str:
+    return (
+        f"(ts_rank_cd({alias}.busqueda_tsv, websearch_to_tsquery('es_unaccent', :q_raw))"
+        f" + word_similarity(f_unaccent(lower(:q_raw)), {alias}.busqueda_txt))"
+    )
@@ -0,0 +1,18 @@
+# app/shared/deportes.py
+"""Fragmentos SQL del filtro por deporte sobre complejos (columna de 09_deportes_complejo.sql).
+
+Esperan el parámetro `:deporte` (nombre en minúsculas); `alias` es el de complejos en el FROM.
+"""
+from __future__ import annotations
+
+def tiene_deporte(alias: str) -> str:
+    # `&&` y no `@>`: si el nombre no existe, ARRAY() queda vacío y no calza ningún complejo
+    return f"{alias}.deportes_ids && ARRAY(SELECT id_deporte FROM deportes WHERE lower(nombre) = :deporte)"
+
+def existe_deporte(alias: str) -> str:
+    # mismo criterio para esquemas sin deportes_ids; EXISTS evita multiplicar filas
+    return f"""EXISTS (
+      SELECT 1 FROM canchas ch JOIN deportes d ON d.id_deporte = ch.id_deporte
+      WHERE ch.id_complejo = {alias}.id_complejo AND ch.activo = TRUE AND ch.deleted_at IS NULL
+        AND lower(d.nombre) = :deporte
+    )"""
@@ -0,0 +1,26 @@
+# app/shared/events.py
+"""Bus de eventos en proceso: los módulos publican hechos y otros reaccionan sin acoplarse.
+
+Los handlers corren en el hilo que publica; deben ser rápidos (invalidar caches, encolar).
+"""
+from __future__ import annotations
+import logging
+from collections import defaultdict
+from typing import Any, Callable, Dict, List
+
+log = logging.getLogger(__name__)
+
+Handler = Callable[[Dict[str, Any]], None]
+
+_SUBS: Dict[str, List[Handler]] = defaultdict(list)
+
+def subscribe(topic: str, handler: Handler) -> None:
+    if handler not in _SUBS[topic]:
+        _SUBS[topic].append(handler)
+
+def publish(topic: str, payload: Dict[str, Any]) -> None:
+    for handler in list(_SUBS.get(topic, ())):
+        try:
+            handler(payload)
+        except Exception:
+            log.exception("Handler de evento %s falló", topic)
@@ -0,0 +1,30 @@
+# app/shared/geo.py
+"""Fragmentos SQL y utilidades de cercanía compartidos por las búsquedas.
+
+Esperan los parámetros `:lat`, `:lon` y `:radio_m`. El punto se escribe en línea (no en un CTE)
+para que PostGIS pueda usar el índice GiST de `loc` tanto en ST_DWithin como en el KNN `<->`.
+"""
+from __future__ import annotations
+import math
+from typing import Dict
+
+PUNTO = "ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography"
+
+_KM_POR_GRADO = 111.32
+
+def dentro_de_radio(col_loc: str) -> str:
+    return f"ST_DWithin({col_loc}, {PUNTO}, :radio_m)"
+
+def knn(col_loc: str) -> str:
+    return f"{col_loc} <-> {PUNTO}"
+
+def bbox_params(lat: float, lon: float, km: float) -> Dict[str, float]:
+    """Caja lat/lon que contiene el círculo de radio `km` (prefiltro sin PostGIS)."""
+    dlat = km / _KM_POR_GRADO
+    dlon = km / (_KM_POR_GRADO * max(math.cos(math.radians(lat)), 1e-6))
+    return {"lat_min": lat - dlat, "lat_max": lat + dlat, "lon_min": lon - dlon, "lon_max": lon + dlon}
+
+def dentro_de_bbox(col_lat: str, col_lon: str) -> str:
+    return (
+        f"{col_lat} BETWEEN :lat_min AND :lat_max AND {col_lon} BETWEEN :lon_min AND :lon_max"
+    )
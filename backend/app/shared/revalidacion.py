@@ -0,0 +1,34 @@
+# app/shared/revalidacion.py
+"""Revalidación periódica de caches en memoria contra una versión barata leída de la BD.
+
+Los eventos del proceso mantienen los caches al instante, pero no ven lo escrito por otra
+instancia, por SQL directo o por cargas masivas (COPY). Cada `intervalo_s` se lee una versión
+(p. ej. conteo + max(updated_at)) y, si difiere de la última, el cache se recarga.
+"""
+from __future__ import annotations
+import threading
+import time
+from typing import Any, Callable
+
+class Revalidacion:
+    def __init__(self, intervalo_s: Callable[[], float]):
+        self._intervalo_s = intervalo_s
+        self._version: Any = None
+        self._revisado = 0.0  # monotonic de la última comparación
+        self._lock = threading.Lock()
+
+    def toca(self) -> bool:
+        """True si ya pasó el intervalo; la revisión queda tomada por quien llama."""
+        ahora = time.monotonic()
+        with self._lock:
+            if ahora - self._revisado < self._intervalo_s():
+                return False
+            self._revisado = ahora
+            return True
+
+    def cambio(self, version: Any) -> bool:
+        """Registra la versión leída; True si difiere de la anterior (o es la primera)."""
+        with self._lock:
+            previa, self._version = self._version, version
+            self._revisado = time.monotonic()
+        return previa is None or previa != version
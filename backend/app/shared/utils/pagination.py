@@ -1,3 +1,25 @@
+import base64
+import json
+from typing import Any, List
+
+
 def paginate(queryset, page: int, limit: int):
     offset = (page - 1) * limit
     return queryset.limit(limit).offset(offset)
+
+# Cursores opacos para paginación keyset: la lista de valores de la última fila
+# (columna de orden + id de desempate). Fechas viajan como ISO y las parsea quien decodifica.
+def encode_cursor(valores: List[Any]) -> str:
+    raw = json.dumps(valores, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, n: int) -> List[Any]:
+    """Lanza ValueError si el cursor no es válido o no trae `n` valores."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        valores = json.loads(raw)
+    except Exception as e:
+        raise ValueError("Cursor inválido") from e
+    if not isinstance(valores, list) or len(valores) != n:
+        raise ValueError("Cursor inválido")
+    return valores
@@ -0,0 +1,159 @@
+# benchmarks/__main__.py
+"""Benchmarks de los caminos calientes contra un Postgres+PostGIS local.
+
+Uso (desde backend/, con DATABASE_URL apuntando a una BD de desarrollo con el esquema cargado):
+  python -m benchmarks --escala 4 --iteraciones 300
+  python -m benchmarks --escala 4 --guardar-base benchmarks/base.json
+  python -m benchmarks --escala 4 --base benchmarks/base.json --umbral 0.2   # exit 1 si hay regresión
+  python -m benchmarks --casos search_complejos --hilos 8                    # filtra por prefijo
+
+Por caso: latencia p50/p95/p99, consultas SQL por iteración y throughput (iteraciones/s con
+`--hilos` workers). Es regresión si el p95 empeora más que `--umbral` respecto de la base o si
+sube la cantidad de consultas por iteración.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+from app.core.config import settings
+from app.db import instrumentacion
+from app.db.session import SessionLocal
+from benchmarks import casos as casos_mod, datos
+
+def _iteracion(caso, i: int, ctx) -> Tuple[float, int, bool]:
+    db = SessionLocal()
+    with instrumentacion.medir() as m:
+        t0 = time.perf_counter()
+        try:
+            caso(db, i, ctx)
+            ok = True
+        except Exception:
+            db.rollback()
+            ok = False
+        finally:
+            dt = time.perf_counter() - t0
+            db.close()
+    return dt, m.n, ok
+
+def _percentil(ordenados: List[float], p: float) -> float:
+    k = (len(ordenados) - 1) * p
+    a = int(k)
+    b = min(a + 1, len(ordenados) - 1)
+    return ordenados[a] + (ordenados[b] - ordenados[a]) * (k - a)
+
+def medir(caso, ctx, *, iteraciones: int, calentamiento: int, hilos: int) -> Dict[str, Any]:
+    for i in range(calentamiento):
+        _iteracion(caso, i, ctx)
+    base = calentamiento
+    t0 = time.perf_counter()
+    if hilos <= 1:
+        resultados = [_iteracion(caso, base + i, ctx) for i in range(iteraciones)]
+    else:
+        with ThreadPoolExecutor(max_workers=hilos) as ex:
+            resultados = list(ex.map(lambda i: _iteracion(caso, base + i, ctx), range(iteraciones)))
+    total = time.perf_counter() - t0
+
+    lat = sorted(r[0] * 1000 for r in resultados)
+    return {
+        "p50_ms": round(_percentil(lat, 0.50), 3),
+        "p95_ms": round(_percentil(lat, 0.95), 3),
+        "p99_ms": round(_percentil(lat, 0.99), 3),
+        "media_ms": round(statistics.fmean(lat), 3),
+        "consultas_por_iter": round(statistics.fmean(r[1] for r in resultados), 2),
+        "iter_por_s": round(iteraciones / total, 1),
+        "errores": sum(1 for r in resultados if not r[2]),
+    }
+
+def comparar(actual: Dict[str, Any], base: Dict[str, Any], umbral: float) -> List[str]:
+    regresiones: List[str] = []
+    for nombre, r in actual["casos"].items():
+        b = base.get("casos", {}).get(nombre)
+        if b is None:
+            continue
+        if r["p95_ms"] > b["p95_ms"] * (1 + umbral):
+            regresiones.append(f"{nombre}: p95 {b['p95_ms']} → {r['p95_ms']} ms")
+        if r["consultas_por_iter"] > b["consultas_por_iter"]:
+            regresiones.append(f"{nombre}: consultas {b['consultas_por_iter']} → {r['consultas_por_iter']}")
+        if r["errores"] > b.get("errores", 0):
+            regresiones.append(f"{nombre}: errores {b.get('errores', 0)} → {r['errores']}")
+    return regresiones
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmarks de búsqueda, disponibilidad, reservas y auth")
+    ap.add_argument("--escala", type=int, default=1, help=f"{datos.COMPLEJOS_POR_ESCALA} complejos por unidad")
+    ap.add_argument("--iteraciones", type=int, default=200)
+    ap.add_argument("--calentamiento", type=int, default=20)
+    ap.add_argument("--hilos", type=int, default=1, help="workers concurrentes (throughput bajo carga)")
+    ap.add_argument("--casos", default="", help="prefijos separados por coma (vacío = todos)")
+    ap.add_argument("--salida", default=None, help="JSON de resultados (por defecto benchmarks/resultados/<fecha>.json)")
+    ap.add_argument("--base", default=None, help="JSON de referencia para comparar")
+    ap.add_argument("--umbral", type=float, default=0.2, help="tolerancia de p95 sobre la base (0.2 = +20%%)")
+    ap.add_argument("--guardar-base", default=None, help="además, escribe los resultados como nueva base")
+    ap.add_argument("--reconstruir", action="store_true", help="borra y vuelve a generar los datos")
+    args = ap.parse_args()
+
+    if settings.ENV == "production":
+        sys.exit("Los benchmarks escriben datos: no se corren con ENV=production")
+
+    db = SessionLocal()
+    try:
+        if args.reconstruir:
+            datos.limpiar(db)
+        t = time.perf_counter()
+        if datos.asegurar(db, args.escala):
+            print(f"datos generados (escala {args.escala}) en {time.perf_counter() - t:.1f} s")
+        ctx = casos_mod.preparar(db)
+    finally:
+        db.close()
+
+    prefijos = [p for p in args.casos.split(",") if p]
+    elegidos = {n: c for n, c in casos_mod.CASOS.items() if not prefijos or any(n.startswith(p) for p in prefijos)}
+    resultado: Dict[str, Any] = {
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "escala": args.escala,
+        "iteraciones": args.iteraciones,
+        "hilos": args.hilos,
+        "casos": {},
+    }
+    print(f"{'caso':45} {'p50':>8} {'p95':>8} {'p99':>8} {'cons':>6} {'it/s':>8} {'err':>4}")
+    for nombre, caso in elegidos.items():
+        r = medir(caso, ctx, iteraciones=args.iteraciones, calentamiento=args.calentamiento, hilos=args.hilos)
+        resultado["casos"][nombre] = r
+        print(f"{nombre:45} {r['p50_ms']:8.2f} {r['p95_ms']:8.2f} {r['p99_ms']:8.2f} "
+              f"{r['consultas_por_iter']:6.1f} {r['iter_por_s']:8.1f} {r['errores']:4d}")
+
+    salida = args.salida or os.path.join(
+        os.path.dirname(__file__), "resultados", datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    for ruta in filter(None, (salida, args.guardar_base)):
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, indent=2, ensure_ascii=False)
+    print(f"resultados en {salida}")
+
+    if args.base:
+        with open(args.base, encoding="utf-8") as f:
+            base = json.load(f)
+        regresiones = comparar(resultado, base, args.umbral)
+        if regresiones:
+            print("REGRESIONES:\n  " + "\n  ".join(regresiones))
+            sys.exit(1)
+        print(f"sin regresiones respecto de {args.base}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# benchmarks/casos.py
+"""Casos medidos: cada uno es una función (db, i) que hace el trabajo de un request.
+
+Llaman a los repositorios/dependencias directamente (sin HTTP) con una sesión nueva por
+iteración, como un request real. Los parámetros salen de un RNG con semilla fija.
+"""
+from __future__ import annotations
+import random
+from dataclasses import dataclass
+from datetime import date, time, timedelta
+from typing import Callable, Dict, List
+
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.security import create_access_token
+from app.modules.canchas import repository as canchas_repo
+from app.modules.complejos import repository as complejos_repo
+from app.modules.disponibilidad import repository as disponibilidad_repo
+from app.modules.reservas import repository as reservas_repo
+from app.shared.deps import get_current_user
+from benchmarks import datos
+
+# las reservas de create_reserva van desde este día en adelante para no chocar con los datos
+DIAS_OFFSET_ESCRITURA = 40
+
+@dataclass
+class Contexto:
+    canchas: List[int]
+    jugadores: List[int]
+    tokens: List[str]
+    rng: random.Random
+
+    def punto(self):
+        return (datos.LAT + self.rng.uniform(-0.03, 0.03), datos.LON + self.rng.uniform(-0.03, 0.03))
+
+def preparar(db: Session, semilla: int = 7) -> Contexto:
+    p = {"d": datos.DOMINIO}
+    canchas = list(db.execute(text("""
+        SELECT ch.id_cancha FROM canchas ch
+        JOIN complejos c ON c.id_complejo = ch.id_complejo
+        JOIN usuarios u ON u.id_usuario = c.id_dueno
+        WHERE u.email LIKE '%@' || :d ORDER BY ch.id_cancha
+    """), p).scalars())
+    jugadores = list(db.execute(text(
+        "SELECT id_usuario FROM usuarios WHERE email LIKE 'jugador%@' || :d ORDER BY id_usuario"
+    ), p).scalars())
+    # create_reserva escribe: se parte de cero en cada corrida
+    db.execute(text("""
+        DELETE FROM reservas r USING usuarios u
+        WHERE u.id_usuario = r.id_usuario AND u.email LIKE '%@' || :d
+          AND r.inicio >= (CURRENT_DATE + :off)::timestamp AT TIME ZONE 'America/Santiago'
+    """), {**p, "off": DIAS_OFFSET_ESCRITURA})
+    db.commit()
+    return Contexto(canchas, jugadores, [create_access_token(j) for j in jugadores[:50]], random.Random(semilla))
+
+Caso = Callable[[Session, int, Contexto], object]
+
+def _search_complejos(sort_by: str, geo: bool) -> Caso:
+    def caso(db: Session, i: int, ctx: Contexto):
+        lat, lon = ctx.punto() if geo else (None, None)
+        return complejos_repo.search_complejos(
+            db, q="bench" if sort_by == "relevancia" else None, comuna=None, id_comuna=None, deporte=None,
+            lat=lat, lon=lon, max_km=10 if geo else None,
+            sort_by=sort_by, order="asc", offset=0, limit=20,
+        )
+    return caso
+
+def _search_canchas(sort_by: str, geo: bool, deporte: bool = False) -> Caso:
+    def caso(db: Session, i: int, ctx: Contexto):
+        lat, lon = ctx.punto() if geo else (None, None)
+        return canchas_repo.search_canchas(
+            db, q=None, id_complejo=None, deporte="futbol" if deporte else None, cubierta=None,
+            iluminacion=None, max_precio=None, lat=lat, lon=lon, max_km=10 if geo else None,
+            sort_by=sort_by, order="asc", offset=0, limit=20,
+        )
+    return caso
+
+def _slots(db: Session, i: int, ctx: Contexto):
+    fecha = date.today() + timedelta(days=ctx.rng.randrange(datos.DIAS_RESERVAS))
+    return disponibilidad_repo.slots_disponibles(db, id_cancha=ctx.rng.choice(ctx.canchas), fecha=fecha, slot_min=60)
+
+def _create_reserva(db: Session, i: int, ctx: Contexto):
+    # (cancha, día, hora) distinto en cada iteración: mide la inserción, no el rechazo
+    n = len(ctx.canchas)
+    vuelta = i // n
+    hora = 8 + vuelta % 14
+    fecha = date.today() + timedelta(days=DIAS_OFFSET_ESCRITURA + vuelta // 14)
+    return reservas_repo.create_reserva(
+        db, id_usuario=ctx.jugadores[i % len(ctx.jugadores)], id_cancha=ctx.canchas[i % n],
+        fecha=fecha, h_ini=time(hora), h_fin=time(hora + 1), precio_total=20000,
+    )
+
+def _current_user(db: Session, i: int, ctx: Contexto):
+    creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials=ctx.tokens[i % len(ctx.tokens)])
+    return get_current_user(creds=creds, db=db)
+
+CASOS: Dict[str, Caso] = {
+    **{
+        f"search_complejos[{s},{'geo' if g else 'sin_geo'}]": _search_complejos(s, g)
+        for s in ("nombre", "rating", "recientes", "relevancia", "distancia")
+        for g in (False, True)
+        if not (s == "distancia" and not g)
+    },
+    "search_canchas[nombre,sin_geo]": _search_canchas("nombre", False),
+    "search_canchas[precio,geo]": _search_canchas("precio", True),
+    "search_canchas[distancia,geo,deporte]": _search_canchas("distancia", True, deporte=True),
+    "slots_disponibles": _slots,
+    "create_reserva": _create_reserva,
+    "get_current_user": _current_user,
+}
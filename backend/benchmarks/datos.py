@@ -0,0 +1,148 @@
+# benchmarks/datos.py
+"""Datos sintéticos para los benchmarks, generados en SQL (generate_series) y reproducibles.
+
+Todo queda marcado para poder borrarlo: usuarios con email @bench.local y sus complejos.
+Por unidad de escala: 5 complejos, 20 canchas, 40 jugadores y ~14 días de reservas.
+"""
+from __future__ import annotations
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+DOMINIO = "bench.local"
+COMPLEJOS_POR_ESCALA = 5
+CANCHAS_POR_COMPLEJO = 4
+JUGADORES_POR_ESCALA = 40
+DIAS_RESERVAS = 14
+
+# centro de Temuco; los complejos quedan en ~±9 km
+LAT, LON, RADIO_GRADOS = -38.7359, -72.5904, 0.08
+
+def _existe_funcion(db: Session, nombre: str) -> bool:
+    return db.execute(text("SELECT to_regproc(:f) IS NOT NULL"), {"f": nombre}).scalar()
+
+def cantidad(db: Session) -> int:
+    return db.execute(text("""
+        SELECT count(*) FROM complejos c JOIN usuarios u ON u.id_usuario = c.id_dueno
+        WHERE u.email LIKE '%@' || :d
+    """), {"d": DOMINIO}).scalar_one()
+
+def limpiar(db: Session) -> None:
+    p = {"d": DOMINIO}
+    db.execute(text("""
+        DELETE FROM reservas r USING usuarios u
+        WHERE u.id_usuario = r.id_usuario AND u.email LIKE '%@' || :d
+    """), p)
+    db.execute(text("""
+        DELETE FROM complejos c USING usuarios u
+        WHERE u.id_usuario = c.id_dueno AND u.email LIKE '%@' || :d
+    """), p)
+    db.execute(text("DELETE FROM usuarios WHERE email LIKE '%@' || :d"), p)
+    db.commit()
+
+def construir(db: Session, escala: int) -> None:
+    n_complejos = COMPLEJOS_POR_ESCALA * escala
+    p = {
+        "d": DOMINIO, "escala": escala, "n_complejos": n_complejos,
+        "n_jugadores": JUGADORES_POR_ESCALA * escala, "canchas": CANCHAS_POR_COMPLEJO,
+        "lat": LAT, "lon": LON, "radio": RADIO_GRADOS, "dias": DIAS_RESERVAS,
+    }
+    db.execute(text("SELECT setseed(0.42)"))
+    db.execute(text("""
+        INSERT INTO usuarios (nombre, apellido, email, hashed_password, rol, verificado)
+        SELECT 'Dueño', g::text, 'dueno' || g || '@' || :d, 'x', CAST('dueno' AS rol_usuario), TRUE
+        FROM generate_series(1, :escala) g
+        UNION ALL
+        SELECT 'Jugador', g::text, 'jugador' || g || '@' || :d, 'x', CAST('usuario' AS rol_usuario), TRUE
+        FROM generate_series(1, :n_jugadores) g
+    """), p)
+    db.execute(text("""
+        INSERT INTO complejos (id_dueno, nombre, direccion, id_comuna, latitud, longitud, activo)
+        SELECT (SELECT id_usuario FROM usuarios WHERE email = 'dueno' || (1 + g % :escala) || '@' || :d),
+               'Bench Complejo ' || g,
+               'Calle ' || g,
+               (SELECT id_comuna FROM comunas ORDER BY id_comuna LIMIT 1),
+               round((:lat + (random() * 2 - 1) * :radio)::numeric, 6),
+               round((:lon + (random() * 2 - 1) * :radio)::numeric, 6),
+               TRUE
+        FROM generate_series(1, :n_complejos) g
+    """), p)
+    db.execute(text("""
+        UPDATE complejos c
+        SET loc = ST_SetSRID(ST_MakePoint(c.longitud::float, c.latitud::float), 4326)::geography
+        FROM usuarios u
+        WHERE u.id_usuario = c.id_dueno AND u.email LIKE '%@' || :d
+    """), p)
+    db.execute(text("""
+        WITH cx AS (
+          SELECT c.id_complejo FROM complejos c JOIN usuarios u ON u.id_usuario = c.id_dueno
+          WHERE u.email LIKE '%@' || :d
+        ), dep AS (
+          SELECT array_agg(id_deporte ORDER BY id_deporte) AS ids FROM deportes
+        )
+        INSERT INTO canchas (id_complejo, nombre, id_deporte, cubierta, activo)
+        SELECT cx.id_complejo, 'Cancha ' || k,
+               dep.ids[1 + (cx.id_complejo + k) % array_length(dep.ids, 1)],
+               k % 2 = 0, TRUE
+        FROM cx, dep, generate_series(1, :canchas) k
+    """), p)
+    db.execute(text("""
+        INSERT INTO horarios_atencion (id_complejo, dia, hora_apertura, hora_cierre)
+        SELECT c.id_complejo, d.dia, TIME '08:00', TIME '23:00'
+        FROM complejos c JOIN usuarios u ON u.id_usuario = c.id_dueno,
+             unnest(enum_range(NULL::dia_semana)) AS d(dia)
+        WHERE u.email LIKE '%@' || :d
+    """), p)
+    db.execute(text("""
+        INSERT INTO reglas_precio (id_cancha, hora_inicio, hora_fin, precio_por_hora)
+        SELECT ch.id_cancha, r.ini, r.fin, r.precio + (ch.id_cancha % 5) * 1000
+        FROM canchas ch
+        JOIN complejos c ON c.id_complejo = ch.id_complejo
+        JOIN usuarios u ON u.id_usuario = c.id_dueno,
+             (VALUES (TIME '08:00', TIME '18:00', 15000), (TIME '18:00', TIME '23:00', 22000)) AS r(ini, fin, precio)
+        WHERE u.email LIKE '%@' || :d
+    """), p)
+    db.execute(text("""
+        INSERT INTO resenas (id_usuario, id_complejo, puntuacion)
+        SELECT j.id_usuario, c.id_complejo, 1 + floor(random() * 5)::int
+        FROM complejos c JOIN usuarios u ON u.id_usuario = c.id_dueno
+        JOIN LATERAL (
+          SELECT id_usuario FROM usuarios WHERE email LIKE 'jugador%@' || :d ORDER BY random() LIMIT 5
+        ) j ON TRUE
+        WHERE u.email LIKE '%@' || :d
+    """), p)
+
+    if _existe_funcion(db, "reservas_particiones_mantener"):
+        db.execute(text("SELECT * FROM reservas_particiones_mantener(2, NULL)"))
+    # una hora por cancha y día en ~1/3 de las franjas: horas distintas, sin solapes
+    db.execute(text("""
+        WITH ch AS (
+          SELECT ch.id_cancha FROM canchas ch
+          JOIN complejos c ON c.id_complejo = ch.id_complejo
+          JOIN usuarios u ON u.id_usuario = c.id_dueno
+          WHERE u.email LIKE '%@' || :d
+        ), jug AS (
+          SELECT array_agg(id_usuario ORDER BY id_usuario) AS ids FROM usuarios WHERE email LIKE 'jugador%@' || :d
+        )
+        INSERT INTO reservas (id_cancha, id_usuario, inicio, fin, estado, precio_total)
+        SELECT ch.id_cancha,
+               jug.ids[1 + (ch.id_cancha * 31 + dd * 7 + h) % array_length(jug.ids, 1)],
+               ((CURRENT_DATE + dd) + make_time(h, 0, 0)) AT TIME ZONE 'America/Santiago',
+               ((CURRENT_DATE + dd) + make_time(h + 1, 0, 0)) AT TIME ZONE 'America/Santiago',
+               CAST('confirmada' AS estado_reserva), 20000
+        FROM ch, jug, generate_series(0, :dias - 1) dd, generate_series(8, 22) h
+        WHERE (ch.id_cancha + dd + h) % 3 = 0
+    """), p)
+    if _existe_funcion(db, "complejos_deportes_recalcular"):
+        db.execute(text("SELECT complejos_deportes_recalcular()"))
+    db.commit()
+    for t in ("usuarios", "complejos", "canchas", "reservas", "reglas_precio", "horarios_atencion", "resenas"):
+        db.execute(text(f"ANALYZE {t}"))
+    db.commit()
+
+def asegurar(db: Session, escala: int) -> bool:
+    """Deja en la BD exactamente los datos de `escala`; True si tuvo que (re)construirlos."""
+    if cantidad(db) == COMPLEJOS_POR_ESCALA * escala:
+        return False
+    limpiar(db)
+    construir(db, escala)
+    return True
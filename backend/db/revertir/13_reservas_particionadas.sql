@@ -0,0 +1,91 @@
+-- =============================================================
+--  Revierte db/sql/13_reservas_particionadas.sql: reservas vuelve a ser una tabla simple
+--  con PK (id_reserva), el EXCLUDE excl_reservas_solapadas y la FK de pagos con
+--  ON DELETE CASCADE (queda como después de 12_reservas_usuario_inicio.sql).
+--  - Copia solo las particiones acopladas. Las desacopladas (reservas_AAAA_MM sueltas) no se
+--    tocan: si hay pagos de esas reservas la reversión aborta; reacoplarlas o archivarlas antes.
+--  - Va fuera de db/sql para que docker-entrypoint-initdb.d no la ejecute.
+--  Uso: psql -v ON_ERROR_STOP=1 -f db/revertir/13_reservas_particionadas.sql
+-- =============================================================
+BEGIN;
+
+DO $$
+DECLARE
+  huerfanos BIGINT;
+BEGIN
+  IF (SELECT relkind FROM pg_class WHERE oid = 'reservas'::regclass) <> 'p' THEN
+    RETURN;
+  END IF;
+
+  SELECT count(*) INTO huerfanos
+  FROM pagos p WHERE NOT EXISTS (SELECT 1 FROM reservas r WHERE r.id_reserva = p.id_reserva);
+  IF huerfanos > 0 THEN
+    RAISE EXCEPTION '% pagos apuntan a reservas fuera de las particiones acopladas', huerfanos;
+  END IF;
+
+  DROP TRIGGER IF EXISTS trg_pagos_reserva_existe ON pagos;
+
+  CREATE TABLE reservas_sin_particion (
+    id_reserva    BIGINT NOT NULL DEFAULT nextval('reservas_id_reserva_seq'),
+    id_cancha     BIGINT NOT NULL REFERENCES canchas(id_cancha) ON DELETE RESTRICT,
+    id_usuario    BIGINT NOT NULL REFERENCES usuarios(id_usuario) ON DELETE RESTRICT,
+    inicio        TIMESTAMPTZ NOT NULL,
+    fin           TIMESTAMPTZ NOT NULL,
+    estado        estado_reserva NOT NULL DEFAULT 'pendiente',
+    precio_total  NUMERIC(12,2) CHECK (precio_total IS NULL OR precio_total >= 0),
+    notas         TEXT,
+    created_at    TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at    TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    expira_at     TIMESTAMPTZ,
+    CHECK (inicio < fin)
+  );
+  ALTER SEQUENCE reservas_id_reserva_seq OWNED BY reservas_sin_particion.id_reserva;
+
+  -- sin triggers todavía: reservas_diarias ya tiene estas filas
+  INSERT INTO reservas_sin_particion (id_reserva, id_cancha, id_usuario, inicio, fin, estado, precio_total,
+                                      notas, created_at, updated_at, expira_at)
+  SELECT id_reserva, id_cancha, id_usuario, inicio, fin, estado, precio_total,
+         notas, created_at, updated_at, expira_at
+  FROM reservas;
+
+  -- DROP no dispara trg_reservas_borrar_pagos (y los pagos ya no tienen FK)
+  DROP TABLE reservas;
+  ALTER TABLE reservas_sin_particion RENAME TO reservas;
+  ALTER TABLE reservas RENAME CONSTRAINT reservas_sin_particion_check TO reservas_check;
+  ALTER TABLE reservas RENAME CONSTRAINT reservas_sin_particion_precio_total_check TO reservas_precio_total_check;
+  ALTER TABLE reservas RENAME CONSTRAINT reservas_sin_particion_id_cancha_fkey TO reservas_id_cancha_fkey;
+  ALTER TABLE reservas RENAME CONSTRAINT reservas_sin_particion_id_usuario_fkey TO reservas_id_usuario_fkey;
+  ALTER TABLE reservas ADD CONSTRAINT reservas_pkey PRIMARY KEY (id_reserva);
+  ALTER TABLE reservas ADD CONSTRAINT excl_reservas_solapadas EXCLUDE USING GIST (
+    id_cancha WITH =,
+    tstzrange(inicio, fin, '[)') WITH &&
+  ) WHERE (estado IN ('pendiente','confirmada'));
+
+  CREATE INDEX idx_reservas_cancha ON reservas (id_cancha);
+  CREATE INDEX idx_reservas_rango ON reservas USING GIST (tstzrange(inicio, fin, '[)'));
+  CREATE INDEX idx_reservas_retenciones
+    ON reservas (expira_at)
+    WHERE estado = 'pendiente' AND expira_at IS NOT NULL;
+  CREATE INDEX idx_reservas_usuario_inicio
+    ON reservas (id_usuario, inicio, id_reserva)
+    INCLUDE (id_cancha, fin, estado, precio_total);
+
+  CREATE TRIGGER trg_reservas_updated
+  BEFORE UPDATE ON reservas
+  FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+  CREATE TRIGGER trg_reservas_diarias
+  AFTER INSERT OR DELETE OR UPDATE OF estado, inicio, fin, precio_total, id_cancha ON reservas
+  FOR EACH ROW EXECUTE FUNCTION trg_reservas_diarias();
+
+  ALTER TABLE pagos ADD CONSTRAINT pagos_id_reserva_fkey
+    FOREIGN KEY (id_reserva) REFERENCES reservas(id_reserva) ON DELETE CASCADE;
+END$$;
+
+DROP FUNCTION IF EXISTS reservas_particiones_mantener(INT, INT);
+DROP FUNCTION IF EXISTS reservas_crear_particion(DATE);
+DROP FUNCTION IF EXISTS trg_reservas_borde();
+DROP FUNCTION IF EXISTS trg_reservas_borrar_pagos();
+DROP FUNCTION IF EXISTS trg_pagos_reserva_existe();
+
+COMMIT;
@@ -0,0 +1,16 @@
+-- =============================================================
+--  Retenciones temporales de horario (checkout / pago)
+--  Una reserva 'pendiente' con expira_at bloquea el horario (el
+--  EXCLUDE ya considera 'pendiente') hasta que se confirma o vence.
+-- =============================================================
+BEGIN;
+
+ALTER TABLE reservas
+  ADD COLUMN IF NOT EXISTS expira_at TIMESTAMPTZ;
+
+-- Solo las retenciones vivas: el barrido lee por expira_at sin tocar el resto de la tabla
+CREATE INDEX IF NOT EXISTS idx_reservas_retenciones
+  ON reservas (expira_at)
+  WHERE estado = 'pendiente' AND expira_at IS NOT NULL;
+
+COMMIT;
@@ -0,0 +1,95 @@
+-- =============================================================
+--  KPIs de dueños: acumulado diario por cancha + calendario
+--  reservas_diarias se mantiene por trigger en cada cambio de
+--  estado/horario/precio de una reserva; el resumen de un
+--  complejo suma a lo más 366 filas por cancha y año.
+-- =============================================================
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS reservas_diarias (
+  id_cancha             BIGINT NOT NULL REFERENCES canchas(id_cancha) ON DELETE CASCADE,
+  fecha                 DATE   NOT NULL,                 -- fecha local America/Santiago del inicio
+  reservas_confirmadas  INT    NOT NULL DEFAULT 0,
+  horas_reservadas      NUMERIC(12,2) NOT NULL DEFAULT 0,
+  ingresos_confirmados  NUMERIC(14,2) NOT NULL DEFAULT 0,
+  PRIMARY KEY (id_cancha, fecha)
+);
+
+-- Calendario precalculado: capacidad = días del rango x horario de atención del día
+CREATE TABLE IF NOT EXISTS calendario (
+  fecha  DATE PRIMARY KEY,
+  dia    dia_semana NOT NULL
+);
+
+INSERT INTO calendario (fecha, dia)
+SELECT d::date,
+       (ARRAY['lunes','martes','miercoles','jueves','viernes','sabado','domingo'])[EXTRACT(ISODOW FROM d)]::dia_semana
+FROM generate_series(DATE '2020-01-01', DATE '2040-12-31', INTERVAL '1 day') AS d
+ON CONFLICT DO NOTHING;
+
+CREATE OR REPLACE FUNCTION reservas_diarias_aplicar(
+  p_cancha BIGINT, p_inicio TIMESTAMPTZ, p_fin TIMESTAMPTZ, p_precio NUMERIC, p_signo INT
+) RETURNS VOID AS $$
+  INSERT INTO reservas_diarias AS d (id_cancha, fecha, reservas_confirmadas, horas_reservadas, ingresos_confirmados)
+  VALUES (
+    p_cancha,
+    (p_inicio AT TIME ZONE 'America/Santiago')::date,
+    p_signo,
+    p_signo * EXTRACT(EPOCH FROM (p_fin - p_inicio)) / 3600.0,
+    p_signo * COALESCE(p_precio, 0)
+  )
+  ON CONFLICT (id_cancha, fecha) DO UPDATE SET
+    reservas_confirmadas = d.reservas_confirmadas + EXCLUDED.reservas_confirmadas,
+    horas_reservadas     = d.horas_reservadas     + EXCLUDED.horas_reservadas,
+    ingresos_confirmados = d.ingresos_confirmados + EXCLUDED.ingresos_confirmados;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION trg_reservas_diarias() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE','DELETE') AND OLD.estado = 'confirmada' THEN
+    PERFORM reservas_diarias_aplicar(OLD.id_cancha, OLD.inicio, OLD.fin, OLD.precio_total, -1);
+  END IF;
+  IF TG_OP IN ('INSERT','UPDATE') AND NEW.estado = 'confirmada' THEN
+    PERFORM reservas_diarias_aplicar(NEW.id_cancha, NEW.inicio, NEW.fin, NEW.precio_total, 1);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_reservas_diarias ON reservas;
+CREATE TRIGGER trg_reservas_diarias
+AFTER INSERT OR DELETE OR UPDATE OF estado, inicio, fin, precio_total, id_cancha ON reservas
+FOR EACH ROW EXECUTE FUNCTION trg_reservas_diarias();
+
+-- Recalcula (backfill) el acumulado de un rango de fechas locales desde reservas.
+-- Uso: SELECT reservas_diarias_recalcular('2024-01-01', '2024-12-31');
+CREATE OR REPLACE FUNCTION reservas_diarias_recalcular(p_desde DATE, p_hasta DATE) RETURNS INT AS $$
+DECLARE
+  n INT;
+BEGIN
+  -- bloquea escrituras del trigger mientras se reconstruye el rango
+  LOCK TABLE reservas_diarias IN EXCLUSIVE MODE;
+  DELETE FROM reservas_diarias WHERE fecha BETWEEN p_desde AND p_hasta;
+  INSERT INTO reservas_diarias (id_cancha, fecha, reservas_confirmadas, horas_reservadas, ingresos_confirmados)
+  SELECT r.id_cancha,
+         (r.inicio AT TIME ZONE 'America/Santiago')::date,
+         COUNT(*),
+         SUM(EXTRACT(EPOCH FROM (r.fin - r.inicio)) / 3600.0),
+         COALESCE(SUM(r.precio_total), 0)
+  FROM reservas r
+  WHERE r.estado = 'confirmada'
+    AND r.inicio >= (p_desde::timestamp AT TIME ZONE 'America/Santiago')
+    AND r.inicio <  ((p_hasta + 1)::timestamp AT TIME ZONE 'America/Santiago')
+  GROUP BY 1, 2;
+  GET DIAGNOSTICS n = ROW_COUNT;
+  RETURN n;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Carga inicial con todo el historial existente
+SELECT reservas_diarias_recalcular(
+  COALESCE((SELECT MIN((inicio AT TIME ZONE 'America/Santiago')::date) FROM reservas), CURRENT_DATE),
+  COALESCE((SELECT MAX((inicio AT TIME ZONE 'America/Santiago')::date) FROM reservas), CURRENT_DATE)
+);
+
+COMMIT;
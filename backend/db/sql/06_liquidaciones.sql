@@ -0,0 +1,18 @@
+-- =============================================================
+--  Liquidaciones: soporte para la generación por lotes
+--  - una sola liquidación pendiente por (dueño, complejo, periodo):
+--    re-ejecutar el job suma pagos nuevos en vez de duplicar
+--  - búsqueda de pagos ya liquidados por id_pago
+-- =============================================================
+BEGIN;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_liq_pendiente_periodo
+  ON liquidaciones (id_dueno, id_complejo, periodo_inicio, periodo_fin)
+  WHERE estado = 'pendiente';
+
+CREATE INDEX IF NOT EXISTS idx_liq_detalle_pago ON liquidacion_detalle (id_pago);
+
+CREATE INDEX IF NOT EXISTS idx_pagos_reserva_pagado
+  ON pagos (id_reserva) WHERE estado = 'pagado';
+
+COMMIT;
@@ -0,0 +1,21 @@
+-- =============================================================
+--  Webhooks de pagos: ingesta idempotente + procesamiento por lotes
+--  - id_evento_externo: id del evento según el proveedor (dedupe de reintentos)
+--  - índice parcial de pendientes para el procesador (FOR UPDATE SKIP LOCKED)
+--  - pagos se ubican por (proveedor, id_externo)
+-- =============================================================
+BEGIN;
+
+ALTER TABLE webhook_eventos ADD COLUMN IF NOT EXISTS id_evento_externo VARCHAR(120);
+ALTER TABLE webhook_eventos ADD COLUMN IF NOT EXISTS error TEXT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_webhook_eventos_externo
+  ON webhook_eventos (proveedor, id_evento_externo);
+
+CREATE INDEX IF NOT EXISTS idx_webhook_eventos_pendientes
+  ON webhook_eventos (id_evento)
+  WHERE estado = 'pendiente';
+
+CREATE INDEX IF NOT EXISTS idx_pagos_externo ON pagos (proveedor, id_externo);
+
+COMMIT;
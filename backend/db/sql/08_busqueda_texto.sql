@@ -0,0 +1,83 @@
+-- =============================================================
+--  Búsqueda de texto sin acentos para complejos y canchas
+--  - busqueda_txt: texto normalizado (minúsculas, sin acentos) -> pg_trgm (typos, subcadenas)
+--  - busqueda_tsv: tsvector español sin acentos               -> full-text con ranking
+--  Ambas se mantienen por trigger al escribir y se indexan con GIN.
+-- =============================================================
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS unaccent;
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- unaccent() es STABLE; este wrapper IMMUTABLE permite usarlo en índices y columnas
+CREATE OR REPLACE FUNCTION f_unaccent(TEXT) RETURNS TEXT
+LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT AS
+$$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$;
+
+DO $$
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'es_unaccent') THEN
+    CREATE TEXT SEARCH CONFIGURATION es_unaccent (COPY = spanish);
+    ALTER TEXT SEARCH CONFIGURATION es_unaccent
+      ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+  END IF;
+END$$;
+
+-- ---------- complejos ----------
+ALTER TABLE complejos ADD COLUMN IF NOT EXISTS busqueda_txt TEXT;
+ALTER TABLE complejos ADD COLUMN IF NOT EXISTS busqueda_tsv TSVECTOR;
+
+CREATE OR REPLACE FUNCTION trg_complejos_busqueda() RETURNS TRIGGER AS $$
+DECLARE
+  v_comuna TEXT;
+BEGIN
+  SELECT co.nombre INTO v_comuna FROM comunas co WHERE co.id_comuna = NEW.id_comuna;
+  NEW.busqueda_txt := f_unaccent(lower(concat_ws(' ', NEW.nombre, NEW.direccion, v_comuna)));
+  NEW.busqueda_tsv :=
+       setweight(to_tsvector('es_unaccent', coalesce(NEW.nombre, '')), 'A')
+    || setweight(to_tsvector('es_unaccent', coalesce(v_comuna, '')), 'B')
+    || setweight(to_tsvector('es_unaccent', coalesce(NEW.direccion, '')), 'C')
+    || setweight(to_tsvector('es_unaccent', coalesce(NEW.descripcion, '')), 'D');
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_complejos_busqueda ON complejos;
+CREATE TRIGGER trg_complejos_busqueda
+BEFORE INSERT OR UPDATE OF nombre, direccion, descripcion, id_comuna ON complejos
+FOR EACH ROW EXECUTE FUNCTION trg_complejos_busqueda();
+
+-- carga inicial: el UPDATE OF nombre dispara el trigger
+UPDATE complejos SET nombre = nombre;
+
+CREATE INDEX IF NOT EXISTS idx_complejos_busqueda_tsv ON complejos USING GIN (busqueda_tsv);
+CREATE INDEX IF NOT EXISTS idx_complejos_busqueda_trgm ON complejos USING GIN (busqueda_txt gin_trgm_ops);
+
+-- ---------- canchas ----------
+ALTER TABLE canchas ADD COLUMN IF NOT EXISTS busqueda_txt TEXT;
+ALTER TABLE canchas ADD COLUMN IF NOT EXISTS busqueda_tsv TSVECTOR;
+
+CREATE OR REPLACE FUNCTION trg_canchas_busqueda() RETURNS TRIGGER AS $$
+DECLARE
+  v_deporte TEXT;
+BEGIN
+  SELECT d.nombre INTO v_deporte FROM deportes d WHERE d.id_deporte = NEW.id_deporte;
+  NEW.busqueda_txt := f_unaccent(lower(concat_ws(' ', NEW.nombre, v_deporte)));
+  NEW.busqueda_tsv :=
+       setweight(to_tsvector('es_unaccent', coalesce(NEW.nombre, '')), 'A')
+    || setweight(to_tsvector('es_unaccent', coalesce(v_deporte, '')), 'B');
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_canchas_busqueda ON canchas;
+CREATE TRIGGER trg_canchas_busqueda
+BEFORE INSERT OR UPDATE OF nombre, id_deporte ON canchas
+FOR EACH ROW EXECUTE FUNCTION trg_canchas_busqueda();
+
+UPDATE canchas SET nombre = nombre;
+
+CREATE INDEX IF NOT EXISTS idx_canchas_busqueda_tsv ON canchas USING GIN (busqueda_tsv);
+CREATE INDEX IF NOT EXISTS idx_canchas_busqueda_trgm ON canchas USING GIN (busqueda_txt gin_trgm_ops);
+
+COMMIT;
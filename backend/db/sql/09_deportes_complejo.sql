@@ -0,0 +1,27 @@
+-- =============================================================
+--  Deportes por complejo precalculados
+--  complejos.deportes_ids: ids de deporte con al menos una cancha activa.
+--  Lo mantiene la app al crear/editar/desactivar canchas (canchas.repository);
+--  el filtro por deporte pasa a ser un `&&` sobre GIN, sin JOIN a canchas.
+-- =============================================================
+BEGIN;
+
+ALTER TABLE complejos ADD COLUMN IF NOT EXISTS deportes_ids INT[] NOT NULL DEFAULT '{}';
+
+CREATE INDEX IF NOT EXISTS idx_complejos_deportes_ids ON complejos USING GIN (deportes_ids);
+CREATE INDEX IF NOT EXISTS idx_deportes_nombre_lower ON deportes (lower(nombre));
+
+-- recalcula uno (p_id) o todos (NULL); usado para backfill y cargas masivas
+CREATE OR REPLACE FUNCTION complejos_deportes_recalcular(p_id BIGINT DEFAULT NULL) RETURNS VOID AS $$
+  UPDATE complejos c
+  SET deportes_ids = COALESCE((
+        SELECT array_agg(DISTINCT ch.id_deporte ORDER BY ch.id_deporte)
+        FROM canchas ch
+        WHERE ch.id_complejo = c.id_complejo AND ch.activo = TRUE AND ch.deleted_at IS NULL
+      ), '{}')
+  WHERE p_id IS NULL OR c.id_complejo = p_id;
+$$ LANGUAGE sql;
+
+SELECT complejos_deportes_recalcular();
+
+COMMIT;
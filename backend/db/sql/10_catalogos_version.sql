@@ -0,0 +1,35 @@
+-- =============================================================
+--  Versión de catálogos (deportes, comunas, servicios)
+--  La API los mantiene en memoria y solo compara este número para saber si recargar.
+--  Triggers por sentencia: un INSERT masivo sube la versión una vez.
+-- =============================================================
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS catalogos_version (
+  id       BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+  version  BIGINT NOT NULL DEFAULT 1
+);
+INSERT INTO catalogos_version (id, version) VALUES (TRUE, 1) ON CONFLICT DO NOTHING;
+
+CREATE OR REPLACE FUNCTION trg_catalogos_version() RETURNS TRIGGER AS $$
+BEGIN
+  UPDATE catalogos_version SET version = version + 1 WHERE id;
+  RETURN NULL;
+END$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_deportes_version ON deportes;
+CREATE TRIGGER trg_deportes_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON deportes
+FOR EACH STATEMENT EXECUTE FUNCTION trg_catalogos_version();
+
+DROP TRIGGER IF EXISTS trg_comunas_version ON comunas;
+CREATE TRIGGER trg_comunas_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON comunas
+FOR EACH STATEMENT EXECUTE FUNCTION trg_catalogos_version();
+
+DROP TRIGGER IF EXISTS trg_servicios_version ON servicios;
+CREATE TRIGGER trg_servicios_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON servicios
+FOR EACH STATEMENT EXECUTE FUNCTION trg_catalogos_version();
+
+COMMIT;
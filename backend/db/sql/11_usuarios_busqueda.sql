@@ -0,0 +1,19 @@
+-- =============================================================
+--  Búsqueda y paginación del listado admin de usuarios
+--  - GIN trigram sobre lower(col): sirve LIKE '%q%' sin recorrer la tabla
+--  - btree (clave de orden, id_usuario): paginación keyset por cada order_by permitido
+--    (nombre/apellido pueden ser NULL: se ordena por COALESCE(col, ''))
+-- =============================================================
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_usuarios_nombre_trgm   ON usuarios USING GIN (lower(nombre) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_usuarios_apellido_trgm ON usuarios USING GIN (lower(apellido) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_usuarios_email_trgm    ON usuarios USING GIN (lower(email) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_usuarios_orden_nombre   ON usuarios ((COALESCE(nombre, '')), id_usuario);
+CREATE INDEX IF NOT EXISTS idx_usuarios_orden_apellido ON usuarios ((COALESCE(apellido, '')), id_usuario);
+CREATE INDEX IF NOT EXISTS idx_usuarios_orden_email    ON usuarios (email, id_usuario);
+
+COMMIT;
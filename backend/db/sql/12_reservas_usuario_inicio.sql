@@ -0,0 +1,14 @@
+-- =============================================================
+--  "Mis reservas": keyset sobre (inicio, id_reserva) por usuario
+--  Índice compuesto con INCLUDE: la página se resuelve con un index scan acotado
+--  (sin ordenar todo el historial). Reemplaza a idx_reservas_usuario (su prefijo).
+-- =============================================================
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS idx_reservas_usuario_inicio
+  ON reservas (id_usuario, inicio, id_reserva)
+  INCLUDE (id_cancha, fin, estado, precio_total);
+
+DROP INDEX IF EXISTS idx_reservas_usuario;
+
+COMMIT;
@@ -0,0 +1,225 @@
+-- =============================================================
+--  reservas particionada por mes (RANGE sobre inicio, meses en hora local)
+--  - Cada partición trae su propio EXCLUDE de solapamiento: el padre no puede tenerlo
+--    (PostgreSQL exige que incluya la clave de partición con igualdad). Las reservas cerca
+--    del cambio de mes, que podrían chocar con otra partición, las valida trg_reservas_borde.
+--  - La PK pasa a ser (id_reserva, inicio); pagos.id_reserva deja de ser FK y se valida
+--    con trigger. El ON DELETE CASCADE de esa FK lo reemplaza trg_reservas_borrar_pagos.
+--  - reservas_particiones_mantener() crea los meses futuros y desacopla (DETACH, no DROP)
+--    los antiguos. La API la llama a diario (app/modules/reservas/particiones.py).
+--  Supone reservas de hasta 24 h (la API las crea dentro de un mismo día).
+-- =============================================================
+BEGIN;
+
+-- ---------- particiones ----------
+CREATE OR REPLACE FUNCTION reservas_crear_particion(p_mes DATE) RETURNS TEXT AS $$
+DECLARE
+  ini    DATE := date_trunc('month', p_mes)::date;
+  nombre TEXT := format('reservas_%s', to_char(ini, 'YYYY_MM'));
+BEGIN
+  IF to_regclass(nombre) IS NOT NULL THEN
+    RETURN NULL;
+  END IF;
+  EXECUTE format(
+    'CREATE TABLE %I PARTITION OF reservas FOR VALUES FROM (%L) TO (%L)',
+    nombre,
+    ini::timestamp AT TIME ZONE 'America/Santiago',
+    (ini + INTERVAL '1 month')::timestamp AT TIME ZONE 'America/Santiago');
+  EXECUTE format(
+    'ALTER TABLE %I ADD CONSTRAINT %I EXCLUDE USING GIST '
+    '(id_cancha WITH =, tstzrange(inicio, fin, ''[)'') WITH &&) '
+    'WHERE (estado IN (''pendiente'',''confirmada''))',
+    nombre, nombre || '_excl');
+  RETURN nombre;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Uso: SELECT * FROM reservas_particiones_mantener(12, 24);
+-- p_meses_retener NULL: no desacopla nada.
+CREATE OR REPLACE FUNCTION reservas_particiones_mantener(p_meses_adelante INT DEFAULT 12, p_meses_retener INT DEFAULT NULL)
+RETURNS TABLE (accion TEXT, particion TEXT) AS $$
+DECLARE
+  mes    DATE := date_trunc('month', now() AT TIME ZONE 'America/Santiago')::date;
+  nombre TEXT;
+BEGIN
+  -- una instancia a la vez (mismo espacio de advisory locks que el resto: 26_0xx)
+  IF NOT pg_try_advisory_xact_lock(26045, 0) THEN
+    RETURN;
+  END IF;
+
+  FOR i IN 0..p_meses_adelante LOOP
+    nombre := reservas_crear_particion((mes + make_interval(months => i))::date);
+    IF nombre IS NOT NULL THEN
+      accion := 'creada'; particion := nombre; RETURN NEXT;
+    END IF;
+  END LOOP;
+
+  IF p_meses_retener IS NOT NULL THEN
+    FOR nombre IN
+      SELECT c.relname
+      FROM pg_inherits i
+      JOIN pg_class c ON c.oid = i.inhrelid
+      WHERE i.inhparent = 'reservas'::regclass
+        AND c.relname ~ '^reservas_[0-9]{4}_[0-9]{2}$'
+        AND to_date(substr(c.relname, 10), 'YYYY_MM') < (mes - make_interval(months => p_meses_retener))::date
+      ORDER BY c.relname
+    LOOP
+      EXECUTE format('ALTER TABLE reservas DETACH PARTITION %I', nombre);
+      accion := 'desacoplada'; particion := nombre; RETURN NEXT;
+    END LOOP;
+  END IF;
+
+  -- retenciones vencidas de horarios ya pasados: el barrido solo mira fechas recientes
+  UPDATE reservas SET estado = 'expirada', updated_at = now()
+   WHERE estado = 'pendiente' AND expira_at IS NOT NULL AND expira_at <= now()
+     AND inicio < now() - INTERVAL '1 day';
+END;
+$$ LANGUAGE plpgsql;
+
+-- ---------- solapamiento entre particiones ----------
+CREATE OR REPLACE FUNCTION trg_reservas_borde() RETURNS TRIGGER AS $$
+DECLARE
+  mes_local TIMESTAMP := date_trunc('month', NEW.inicio AT TIME ZONE 'America/Santiago');
+BEGIN
+  IF NEW.estado NOT IN ('pendiente','confirmada') THEN
+    RETURN NULL;
+  END IF;
+  -- dentro de la partición ya valida el EXCLUDE; solo interesan las que terminan en el mes
+  -- siguiente o empiezan el primer día (una del mes anterior puede alcanzarlas)
+  IF NEW.fin <= (mes_local + INTERVAL '1 month') AT TIME ZONE 'America/Santiago'
+     AND NEW.inicio >= (mes_local + INTERVAL '1 day') AT TIME ZONE 'America/Santiago' THEN
+    RETURN NULL;
+  END IF;
+  -- mismo lock que reservas.repository.lock_cancha: serializa con las inserciones de la API
+  PERFORM pg_advisory_xact_lock(26029, CAST(NEW.id_cancha AS int));
+  IF EXISTS (
+    SELECT 1 FROM reservas r
+     WHERE r.id_cancha = NEW.id_cancha
+       AND r.id_reserva <> NEW.id_reserva
+       AND r.estado IN ('pendiente','confirmada')
+       AND r.inicio >= NEW.inicio - INTERVAL '1 day' AND r.inicio < NEW.fin
+       AND tstzrange(r.inicio, r.fin, '[)') && tstzrange(NEW.inicio, NEW.fin, '[)')
+  ) THEN
+    RAISE EXCEPTION 'La cancha % ya está reservada en ese horario', NEW.id_cancha
+      USING ERRCODE = 'exclusion_violation', CONSTRAINT = 'excl_reservas_solapadas';
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ---------- pagos.id_reserva sin FK ----------
+CREATE OR REPLACE FUNCTION trg_pagos_reserva_existe() RETURNS TRIGGER AS $$
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM reservas WHERE id_reserva = NEW.id_reserva) THEN
+    RAISE EXCEPTION 'La reserva % no existe', NEW.id_reserva USING ERRCODE = 'foreign_key_violation';
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- reemplaza el ON DELETE CASCADE de pagos_id_reserva_fkey. Un UPDATE que mueve la fila a otra
+-- partición dispara también AFTER DELETE (ya con la fila nueva insertada): ahí no se borra nada.
+CREATE OR REPLACE FUNCTION trg_reservas_borrar_pagos() RETURNS TRIGGER AS $$
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM reservas WHERE id_reserva = OLD.id_reserva) THEN
+    DELETE FROM pagos WHERE id_reserva = OLD.id_reserva;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ---------- conversión (solo si reservas aún no está particionada) ----------
+DO $$
+DECLARE
+  m DATE;
+BEGIN
+  IF (SELECT relkind FROM pg_class WHERE oid = 'reservas'::regclass) = 'p' THEN
+    RETURN;
+  END IF;
+
+  ALTER TABLE pagos DROP CONSTRAINT IF EXISTS pagos_id_reserva_fkey;
+
+  -- los nombres de índices son globales en el esquema: se liberan antes de crear la nueva
+  ALTER TABLE reservas RENAME TO reservas_sin_particion;
+  ALTER TABLE reservas_sin_particion DROP CONSTRAINT IF EXISTS excl_reservas_solapadas;
+  ALTER TABLE reservas_sin_particion RENAME CONSTRAINT reservas_pkey TO reservas_sin_particion_pkey;
+  DROP INDEX IF EXISTS idx_reservas_cancha;
+  DROP INDEX IF EXISTS idx_reservas_usuario;
+  DROP INDEX IF EXISTS idx_reservas_rango;
+  DROP INDEX IF EXISTS idx_reservas_retenciones;
+  DROP INDEX IF EXISTS idx_reservas_usuario_inicio;
+  DROP TRIGGER IF EXISTS trg_reservas_updated ON reservas_sin_particion;
+  DROP TRIGGER IF EXISTS trg_reservas_diarias ON reservas_sin_particion;
+
+  CREATE TABLE reservas (
+    id_reserva    BIGINT NOT NULL DEFAULT nextval('reservas_id_reserva_seq'),
+    id_cancha     BIGINT NOT NULL REFERENCES canchas(id_cancha) ON DELETE RESTRICT,
+    id_usuario    BIGINT NOT NULL REFERENCES usuarios(id_usuario) ON DELETE RESTRICT,
+    inicio        TIMESTAMPTZ NOT NULL,
+    fin           TIMESTAMPTZ NOT NULL,
+    estado        estado_reserva NOT NULL DEFAULT 'pendiente',
+    precio_total  NUMERIC(12,2) CHECK (precio_total IS NULL OR precio_total >= 0),
+    notas         TEXT,
+    created_at    TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at    TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    expira_at     TIMESTAMPTZ,
+    CHECK (inicio < fin),
+    PRIMARY KEY (id_reserva, inicio)
+  ) PARTITION BY RANGE (inicio);
+  -- la secuencia pasa a la tabla nueva antes de borrar la anterior
+  ALTER SEQUENCE reservas_id_reserva_seq OWNED BY reservas.id_reserva;
+
+  FOR m IN
+    SELECT DISTINCT date_trunc('month', inicio AT TIME ZONE 'America/Santiago')::date
+    FROM reservas_sin_particion
+  LOOP
+    PERFORM reservas_crear_particion(m);
+  END LOOP;
+  PERFORM reservas_particiones_mantener(12, NULL);
+
+  -- copia antes de crear los triggers: reservas_diarias ya tiene estas filas
+  INSERT INTO reservas (id_reserva, id_cancha, id_usuario, inicio, fin, estado, precio_total,
+                        notas, created_at, updated_at, expira_at)
+  SELECT id_reserva, id_cancha, id_usuario, inicio, fin, estado, precio_total,
+         notas, created_at, updated_at, expira_at
+  FROM reservas_sin_particion;
+
+  DROP TABLE reservas_sin_particion;
+END$$;
+
+-- índices del padre: se crean (y se heredan) en cada partición
+CREATE INDEX IF NOT EXISTS idx_reservas_cancha ON reservas (id_cancha, inicio);
+CREATE INDEX IF NOT EXISTS idx_reservas_rango ON reservas USING GIST (tstzrange(inicio, fin, '[)'));
+CREATE INDEX IF NOT EXISTS idx_reservas_retenciones
+  ON reservas (expira_at)
+  WHERE estado = 'pendiente' AND expira_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_reservas_usuario_inicio
+  ON reservas (id_usuario, inicio, id_reserva)
+  INCLUDE (id_cancha, fin, estado, precio_total);
+
+DROP TRIGGER IF EXISTS trg_reservas_updated ON reservas;
+CREATE TRIGGER trg_reservas_updated
+BEFORE UPDATE ON reservas
+FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+DROP TRIGGER IF EXISTS trg_reservas_diarias ON reservas;
+CREATE TRIGGER trg_reservas_diarias
+AFTER INSERT OR DELETE OR UPDATE OF estado, inicio, fin, precio_total, id_cancha ON reservas
+FOR EACH ROW EXECUTE FUNCTION trg_reservas_diarias();
+
+DROP TRIGGER IF EXISTS trg_reservas_borde ON reservas;
+CREATE TRIGGER trg_reservas_borde
+AFTER INSERT OR UPDATE OF estado, inicio, fin, id_cancha ON reservas
+FOR EACH ROW EXECUTE FUNCTION trg_reservas_borde();
+
+DROP TRIGGER IF EXISTS trg_pagos_reserva_existe ON pagos;
+CREATE TRIGGER trg_pagos_reserva_existe
+BEFORE INSERT OR UPDATE OF id_reserva ON pagos
+FOR EACH ROW EXECUTE FUNCTION trg_pagos_reserva_existe();
+
+DROP TRIGGER IF EXISTS trg_reservas_borrar_pagos ON reservas;
+CREATE TRIGGER trg_reservas_borrar_pagos
+AFTER DELETE ON reservas
+FOR EACH ROW EXECUTE FUNCTION trg_reservas_borrar_pagos();
+
+COMMIT;
@@ -0,0 +1,21 @@
+-- =============================================================
+--  Backfill de complejos.loc
+--  Desde /search/nearby la app escribe loc al crear/editar, pero los complejos
+--  guardados antes (o por SQL directo) quedaron con loc NULL y el prefiltro
+--  ST_DWithin los deja fuera. Idempotente; no hace nada si el esquema no tiene loc.
+-- =============================================================
+BEGIN;
+
+DO $$
+BEGIN
+  IF EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_schema = 'public' AND table_name = 'complejos' AND column_name = 'loc'
+  ) THEN
+    UPDATE complejos
+    SET loc = ST_SetSRID(ST_MakePoint(longitud::float8, latitud::float8), 4326)::geography
+    WHERE loc IS NULL AND latitud IS NOT NULL AND longitud IS NOT NULL;
+  END IF;
+END $$;
+
+COMMIT;
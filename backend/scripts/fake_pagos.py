@@ -0,0 +1,87 @@
+# scripts/fake_pagos.py
+"""
+Proveedor de pagos falso para pruebas de carga del webhook de ingesta.
+
+Envía eventos firmados (HMAC-SHA256, igual que un proveedor real) a
+POST /api/v1/pagos/webhooks/<proveedor>, con una fracción de reintentos duplicados,
+y reporta latencias p50/p95/p99 y throughput.
+
+Uso:
+  PAGOS_WEBHOOK_SECRETS="fake:secreto" uvicorn app.main:app   # en otra terminal
+  python scripts/fake_pagos.py --url http://localhost:8000 --secreto secreto \
+      --eventos 5000 --concurrencia 32 --duplicados 0.2 --pagos ext-1,ext-2
+"""
+from __future__ import annotations
+import argparse
+import hashlib
+import hmac
+import json
+import random
+import statistics
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+TIPOS = ["payment.authorized", "payment.succeeded", "payment.succeeded", "payment.failed"]
+
+def enviar(url: str, secreto: str, evento: dict) -> tuple[int, float]:
+    cuerpo = json.dumps(evento).encode()
+    firma = "sha256=" + hmac.new(secreto.encode(), cuerpo, hashlib.sha256).hexdigest()
+    req = urllib.request.Request(
+        url, data=cuerpo, method="POST",
+        headers={"Content-Type": "application/json", "X-Signature": firma, "X-Event-Id": evento["id"]},
+    )
+    t0 = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=10) as r:
+            status = r.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except OSError:
+        status = 0
+    return status, (time.perf_counter() - t0) * 1000
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Carga de webhooks de pago firmados")
+    ap.add_argument("--url", default="http://localhost:8000")
+    ap.add_argument("--proveedor", default="fake")
+    ap.add_argument("--secreto", required=True)
+    ap.add_argument("--eventos", type=int, default=1000)
+    ap.add_argument("--concurrencia", type=int, default=16)
+    ap.add_argument("--duplicados", type=float, default=0.1, help="Fracción de reenvíos del mismo evento")
+    ap.add_argument("--pagos", default="", help="id_externo de pagos existentes, separados por coma")
+    args = ap.parse_args()
+
+    destino = f"{args.url.rstrip('/')}/api/v1/pagos/webhooks/{args.proveedor}"
+    externos = [p for p in args.pagos.split(",") if p] or [f"fake-{i}" for i in range(100)]
+
+    eventos: list[dict] = []
+    for _ in range(args.eventos):
+        if eventos and random.random() < args.duplicados:
+            eventos.append(random.choice(eventos))  # reintento del proveedor
+            continue
+        eventos.append({
+            "id": f"evt_{uuid.uuid4().hex}",
+            "type": random.choice(TIPOS),
+            "data": {"id_externo": random.choice(externos)},
+        })
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrencia) as ex:
+        resultados = list(ex.map(lambda e: enviar(destino, args.secreto, e), eventos))
+    total_s = time.perf_counter() - t0
+
+    lat = sorted(ms for _, ms in resultados)
+    q = statistics.quantiles(lat, n=100) if len(lat) > 1 else lat * 99
+    por_status: dict[int, int] = {}
+    for status, _ in resultados:
+        por_status[status] = por_status.get(status, 0) + 1
+
+    print(f"{len(resultados)} requests en {total_s:.2f} s -> {len(resultados) / total_s:.0f} req/s")
+    print(f"latencia ms: p50={q[49]:.1f} p95={q[94]:.1f} p99={q[98]:.1f} max={lat[-1]:.1f}")
+    print("status:", ", ".join(f"{k}={v}" for k, v in sorted(por_status.items())))
+
+if __name__ == "__main__":
+    main()
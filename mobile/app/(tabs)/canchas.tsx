@@ -14,6 +14,7 @@ import { Ionicons } from "@expo/vector-icons";
 import { router } from "expo-router";
 import { useCanchas } from "@/src/features/features/canchas/hooks";
 import ReservaModal from "@/src/components/ReservaModal";
+import { useCatalogos } from "@/src/features/catalogos/hooks";
 
 type CanchaBE = {
   id_cancha: number;
@@ -42,8 +43,9 @@ export default function CanchasScreen() {
   const [selectedCancha, setSelectedCancha] = useState<CanchaBE | null>(null);
   const [modalVisible, setModalVisible] = useState(false);
 
-  // Opciones rápidas (si tu API trae catálogos, reemplázalas)
-  const deportes = ["Fútbol", "Pádel", "Tenis", "Básquetbol"];
+  // Deportes del catálogo del BE: mismos nombres que trae cada cancha en `deporte`
+  const { data: catalogos } = useCatalogos();
+  const deportes = useMemo(() => (catalogos?.deportes ?? []).map((d) => d.nombre), [catalogos]);
   const sectores = ["Centro", "Ñielol", "Labranza"];
 
   // Normaliza items desde el backend (exactamente como tu code base)
@@ -140,7 +142,7 @@ export default function CanchasScreen() {
           onPress={() => {
             const idx = deportes.indexOf(fDeporte ?? "");
             const next = idx < 0 ? deportes[0] : idx + 1 >= deportes.length ? null : deportes[idx + 1];
-            setFDeporte(next);
+            setFDeporte(next ?? null);
           }}
           active={!!fDeporte}
         />
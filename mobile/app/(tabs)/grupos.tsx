@@ -5,12 +5,13 @@ import {
 } from "react-native";
 import { Ionicons } from "@expo/vector-icons";
 import { router } from "expo-router";
+import { useCatalogos } from "@/src/features/catalogos/hooks";
 
 // ---------- Tipos ----------
 type Grupo = {
   id: number;
   nombre: string;
-  deporte: string;       // Fútbol, Pádel, Tenis, etc.
+  deporte: string;       // nombre del catálogo: futbol, paddle, tenis, etc.
   nivel: "Recreativo" | "Intermedio" | "Competitivo";
   zona: string;          // Centro, Ñielol, Labranza...
   publico: boolean;      // público/privado
@@ -23,10 +24,10 @@ type Grupo = {
 
 // ---------- Mock (reemplaza con API) ----------
 const MOCK_GRUPOS: Grupo[] = [
-  { id: 1, nombre: "Los Andes FC", deporte: "Fútbol", nivel: "Intermedio", zona: "Centro", publico: true, miembros: 12, cupo: 18, proximo: "Jue 21:00 · Estadio Becker", soyMiembro: true, descripcion: "Pick-up semanal, buena onda y compromiso." },
-  { id: 2, nombre: "Pádel Temuco AM", deporte: "Pádel", nivel: "Recreativo", zona: "Ñielol", publico: true, miembros: 8, proximo: "Sáb 10:00 · Complejo Ñielol" },
-  { id: 3, nombre: "Liga Labranza", deporte: "Fútbol", nivel: "Competitivo", zona: "Labranza", publico: false, miembros: 16, cupo: 20, proximo: "Dom 19:00 · Labranza Sport" },
-  { id: 4, nombre: "Tenis Nocturno", deporte: "Tenis", nivel: "Intermedio", zona: "Centro", publico: true, miembros: 5, proximo: "Vie 22:00 · Plaza Tenis" },
+  { id: 1, nombre: "Los Andes FC", deporte: "futbol", nivel: "Intermedio", zona: "Centro", publico: true, miembros: 12, cupo: 18, proximo: "Jue 21:00 · Estadio Becker", soyMiembro: true, descripcion: "Pick-up semanal, buena onda y compromiso." },
+  { id: 2, nombre: "Pádel Temuco AM", deporte: "paddle", nivel: "Recreativo", zona: "Ñielol", publico: true, miembros: 8, proximo: "Sáb 10:00 · Complejo Ñielol" },
+  { id: 3, nombre: "Liga Labranza", deporte: "futbol", nivel: "Competitivo", zona: "Labranza", publico: false, miembros: 16, cupo: 20, proximo: "Dom 19:00 · Labranza Sport" },
+  { id: 4, nombre: "Tenis Nocturno", deporte: "tenis", nivel: "Intermedio", zona: "Centro", publico: true, miembros: 5, proximo: "Vie 22:00 · Plaza Tenis" },
 ];
 
 // ---------- Pantalla principal ----------
@@ -40,10 +41,11 @@ export default function GruposScreen() {
 
   const [openCreate, setOpenCreate] = useState(false);
   const [form, setForm] = useState<{nombre:string; deporte:string; zona:string; nivel:Grupo["nivel"]; publico:boolean; descripcion:string}>({
-    nombre: "", deporte: "Fútbol", zona: "Centro", nivel: "Recreativo", publico: true, descripcion: "",
+    nombre: "", deporte: "futbol", zona: "Centro", nivel: "Recreativo", publico: true, descripcion: "",
   });
 
-  const deportes = ["Fútbol", "Pádel", "Tenis", "Básquetbol"];
+  const { data: catalogos } = useCatalogos();
+  const deportes = useMemo(() => (catalogos?.deportes ?? []).map((d) => d.nombre), [catalogos]);
   const zonas    = ["Centro", "Ñielol", "Labranza"];
   const niveles  = ["Recreativo", "Intermedio", "Competitivo"] as const;
 
@@ -71,7 +73,7 @@ export default function GruposScreen() {
     const nuevo: Grupo = {
       id: Math.max(...data.map(d=>d.id)) + 1,
       nombre: form.nombre.trim(),
-      deporte: form.deporte,
+      deporte: form.deporte || deportes[0] || "",
       nivel: form.nivel,
       zona: form.zona,
       publico: form.publico,
@@ -83,7 +85,7 @@ export default function GruposScreen() {
     // Enlaza a tu API: POST /grupos
     setData([nuevo, ...data]);
     setOpenCreate(false);
-    setForm({ nombre:"", deporte:"Fútbol", zona:"Centro", nivel:"Recreativo", publico:true, descripcion:"" });
+    setForm({ nombre:"", deporte:"", zona:"Centro", nivel:"Recreativo", publico:true, descripcion:"" });
     Alert.alert("Listo", "Grupo creado.");
   };
 
@@ -125,7 +127,7 @@ export default function GruposScreen() {
             onPress={()=>{
               const idx = deportes.indexOf(fDeporte ?? "");
               const next = idx < 0 ? deportes[0] : (idx + 1 >= deportes.length ? null : deportes[idx+1]);
-              setFDeporte(next);
+              setFDeporte(next ?? null);
             }}
             active={!!fDeporte}
           />
@@ -218,9 +220,9 @@ export default function GruposScreen() {
             <Field label="Nombre del grupo" value={form.nombre} onChangeText={(v)=>setForm({...form, nombre:v})} placeholder="Ej: Los Titanes AM" />
             <RowPicker
               label="Deporte"
-              value={form.deporte}
+              value={form.deporte || deportes[0] || "—"}
               options={deportes}
-              onNext={()=>setForm({...form, deporte: nextItem(deportes, form.deporte)})}
+              onNext={()=>setForm({...form, deporte: nextItem(deportes, form.deporte || deportes[0])})}
             />
             <RowPicker
               label="Zona"
@@ -1,8 +1,10 @@
 ﻿﻿import { View, Text, FlatList, TouchableOpacity, ActivityIndicator, Alert, RefreshControl } from "react-native";
-import { useMisReservas, useCancelarReserva } from "@/src/features/features/reservas/hooks";
+import { useCancelarReserva } from "@/src/features/features/reservas/hooks";
+import { useMisReservasPaginadas } from "@/src/features/reservas/hooks";
 
 export default function MisReservas() {
-  const { data, isLoading, error, refetch, isRefetching } = useMisReservas();
+  const { data, isLoading, error, refetch, isRefetching, hasNextPage, fetchNextPage, isFetchingNextPage } =
+    useMisReservasPaginadas();
   const cancelar = useCancelarReserva();
 
   const onCancelar = (id: number) => {
@@ -39,7 +41,7 @@ export default function MisReservas() {
     );
   }
 
-  const items = data ?? [];
+  const items = data?.pages.flatMap((p) => p.items) ?? [];
 
   return (
     <View style={{ flex: 1, padding: 16 }}>
@@ -48,7 +50,10 @@ export default function MisReservas() {
       <FlatList
         data={items}
         keyExtractor={(it) => String(it.id_reserva)}
-        refreshControl={<RefreshControl refreshing={isRefetching} onRefresh={refetch} />}
+        refreshControl={<RefreshControl refreshing={isRefetching && !isFetchingNextPage} onRefresh={refetch} />}
+        onEndReached={() => hasNextPage && !isFetchingNextPage && fetchNextPage()}
+        onEndReachedThreshold={0.5}
+        ListFooterComponent={isFetchingNextPage ? <ActivityIndicator style={{ marginVertical: 12 }} /> : null}
         ListEmptyComponent={
           <Text style={{ opacity: 0.7 }}>Aún no tienes reservas.</Text>
         }
@@ -39,7 +39,8 @@
   },
   pricing: { reglas: "/pricing/reglas", reglaById: (id:number)=>`/pricing/reglas/${id}` },
   promos: { list: "/promociones", byId:(id:number)=>`/promociones/${id}`, validar:"/promociones/validar" },
-  search: { nearby:"/search/nearby", sugerencias:"/search/sugerencias", slots:"/search/slots" },
+  search: { nearby:"/search/nearby", sugerencias:"/search/sugerencias", viewport:"/search/viewport", slots:"/search/slots" },
+  catalogos: { all:"/catalogos" },
   reservas: {
     adminList:"/reservas", mias:"/reservas/mias", cotizar:"/reservas/cotizar", create:"/reservas",
     byId:(id:number)=>`/reservas/${id}`, patch:(id:number)=>`/reservas/${id}`,
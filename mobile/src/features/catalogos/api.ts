@@ -0,0 +1,34 @@
+/* eslint-disable @typescript-eslint/no-explicit-any */
+import { http } from "@/src/services/http";
+import { R } from "@/src/config/routes";
+
+export type Deporte = { id_deporte: number; nombre: string };
+export type Comuna = { id_comuna: number; nombre: string };
+export type Servicio = { id_servicio: number; nombre: string; icono?: string | null };
+
+export type Catalogos = {
+  version: string;
+  deportes: Deporte[];
+  comunas: Comuna[];
+  servicios: Servicio[];
+};
+
+// última respuesta + ETag: con If-None-Match el BE responde 304 sin cuerpo
+let ultimo: { etag: string; data: Catalogos } | null = null;
+
+export const CatalogosAPI = {
+  /** GET catálogos (deportes, comunas, servicios) para filtros y formularios */
+  get: async (): Promise<Catalogos> => {
+    const url = R?.catalogos?.all ?? "/catalogos";
+    const res = await http.get(url, {
+      headers: ultimo ? { "If-None-Match": ultimo.etag } : undefined,
+      validateStatus: (s: number) => (s >= 200 && s < 300) || s === 304,
+    });
+    if (res.status === 304 && ultimo) return ultimo.data;
+    const etag = (res.headers as any)?.etag;
+    if (etag) ultimo = { etag, data: res.data };
+    return res.data as Catalogos;
+  },
+};
+
+export const api = CatalogosAPI;
@@ -0,0 +1,11 @@
+import { useQuery } from "@tanstack/react-query";
+import { CatalogosAPI } from "./api";
+
+export const useCatalogos = () =>
+  useQuery({
+    queryKey: ["catalogos"],
+    queryFn: CatalogosAPI.get,
+    staleTime: 5 * 60_000, // igual que el Cache-Control del BE
+  });
+
+export const hooks = { useCatalogos };
@@ -2,8 +2,17 @@
 import { R } from "@/src/config/routes";
 import type { Reserva } from "@/src/types";
 
+export type ScopeReservas = "upcoming" | "past";
+export type MisReservasParams = { scope?: ScopeReservas; cursor?: string; limit?: number };
+
 export const ReservasAPI = {
-  mias: () => http.get<Reserva[]>(R.reservas.mias).then(r=>r.data),
+  mias: (params: MisReservasParams = {}) => http.get<Reserva[]>(R.reservas.mias, { params }).then(r=>r.data),
+  /** Página + cursor de la siguiente (header X-Next-Cursor; null si no hay más) */
+  miasPagina: (params: MisReservasParams = {}) =>
+    http.get<Reserva[]>(R.reservas.mias, { params }).then(r => ({
+      items: r.data,
+      nextCursor: (r.headers?.["x-next-cursor"] as string | undefined) ?? null,
+    })),
   create: (body: { id_cancha:number; fecha_reserva:string; hora_inicio:string; hora_fin:string }) =>
     http.post<Reserva>(R.reservas.create, body).then(r=>r.data),
 };
@@ -1,8 +1,16 @@
-﻿import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
-import { ReservasAPI } from "./api";
+﻿import { useQuery, useInfiniteQuery, useMutation, useQueryClient } from "@tanstack/react-query";
+import { ReservasAPI, ScopeReservas } from "./api";
 
 export function useMisReservas() {
-  return useQuery({ queryKey:["reservas","mias"], queryFn: ReservasAPI.mias });
+  return useQuery({ queryKey:["reservas","mias"], queryFn: () => ReservasAPI.mias() });
+}
+export function useMisReservasPaginadas(scope?: ScopeReservas, limit = 20) {
+  return useInfiniteQuery({
+    queryKey:["reservas","mias",scope ?? "todas",limit],
+    queryFn: ({ pageParam }) => ReservasAPI.miasPagina({ scope, limit, cursor: pageParam ?? undefined }),
+    initialPageParam: null as string | null,
+    getNextPageParam: (last) => last.nextCursor,
+  });
 }
 export function useCrearReserva() {
   const qc = useQueryClient();
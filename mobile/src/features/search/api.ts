@@ -1,4 +1,29 @@
-﻿/* eslint-disable @typescript-eslint/no-explicit-any */
+/* eslint-disable @typescript-eslint/no-explicit-any */
 import { http } from "@/src/services/http";
 import { R } from "@/src/config/routes";
-export const api = {}; // TODO: implementar endpoints de este módulo
+
+export type TipoSugerencia = "complejo" | "cancha" | "deporte" | "comuna";
+
+export type Sugerencia = {
+  tipo: TipoSugerencia;
+  id: number;
+  nombre: string;
+  contexto?: string | null;
+  id_complejo?: number | null;
+};
+
+export type SugerenciasResp = { q: string; items: Sugerencia[] };
+
+export const SearchAPI = {
+  /** GET sugerencias (autocompletar); el BE responde desde memoria, apto para cada tecla */
+  sugerencias: async (q: string, opts: { k?: number; tipos?: TipoSugerencia[] } = {}) => {
+    const url = R?.search?.sugerencias ?? "/search/sugerencias";
+    const { data } = await http.get(url, {
+      params: { q, k: opts.k, tipos: opts.tipos },
+      paramsSerializer: { indexes: null }, // tipos=complejo&tipos=cancha
+    });
+    return (data?.items ?? []) as Sugerencia[];
+  },
+};
+
+export const api = SearchAPI;
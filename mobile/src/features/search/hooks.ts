@@ -1,3 +1,13 @@
-﻿/* eslint-disable @typescript-eslint/no-explicit-any */
-import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
-export const hooks = {}; // TODO: implementar hooks (useQuery/useMutation)
+import { useQuery, keepPreviousData } from "@tanstack/react-query";
+import { SearchAPI, TipoSugerencia } from "./api";
+
+export const useSugerencias = (q: string, opts: { k?: number; tipos?: TipoSugerencia[] } = {}) =>
+  useQuery({
+    queryKey: ["search", "sugerencias", q.trim().toLowerCase(), opts],
+    queryFn: () => SearchAPI.sugerencias(q.trim(), opts),
+    enabled: q.trim().length > 0,
+    staleTime: 60_000,
+    placeholderData: keepPreviousData,
+  });
+
+export const hooks = { useSugerencias };